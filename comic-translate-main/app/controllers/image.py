@@ -13,6 +13,7 @@ from app.ui.commands.image import SetImageCommand
 from app.ui.commands.inpaint import PatchInsertCommand
 from app.ui.commands.inpaint import PatchCommandBase
 from app.ui.commands.box import AddTextItemCommand
+from modules.utils.patch_store import patch_store
 
 if TYPE_CHECKING:
     from controller import ComicTranslate
@@ -311,7 +312,7 @@ class ImageStateController:
                 }
             else:
                 # load into memory
-                cv_img = cv2.imread(saved['png_path'])
+                cv_img = patch_store.get(saved['png_path'])
                 prop = {
                     'bbox':     saved['bbox'],
                     'cv2_img':  cv_img,
@@ -6,6 +6,7 @@ import zipfile
 import shutil
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from .parsers import ProjectEncoder, ProjectDecoder, ensure_string_keys
+from modules.utils.patch_store import patch_store
 
 def save_state_to_proj_file(comic_translate, file_name):
     """
@@ -89,7 +90,8 @@ def save_state_to_proj_file(comic_translate, file_name):
                     hist_id = copy_and_assign(path)
                     state['image_history_references'][file_path].append(hist_id)
 
-        # Process image patches
+        # Process image patches; patch PNGs are written in the background, so wait for them first
+        patch_store.flush()
         for page_path, patch_list in comic_translate.image_patches.items():
             state['image_patches'][page_path] = []
             for patch in patch_list:
@@ -3,6 +3,7 @@ import cv2
 from PIL import Image
 import numpy as np
 from .text_item import TextBlockItem
+from modules.utils.patch_store import patch_store
 
 class ImageSaveRenderer:
     def __init__(self, cv2_image):
@@ -120,7 +121,7 @@ class ImageSaveRenderer:
         for patch in patches:
             # Extract data from the patch dict
             x, y, w, h = patch['bbox']
-            patch_image = cv2.imread(patch['png_path']) if 'png_path' in patch else patch['cv2_img']
+            patch_image = patch_store.get(patch['png_path']) if 'png_path' in patch else patch['cv2_img']
             
             # Convert patch to QImage
             patch_qimage = self.cv2_to_qimage(patch_image)
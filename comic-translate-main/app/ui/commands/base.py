@@ -7,6 +7,7 @@ from PySide6.QtCore import QRectF, QPointF
 from PySide6 import QtGui, QtWidgets
 
 from modules.utils.textblock import TextBlock
+from modules.utils.patch_store import patch_store
 from ..canvas.rectangle import MoveableRectItem
 from ..canvas.text_item import TextBlockItem
 
@@ -249,7 +250,7 @@ class PatchCommandBase:
     @staticmethod
     def create_patch_item(properties, parent_photo):
         x, y, w, h = properties['bbox']
-        img = cv2.imread(properties['png_path']) if 'png_path' in properties else properties['cv2_img']
+        img = patch_store.get(properties['png_path']) if 'png_path' in properties else properties['cv2_img']
         qimg = QtGui.QImage(img.data, w, h, img.strides[0],
                             QtGui.QImage.Format.Format_RGB888)
         pix  = QtGui.QPixmap.fromImage(qimg)
@@ -1,9 +1,8 @@
-import os, cv2
-import hashlib
+import os
 import uuid
 from PySide6.QtGui import QUndoCommand
 from .base import PatchCommandBase
-from PIL import Image
+from modules.utils.patch_store import patch_store, patch_hash
 
 class PatchInsertCommand(QUndoCommand, PatchCommandBase):
     """
@@ -25,19 +24,15 @@ class PatchInsertCommand(QUndoCommand, PatchCommandBase):
             bbox = patch['bbox']
             cv2_patch = patch['cv2_img']
 
-            # spill every cv2 patch to a temp PNG (if not already on disk)
+            # keep the patch in memory and spill it to a temp PNG in the background
             sub_dir = os.path.join(ct.temp_dir,
                                    "inpaint_patches",
                                    os.path.basename(file_path))
-            os.makedirs(sub_dir, exist_ok=True)
             png_path = os.path.join(sub_dir, f"patch_{uuid.uuid4().hex[:8]}_{idx}.png")
-            Image.fromarray(cv2.cvtColor(cv2_patch, cv2.COLOR_RGB2BGR)).save(png_path)
+            patch_store.put(png_path, cv2_patch)
 
             # compute a composite hash of the image and its bounding box for deduplication
-            with open(png_path, 'rb') as f:
-                img_bytes = f.read()
-            bbox_bytes = str(bbox).encode('utf-8')
-            img_hash = hashlib.sha256(img_bytes + bbox_bytes).hexdigest()
+            img_hash = patch_hash(cv2_patch, bbox)
 
             self.properties_list.append({
                 'bbox': bbox,
@@ -65,7 +60,7 @@ class PatchInsertCommand(QUndoCommand, PatchCommandBase):
 
             # only load into memory if being displayed
             if self.display:
-                cv_img = cv2.imread(prop['png_path'])
+                cv_img = patch_store.get(prop['png_path'])
                 mem_list.append({
                     'bbox': prop['bbox'],
                     'cv2_img': cv_img,
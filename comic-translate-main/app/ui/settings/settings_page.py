@@ -62,6 +62,10 @@ class SettingsPage(QtWidgets.QWidget):
         }
         return tool_combos[tool_type].currentText()
 
+    def get_manga_ocr_runtime(self):
+        """MangaOCR inference runtime on CPU: 'torch' or 'onnx'."""
+        return 'onnx' if self.ui.manga_ocr_runtime_combo.currentText() == 'ONNX' else 'torch'
+
     def is_gpu_enabled(self):
         return self.ui.use_gpu_checkbox.isChecked()
 
@@ -72,6 +76,7 @@ class SettingsPage(QtWidgets.QWidget):
             'temperature': float(self.ui.temp_edit.text()),
             'top_p': float(self.ui.top_p_edit.text()),
             'max_tokens': int(self.ui.max_tokens_edit.text()),
+            'ocr_requests_per_minute': self.ui.ocr_rpm_spinbox.value(),
         }
 
     def get_export_settings(self):
@@ -129,6 +134,12 @@ class SettingsPage(QtWidgets.QWidget):
 
         return settings
 
+    def get_inpaint_cache_settings(self):
+        return {
+            'enabled': self.ui.inpaint_cache_checkbox.isChecked(),
+            'max_size_mb': self.ui.inpaint_cache_spinbox.value(),
+        }
+
     def get_all_settings(self):
         local_model_path = self.get_credentials('Custom').get('local_transformers_model', '')
         # Ajout récupération du type de modèle et des champs Ollama
@@ -143,8 +154,10 @@ class SettingsPage(QtWidgets.QWidget):
                 'ocr': self.get_tool_selection('ocr'),
                 'detector': self.get_tool_selection('detector'),
                 'inpainter': self.get_tool_selection('inpainter'),
+                'manga_ocr_runtime': self.ui.manga_ocr_runtime_combo.currentText(),
                 'use_gpu': self.is_gpu_enabled(),
-                'hd_strategy': self.get_hd_strategy_settings()
+                'hd_strategy': self.get_hd_strategy_settings(),
+                'inpaint_cache': self.get_inpaint_cache_settings()
             },
             'llm': self.get_llm_settings(),
             'export': self.get_export_settings(),
@@ -281,6 +294,7 @@ class SettingsPage(QtWidgets.QWidget):
         translated_detector = self.ui.reverse_mappings.get(detector, detector)
         self.ui.detector_combo.setCurrentText(translated_detector)
 
+        self.ui.manga_ocr_runtime_combo.setCurrentText(settings.value('manga_ocr_runtime', 'PyTorch'))
         self.ui.use_gpu_checkbox.setChecked(settings.value('use_gpu', False, type=bool))
 
         # Load HD strategy settings
@@ -294,6 +308,11 @@ class SettingsPage(QtWidgets.QWidget):
             self.ui.crop_margin_spinbox.setValue(settings.value('crop_margin', 512, type=int))
             self.ui.crop_trigger_spinbox.setValue(settings.value('crop_trigger_size', 512, type=int))
         settings.endGroup()  # hd_strategy
+
+        settings.beginGroup('inpaint_cache')
+        self.ui.inpaint_cache_checkbox.setChecked(settings.value('enabled', True, type=bool))
+        self.ui.inpaint_cache_spinbox.setValue(settings.value('max_size_mb', 512, type=int))
+        settings.endGroup()  # inpaint_cache
         settings.endGroup()  # tools
 
         # Load LLM settings
@@ -306,6 +325,7 @@ class SettingsPage(QtWidgets.QWidget):
         self.ui.top_p_edit.setText(f"{top_p:.2f}")
         max_tokens = settings.value('max_tokens', 4096, type=int)
         self.ui.max_tokens_edit.setText(str(max_tokens))
+        self.ui.ocr_rpm_spinbox.setValue(settings.value('ocr_requests_per_minute', 0, type=int))
         settings.endGroup()
 
         # Load export settings
@@ -34,7 +34,8 @@ class SettingsPageUI(QtWidgets.QWidget):
         self.inpainters = ['LaMa', 'AOT', 'MI-GAN']
         self.detectors = ['RT-DETR-v2']
         self.ocr_engines = [self.tr("Default"), self.tr('Microsoft OCR'), self.tr('Google Cloud Vision'), self.tr('Gemini-2.0-Flash'), self.tr('GPT-4.1-mini'), self.tr('EasyOCR')]
-        self.inpaint_strategy = [self.tr('Resize'), self.tr('Original'), self.tr('Crop')]
+        self.manga_ocr_runtimes = ['PyTorch', 'ONNX']
+        self.inpaint_strategy = [self.tr('Resize'), self.tr('Original'), self.tr('Crop'), self.tr('Auto')]
         self.themes = [self.tr('Dark'), self.tr('Light')]
         self.alignment = [self.tr("Left"), self.tr("Center"), self.tr("Right")]
 
@@ -106,6 +107,7 @@ class SettingsPageUI(QtWidgets.QWidget):
             self.tr("Resize"): "Resize",
             self.tr("Original"): "Original",
             self.tr("Crop"): "Crop",
+            self.tr("Auto"): "Auto",
 
             # Alignment mappings
             self.tr("Left"): "Left",
@@ -176,7 +178,7 @@ class SettingsPageUI(QtWidgets.QWidget):
         combo_widget = QtWidgets.QWidget()
         combo_layout = QtWidgets.QVBoxLayout()
 
-        if title in [self.tr("Inpainter"), self.tr("HD Strategy")]:
+        if title in [self.tr("Inpainter"), self.tr("HD Strategy"), self.tr("MangaOCR Runtime (CPU)")]:
             label = MLabel(title)
         else:
             label = MLabel(title).h4()
@@ -246,6 +248,12 @@ class SettingsPageUI(QtWidgets.QWidget):
         ocr_widget, self.ocr_combo = self._create_title_and_combo(self.tr("OCR"), self.ocr_engines)
         self.set_combo_box_width(self.ocr_combo, self.ocr_engines)
 
+        # Used by the Default OCR for Japanese
+        manga_ocr_runtime_widget, self.manga_ocr_runtime_combo = self._create_title_and_combo(
+            self.tr("MangaOCR Runtime (CPU)"), self.manga_ocr_runtimes
+        )
+        self.set_combo_box_width(self.manga_ocr_runtime_combo, self.manga_ocr_runtimes)
+
         detector_widget, self.detector_combo = self._create_title_and_combo(self.tr("Text Detector"), self.detectors)
         self.set_combo_box_width(self.detector_combo, self.detectors)
 
@@ -323,6 +331,22 @@ class SettingsPageUI(QtWidgets.QWidget):
         # Connect the strategy combo box to update the visible widgets
         self.inpaint_strategy_combo.currentIndexChanged.connect(self.update_hd_strategy_widgets)
 
+        # Cache of inpainted regions, reused when a page is inpainted again
+        inpaint_cache_layout = QtWidgets.QHBoxLayout()
+        self.inpaint_cache_checkbox = MCheckBox(self.tr("Cache Inpainted Regions"))
+        self.inpaint_cache_checkbox.setChecked(True)
+        inpaint_cache_size_label = MLabel(self.tr("Cache Size (MB):"))
+        self.inpaint_cache_spinbox = MSpinBox().small()
+        self.inpaint_cache_spinbox.setFixedWidth(70)
+        self.inpaint_cache_spinbox.setRange(16, 100000)
+        self.inpaint_cache_spinbox.setValue(512)
+        self.inpaint_cache_checkbox.toggled.connect(self.inpaint_cache_spinbox.setEnabled)
+        inpaint_cache_layout.addWidget(self.inpaint_cache_checkbox)
+        inpaint_cache_layout.addSpacing(10)
+        inpaint_cache_layout.addWidget(inpaint_cache_size_label)
+        inpaint_cache_layout.addWidget(self.inpaint_cache_spinbox)
+        inpaint_cache_layout.addStretch()
+
         # Add "Use GPU" checkbox
         self.use_gpu_checkbox = MCheckBox(self.tr("Use GPU"))
 
@@ -331,11 +355,13 @@ class SettingsPageUI(QtWidgets.QWidget):
         tools_layout.addWidget(detector_widget)
         tools_layout.addSpacing(10)
         tools_layout.addWidget(ocr_widget)
+        tools_layout.addWidget(manga_ocr_runtime_widget)
         tools_layout.addSpacing(10)
         tools_layout.addWidget(inpainting_label)
         tools_layout.addWidget(inpainter_widget)
         tools_layout.addWidget(inpaint_strategy_widget)
         tools_layout.addWidget(self.hd_strategy_widgets)
+        tools_layout.addLayout(inpaint_cache_layout)
         tools_layout.addSpacing(10)
         tools_layout.addWidget(self.use_gpu_checkbox)
         tools_layout.addStretch(1)
@@ -678,10 +704,24 @@ class SettingsPageUI(QtWidgets.QWidget):
         max_tokens_layout.addWidget(max_tokens_header)
         max_tokens_layout.addLayout(max_tokens_controls)
         
-        # Add Top P and Max Tokens to the advanced settings layout
+        # OCR rate limit - for advanced settings (0 means no limit)
+        ocr_rpm_layout = QtWidgets.QVBoxLayout()
+        ocr_rpm_header = MLabel(self.tr("OCR Requests per Minute")).h4()
+        self.ocr_rpm_spinbox = MSpinBox().small()
+        self.ocr_rpm_spinbox.setFixedWidth(70)
+        self.ocr_rpm_spinbox.setRange(0, 10000)
+        self.ocr_rpm_spinbox.setValue(0)
+        self.ocr_rpm_spinbox.setToolTip(self.tr("Provider rate limit for GPT and Gemini OCR, 0 for no limit"))
+        
+        ocr_rpm_layout.addWidget(ocr_rpm_header)
+        ocr_rpm_layout.addWidget(self.ocr_rpm_spinbox)
+        
+        # Add Top P, Max Tokens and the OCR rate limit to the advanced settings layout
         advanced_layout.addLayout(top_p_layout)
         advanced_layout.addSpacing(10)
         advanced_layout.addLayout(max_tokens_layout)
+        advanced_layout.addSpacing(10)
+        advanced_layout.addLayout(ocr_rpm_layout)
         
         # Create the collapsible section for advanced settings
         self.advanced_collapse = MCollapse()
@@ -902,8 +942,8 @@ class SettingsPageUI(QtWidgets.QWidget):
         self.resize_widget.setVisible(strategy == self.tr("Resize"))
         self.crop_widget.setVisible(strategy == self.tr("Crop"))
         
-        # Adjust the layout to remove empty space when "Original" is selected
-        if strategy == self.tr("Original"):
+        # Adjust the layout to remove empty space when "Original" or "Auto" is selected
+        if strategy in (self.tr("Original"), self.tr("Auto")):
             self.hd_strategy_widgets.setFixedHeight(0)
         else:
             self.hd_strategy_widgets.setFixedHeight(self.hd_strategy_widgets.sizeHint().height())
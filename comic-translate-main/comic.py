@@ -1,7 +1,7 @@
 import os, sys
 import logging
 from PySide6.QtGui import QIcon
-from PySide6.QtCore import QSettings, QTranslator, QLocale
+from PySide6.QtCore import QSettings, QTranslator, QLocale, QTimer
 from PySide6.QtWidgets import QApplication  
 from controller import ComicTranslate
 from app.translations import ct_translations
@@ -41,6 +41,9 @@ def main():
             ct.thread_load_project(project_file)
 
     ct.show()
+
+    # Load the selected models in the background once the window is up
+    QTimer.singleShot(0, ct.pipeline.warm_up_models)
     
     # Start the event loop
     sys.exit(app.exec())
@@ -22,11 +22,11 @@ from modules.utils.file_handler import FileHandler
 from modules.utils.pipeline_utils import validate_settings, validate_ocr, \
                                          validate_translator
 from modules.utils.download import get_models, mandatory_models
-from modules.detection.utils.general import get_inpaint_bboxes
 from modules.utils.translator_utils import is_there_text
 from modules.rendering.render import pyside_word_wrap
 from modules.utils.pipeline_utils import get_language_code
 from modules.utils.translator_utils import format_translations
+from modules.utils.patch_store import patch_store
 from pipeline import ComicTranslatePipeline
 
 from app.controllers.image import ImageStateController
@@ -177,6 +177,13 @@ class ComicTranslate(ComicTranslateUI):
         self.page_list.toggle_skip_img.connect(self.image_ctrl.handle_toggle_skip_images)
         self.page_list.translate_imgs.connect(self.batch_translate_selected)
 
+        # Model warm-up follows the selected models
+        for combo in (self.settings_page.ui.detector_combo, self.settings_page.ui.ocr_combo,
+                      self.settings_page.ui.inpainter_combo, self.settings_page.ui.manga_ocr_runtime_combo,
+                      self.s_combo):
+            combo.currentTextChanged.connect(self.pipeline.on_model_settings_changed)
+        self.settings_page.ui.use_gpu_checkbox.stateChanged.connect(self.pipeline.on_model_settings_changed)
+
     def connect_rect_item_signals(self, rect_item): return self.rect_item_ctrl.connect_rect_item_signals(rect_item)
     def apply_inpaint_patches(self, patches): return self.image_ctrl.apply_inpaint_patches(patches)
     def render_settings(self): return self.text_ctrl.render_settings()
@@ -562,11 +569,10 @@ class ComicTranslate(ComicTranslateUI):
 
                 def compute_all_bboxes():
                     image = self.image_viewer.get_cv2_image()
-                    results = []
-                    for blk in self.blk_list:
-                        bboxes = get_inpaint_bboxes(blk.xyxy, image)
-                        results.append((blk, bboxes))
-                    return results
+                    all_bboxes = self.pipeline.segmentation_store.get_inpaint_bboxes(
+                        image, [blk.xyxy for blk in self.blk_list]
+                    )
+                    return list(zip(self.blk_list, all_bboxes))
 
                 self.run_threaded(
                     compute_all_bboxes,
@@ -630,6 +636,9 @@ class ComicTranslate(ComicTranslateUI):
             super().keyPressEvent(event)
 
     def closeEvent(self, event):
+        # Drop the warm-up steps that have not started yet
+        self.pipeline.warmup.shutdown()
+
         # Save all settings when the application is closed
         self.settings_page.save_settings()
         self.project_ctrl.save_main_page_settings()
@@ -640,6 +649,13 @@ class ComicTranslate(ComicTranslateUI):
             if os.path.exists(temp_dir): 
                 shutil.rmtree(temp_dir)  
 
+        # Patch PNGs are written in the background; let the writer finish
+        # before removing the directory it writes to
+        try:
+            patch_store.close()
+        except OSError as e:
+            print(f"Inpainting patches not saved on close: {e}")
+
         for root, dirs, files in os.walk(self.temp_dir, topdown=False):
             for name in files:
                 os.remove(os.path.join(root, name))
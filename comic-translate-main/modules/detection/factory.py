@@ -1,12 +1,11 @@
 from .base import DetectionEngine
 from .rtdetr_v2 import RTDetrV2Detection
+from ..utils.model_pool import model_pool
 
 
 class DetectionEngineFactory:
     """Factory for creating appropriate detection engines based on settings."""
     
-    _engines = {}  # Cache of created engines
-    
     @classmethod
     def create_engine(cls, settings, model_name: str = 'RT-DETR-v2') -> DetectionEngine:
         """
@@ -22,10 +21,6 @@ class DetectionEngineFactory:
         # Create a cache key based on model
         cache_key = f"{model_name}"
         
-        # Return cached engine if available
-        if cache_key in cls._engines:
-            return cls._engines[cache_key]
-        
         # Map model names to factory methods
         engine_factories = {
             'RT-DETR-v2': cls._create_rtdetr_v2,
@@ -34,10 +29,8 @@ class DetectionEngineFactory:
         # Get the appropriate factory method, defaulting to RT-DETR-V2
         factory_method = engine_factories.get(model_name, cls._create_rtdetr_v2)
         
-        # Create and cache the engine
-        engine = factory_method(settings)
-        cls._engines[cache_key] = engine
-        return engine
+        # Return the pooled engine, creating it if needed
+        return model_pool.get(f"detection:{cache_key}", lambda: factory_method(settings))
     
     @staticmethod
     def _create_rtdetr_v2(settings):
@@ -1,4 +1,6 @@
 import numpy as np
+import cv2
+from typing import Iterator
 
 from ..utils.textblock import TextBlock
 from .factory import DetectionEngineFactory
@@ -7,29 +9,49 @@ from .factory import DetectionEngineFactory
 class TextBlockDetector:
     """
     Detector for finding text blocks in images.
+    
+    The engine is taken from the model pool on every call rather than kept,
+    so that a model the pool evicts is actually released.
     """
     
     def __init__(self, settings_page):
         self.settings = settings_page 
-        self.engine = None
-        self.detector = 'RT-DETR-V2'  # Default Detector
+        self.detector = None  # Detector chosen in initialize(), else the selected one
     
     def initialize(self, detector: str = None) -> None:
         if detector:
             self.detector = detector
-            
-        if self.settings:
-            if not detector:
-                self.detector = self.settings.get_tool_selection('detector') or self.detector
-            
-            # Create appropriate engine
-            self.engine = DetectionEngineFactory.create_engine(self.settings, self.detector)
+        # Load the engine into the pool now
+        self._engine()
     
-    def detect(self, img: np.ndarray) -> list[TextBlock]:
-        if self.engine is None:
-            self.initialize()
-            
-        if self.engine is None:
+    def _engine(self):
+        if not self.settings:
             raise ValueError("Detection engine not initialized")
+        detector = self.detector or self.settings.get_tool_selection('detector') or 'RT-DETR-V2'
+        return DetectionEngineFactory.create_engine(self.settings, detector)
+    
+    def detect(self, img: np.ndarray) -> list[TextBlock]:
+        return self._engine().detect(img)
+    
+    def is_long_strip(self, shape: tuple) -> bool:
+        """Whether an image of this shape is tall enough for band-by-band detection."""
+        engine = self._engine()
+        slicer = getattr(engine, 'image_slicer', None)
+        if slicer is None or not hasattr(engine, 'detect_streaming'):
+            return False
+        return shape[0] / shape[1] > slicer.height_to_width_ratio_threshold
+    
+    def detect_strip(self, source) -> list[TextBlock]:
+        """Detect all text blocks of a long strip, band by band."""
+        return [blk for blocks in self.detect_streaming(source) for blk in blocks]
+    
+    def detect_streaming(self, source) -> Iterator[list[TextBlock]]:
+        engine = self._engine()
+        
+        if not hasattr(engine, 'detect_streaming'):
+            # Engines without band support fall back to whole-image detection
+            image = source if isinstance(source, np.ndarray) else cv2.imread(str(source))
+            yield engine.detect(image)
+            return
             
-        return self.engine.detect(img)
\ No newline at end of file
+        yield from engine.detect_streaming(source)
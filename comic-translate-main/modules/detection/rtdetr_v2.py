@@ -2,12 +2,13 @@ import os
 import cv2
 import torch
 import numpy as np
-from PIL import Image
+from typing import Iterator
 from transformers import RTDetrV2ForObjectDetection, RTDetrImageProcessor
 
 from .base import DetectionEngine
 from ..utils.textblock import TextBlock
 from .utils.slicer import ImageSlicer
+from .utils.band_reader import open_band_reader
 
 
 current_file_dir = os.path.dirname(os.path.abspath(__file__))
@@ -21,6 +22,7 @@ class RTDetrV2Detection(DetectionEngine):
         self.processor = None
         self.device = 'cpu'
         self.confidence_threshold = 0.3
+        self.input_size = 640  # Square input resolution of the RT-DETR processor
         self.repo_name = 'ogkalu/comic-text-and-bubble-detector'  
         self.model_dir = os.path.join(project_root, 'models/detection')
         
@@ -41,7 +43,7 @@ class RTDetrV2Detection(DetectionEngine):
         if self.model is None:
             self.processor = RTDetrImageProcessor.from_pretrained(
                 self.repo_name,
-                size={"width": 640, "height": 640},
+                size={"width": self.input_size, "height": self.input_size},
             )
             
             self.model = RTDetrV2ForObjectDetection.from_pretrained(
@@ -60,6 +62,34 @@ class RTDetrV2Detection(DetectionEngine):
         )
         return self.create_text_blocks(image, text_boxes, bubble_boxes)
     
+    def detect_streaming(self, source) -> Iterator[list[TextBlock]]:
+        """
+        Detect text blocks band by band on a tall image, yielding blocks
+        as soon as they can no longer change.
+        
+        Args:
+            source: Image as numpy array, path to a .npy array, or image path
+            
+        Yields:
+            Lists of TextBlock objects in full image coordinates
+        """
+        reader = open_band_reader(source)
+        known_bubbles = np.empty((0, 4), dtype=int)
+        try:
+            for bubble_boxes, text_boxes in self.image_slicer.iter_band_detections(
+                reader, self._detect_single_image
+            ):
+                if bubble_boxes.size > 0:
+                    known_bubbles = np.vstack([known_bubbles, bubble_boxes])
+                if text_boxes.size == 0:
+                    continue
+                # Only the shape of the image is needed to build blocks
+                blocks = self.create_text_blocks(reader, text_boxes, known_bubbles)
+                if blocks:
+                    yield blocks
+        finally:
+            reader.close()
+    
     def _detect_single_image(self, image: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
         """
         Performs detection on a single image and returns raw bounding boxes.
@@ -70,11 +100,13 @@ class RTDetrV2Detection(DetectionEngine):
         Returns:
             Tuple of (bubble_boxes, text_boxes) as numpy arrays
         """
-        # Convert OpenCV image (BGR) to PIL image (RGB)
-        pil_image = Image.fromarray(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+        # Bring the image to the working resolution before any colour conversion,
+        # so the cost of the steps below does not depend on the scan resolution
+        working_image, scale = self._to_working_resolution(image)
+        rgb_image = cv2.cvtColor(working_image, cv2.COLOR_BGR2RGB)
         
         # Prepare image for model
-        inputs = self.processor(images=pil_image, return_tensors="pt")
+        inputs = self.processor(images=rgb_image, return_tensors="pt")
         
         # Move inputs to device
         if self.device == "cuda" and torch.cuda.is_available():
@@ -85,7 +117,7 @@ class RTDetrV2Detection(DetectionEngine):
             outputs = self.model(**inputs)
 
         # Post-process results
-        target_sizes = torch.tensor([pil_image.size[::-1]])
+        target_sizes = torch.tensor([rgb_image.shape[:2]])
         if self.device == "cuda" and torch.cuda.is_available():
             target_sizes = target_sizes.to("cuda")
             
@@ -100,7 +132,8 @@ class RTDetrV2Detection(DetectionEngine):
         text_boxes = []
         
         for box, score, label in zip(results['boxes'], results['scores'], results['labels']):
-            box = box.tolist()
+            # Map the box from the working resolution back to the original image
+            box = [coord / scale for coord in box.tolist()]
             x1, y1, x2, y2 = map(int, box)
             
             # Class 0: bubble, Class 1: text_bubble, Class 2: text_free
@@ -115,3 +148,35 @@ class RTDetrV2Detection(DetectionEngine):
         
         return bubble_boxes, text_boxes
     
+
+    def _to_working_resolution(self, image: np.ndarray) -> tuple[np.ndarray, float]:
+        """
+        Resize an image to the resolution the detector actually works at.
+        
+        The processor resizes every input to input_size x input_size, so
+        oversized scans are shrunk up front (never below input_size on either
+        side) with a single area resize, and thumbnail-like inputs are upscaled
+        so their longer side reaches input_size.
+        
+        Args:
+            image: Input image in BGR format (OpenCV)
+            
+        Returns:
+            Tuple of (resized image, scale factor applied to the coordinates)
+        """
+        height, width = image.shape[:2]
+        
+        if height > self.input_size and width > self.input_size:
+            scale = max(self.input_size / height, self.input_size / width)
+            interpolation = cv2.INTER_AREA
+        elif max(height, width) < self.input_size:
+            scale = self.input_size / max(height, width)
+            interpolation = cv2.INTER_CUBIC
+        else:
+            return image, 1.0
+        
+        new_width = max(1, int(round(width * scale)))
+        new_height = max(1, int(round(height * scale)))
+        resized = cv2.resize(image, (new_width, new_height), interpolation=interpolation)
+        
+        return resized, scale
@@ -0,0 +1,176 @@
+"""
+Row-band access to tall images for streaming detection.
+"""
+import hashlib
+import os
+import tempfile
+
+import cv2
+import numpy as np
+
+MEMMAP_DIR = os.path.join(tempfile.gettempdir(), 'comic-translate-bands')
+# Decoded arrays are kept up to this size, least recently used removed first
+MEMMAP_MAX_BYTES = 2 * 1024 * 1024 * 1024
+
+
+class BandReader:
+    """
+    Read-only access to horizontal bands of an image without
+    requiring callers to hold the full decoded image.
+    """
+
+    def __init__(self, source: np.ndarray):
+        self._source = source
+
+    @property
+    def shape(self) -> tuple:
+        return self._source.shape
+
+    @property
+    def height(self) -> int:
+        return self._source.shape[0]
+
+    @property
+    def width(self) -> int:
+        return self._source.shape[1]
+
+    def read_rows(self, start_y: int, end_y: int) -> np.ndarray:
+        """
+        Return rows [start_y, end_y) as a contiguous array.
+
+        Only the requested band is materialized; for memory-mapped
+        sources this is the only part paged in from disk.
+        """
+        start_y = max(0, start_y)
+        end_y = min(self.height, end_y)
+        return np.ascontiguousarray(self._source[start_y:end_y])
+
+    def close(self) -> None:
+        self._source = None
+
+
+class MemmapBandReader(BandReader):
+    """
+    Band reader over a raw .npy array opened with np.load(mmap_mode='r'),
+    so resident memory is bounded by the bands actually read.
+    """
+
+    def __init__(self, path: str):
+        super().__init__(np.load(path, mmap_mode='r'))
+        self.path = path
+
+    def close(self) -> None:
+        mmap = getattr(self._source, '_mmap', None)
+        if mmap is not None:
+            mmap.close()
+        super().close()
+
+
+def prune_memmaps(max_bytes: int = None, keep: str = None) -> None:
+    """
+    Remove the least recently used .npy files of MEMMAP_DIR until the
+    rest fit in max_bytes.
+
+    Args:
+        max_bytes: Size limit of the directory, MEMMAP_MAX_BYTES by default
+        keep: Path of a file that is never removed
+    """
+    max_bytes = MEMMAP_MAX_BYTES if max_bytes is None else max_bytes
+    files = []
+    try:
+        names = os.listdir(MEMMAP_DIR)
+    except OSError:
+        return
+    for name in names:
+        if not name.endswith('.npy'):
+            continue
+        file_path = os.path.join(MEMMAP_DIR, name)
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            continue
+        files.append((stat.st_mtime, file_path, stat.st_size))
+
+    total = sum(size for _, _, size in files)
+    for _, file_path, size in sorted(files):
+        if total <= max_bytes:
+            break
+        if keep is not None and os.path.abspath(file_path) == os.path.abspath(keep):
+            continue
+        try:
+            os.remove(file_path)
+        except OSError:
+            # Still mapped by a reader on Windows; retried on the next prune
+            continue
+        total -= size
+
+
+def decode_to_memmap(path: str, band_height: int = 1024) -> str:
+    """
+    Convert an encoded image to a raw .npy array once, so later reads can be
+    served by row range from a memory map.
+
+    OpenCV can not decode png/jpg/webp by row range, so the image is decoded
+    once, copied band by band into the memory-mapped file and released. The
+    file is kept in the temp dir under a key of the path, size and mtime,
+    and reused until the source changes; the least recently used files are
+    removed once the directory exceeds MEMMAP_MAX_BYTES.
+
+    Args:
+        path: Path to the encoded image
+        band_height: Rows copied to the file per step
+
+    Returns:
+        Path to the .npy file
+    """
+    stat = os.stat(path)
+    key = f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+    npy_path = os.path.join(MEMMAP_DIR, hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest() + '.npy')
+    if os.path.exists(npy_path):
+        # Mark as recently used for pruning
+        try:
+            os.utime(npy_path)
+        except OSError:
+            pass
+        return npy_path
+
+    image = cv2.imread(path)
+    if image is None:
+        raise ValueError(f"Could not read image: {path}")
+
+    os.makedirs(MEMMAP_DIR, exist_ok=True)
+    tmp_path = npy_path + f'.{os.getpid()}.tmp'
+    mapped = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=image.dtype, shape=image.shape)
+    try:
+        for start_y in range(0, image.shape[0], band_height):
+            mapped[start_y:start_y + band_height] = image[start_y:start_y + band_height]
+        mapped.flush()
+    finally:
+        del mapped
+    del image
+    os.replace(tmp_path, npy_path)
+    prune_memmaps(keep=npy_path)
+    return npy_path
+
+
+def open_band_reader(source) -> BandReader:
+    """
+    Create a band reader for an in-memory image or an image path.
+
+    Args:
+        source: Image as numpy array, path to a .npy array (memory-mapped),
+                or path to an encoded image file (converted once to a .npy array)
+
+    Returns:
+        BandReader over the source
+    """
+    if isinstance(source, BandReader):
+        return source
+    if isinstance(source, np.ndarray):
+        return BandReader(source)
+
+    path = os.fspath(source)
+    if path.lower().endswith('.npy'):
+        return MemmapBandReader(path)
+
+    return MemmapBandReader(decode_to_memmap(path))
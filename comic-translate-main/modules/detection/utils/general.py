@@ -4,6 +4,7 @@ Utility functions for detection engines.
 import numpy as np
 import cv2
 import largestinteriorrectangle as lir
+from concurrent.futures import ThreadPoolExecutor
 from modules.utils.textblock import adjust_text_line_coordinates
 
 
@@ -152,46 +153,45 @@ def detect_content_in_bbox(image):
     )
     
     # Perform connected component labeling for both cases
-    num_labels_white, labels_white, stats_white, centroids_white = cv2.connectedComponentsWithStats(binary_white_text, connectivity=8)
-    num_labels_black, labels_black, stats_black, centroids_black = cv2.connectedComponentsWithStats(binary_black_text, connectivity=8)
-    
-    # Filter out small components (likely to be noise)
-    min_area = 10 
-    content_bboxes = []
+    _, _, stats_white, _ = cv2.connectedComponentsWithStats(binary_white_text, connectivity=8)
+    _, _, stats_black, _ = cv2.connectedComponentsWithStats(binary_black_text, connectivity=8)
     
     height, width = image.shape[:2]
     
-    # Process white text on black background
-    for i in range(1, num_labels_white):  # Start from 1 to skip the background
-        area = stats_white[i, cv2.CC_STAT_AREA]
-        if area > min_area:
-            x1 = stats_white[i, cv2.CC_STAT_LEFT]
-            y1 = stats_white[i, cv2.CC_STAT_TOP]
-            w = stats_white[i, cv2.CC_STAT_WIDTH]
-            h = stats_white[i, cv2.CC_STAT_HEIGHT]
-            x2 = x1 + w
-            y2 = y1 + h
-            
-            # Check if the bounding box touches the edges of the image
-            if x1 > 0 and y1 > 0 and x1 + w < width and y1 + h < height:
-                content_bboxes.append((x1, y1, x2, y2))
-    
-    # Process black text on white background
-    for i in range(1, num_labels_black):  # Start from 1 to skip the background
-        area = stats_black[i, cv2.CC_STAT_AREA]
-        if area > min_area:
-            x1 = stats_black[i, cv2.CC_STAT_LEFT]
-            y1 = stats_black[i, cv2.CC_STAT_TOP]
-            w = stats_black[i, cv2.CC_STAT_WIDTH]
-            h = stats_black[i, cv2.CC_STAT_HEIGHT]
-            x2 = x1 + w
-            y2 = y1 + h
-            
-            # Check if the bounding box touches the edges of the image
-            if x1 > 0 and y1 > 0 and x1 + w < width and y1 + h < height:
-                content_bboxes.append((x1, y1, x2, y2))
-    
-    return content_bboxes
+    # White text on black background first, then black text on white background
+    content_bboxes = np.concatenate([
+        filter_component_stats(stats_white, width, height),
+        filter_component_stats(stats_black, width, height),
+    ])
+    
+    return [tuple(bbox) for bbox in content_bboxes.tolist()]
+
+def filter_component_stats(stats: np.ndarray, width: int, height: int, min_area: int = 10) -> np.ndarray:
+    """
+    Select text-like components from connectedComponentsWithStats output.
+    
+    Drops the background label, components at or below min_area (likely noise)
+    and components touching the edges of the image.
+    
+    Args:
+        stats: Stats array from cv2.connectedComponentsWithStats
+        width: Width of the labelled image
+        height: Height of the labelled image
+        min_area: Minimum component area to keep
+    
+    Returns:
+        Array of boxes [[x1, y1, x2, y2], ...] in label order
+    """
+    stats = stats[1:]  # Skip the background label
+    x1 = stats[:, cv2.CC_STAT_LEFT]
+    y1 = stats[:, cv2.CC_STAT_TOP]
+    x2 = x1 + stats[:, cv2.CC_STAT_WIDTH]
+    y2 = y1 + stats[:, cv2.CC_STAT_HEIGHT]
+    
+    keep = ((stats[:, cv2.CC_STAT_AREA] > min_area)
+            & (x1 > 0) & (y1 > 0) & (x2 < width) & (y2 < height))
+    
+    return np.stack([x1, y1, x2, y2], axis=1)[keep]
 
 def get_inpaint_bboxes(text_bbox, image):
     """
@@ -213,13 +213,29 @@ def get_inpaint_bboxes(text_bbox, image):
     content_bboxes = detect_content_in_bbox(crop)
 
     # Adjusting coordinates to the full image
-    adjusted_bboxes = []
-    for bbox in content_bboxes:
-        lx1, ly1, lx2, ly2 = bbox
-        adjusted_bbox = (x1 + lx1, y1 + ly1, x1 + lx2, y1 + ly2)
-        adjusted_bboxes.append(adjusted_bbox)
+    return [(x1 + lx1, y1 + ly1, x1 + lx2, y1 + ly2) for lx1, ly1, lx2, ly2 in content_bboxes]
+
+def get_inpaint_bboxes_batch(text_bboxes, image, max_workers: int = None):
+    """
+    Get inpaint bounding boxes for all text regions of a page.
+    
+    Blocks are segmented concurrently on a thread pool; OpenCV releases the
+    GIL during thresholding and labelling, so this scales with cores.
+    
+    Args:
+        text_bboxes: Iterable of text bounding boxes [x1, y1, x2, y2]
+        image: Full image
+        max_workers: Maximum number of worker threads (defaults to the executor's choice)
+    
+    Returns:
+        List of inpaint bounding box lists, in the same order as text_bboxes
+    """
+    text_bboxes = list(text_bboxes)
+    if len(text_bboxes) <= 1:
+        return [get_inpaint_bboxes(bbox, image) for bbox in text_bboxes]
 
-    return adjusted_bboxes
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda bbox: get_inpaint_bboxes(bbox, image), text_bboxes))
 
 def is_mostly_contained(outer_box, inner_box, threshold):
     """
@@ -1,7 +1,8 @@
 import math
 import numpy as np
-from typing import Callable, Any
+from typing import Callable, Any, Iterator
 from .general import calculate_iou
+from .band_reader import BandReader
 
 
 class ImageSlicer:
@@ -49,7 +50,9 @@ class ImageSlicer:
     
     def calculate_slice_params(self, image: np.ndarray) -> tuple[int, int, int, int]:
         height, width = image.shape[:2]
-        
+        return self.calculate_slice_params_for_shape(height, width)
+    
+    def calculate_slice_params_for_shape(self, height: int, width: int) -> tuple[int, int, int, int]:
         slice_width = width  # Full width of the image
         slice_height = int(slice_width * self.target_slice_ratio)
         effective_slice_height = int(slice_height * (1 - self.overlap_height_ratio))
@@ -429,4 +432,82 @@ class ImageSlicer:
                 image_height=image.shape[0]
             )
             
-        return combined_boxes
\ No newline at end of file
+        return combined_boxes
+    
+    def iter_band_detections(self, 
+                             reader: BandReader,
+                             detect_func: Callable[[np.ndarray], tuple[np.ndarray, np.ndarray]]
+                             ) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+        """
+        Stream detection over horizontal bands of a tall image.
+        
+        Bands are read one at a time from the reader and detected with overlap.
+        Boxes are merged across band seams as they arrive, and a box is yielded
+        as soon as no later band can still merge with it. Peak memory is bounded
+        by the band size rather than the image height.
+        
+        Args:
+            reader: Band reader over the image
+            detect_func: Function returning (bubble_boxes, text_boxes) for a band
+            
+        Yields:
+            Tuples of (final_bubble_boxes, final_text_boxes) in image coordinates
+        """
+        height, width = reader.height, reader.width
+        _, slice_height, effective_slice_height, num_slices = \
+            self.calculate_slice_params_for_shape(height, width)
+        
+        # Boxes are only merged with neighbours within one band, so scale the
+        # merge distance to the band rather than to the full strip height
+        y_margin = self.merge_y_distance_threshold * slice_height
+        pending_bubbles = np.empty((0, 4))
+        pending_texts = np.empty((0, 4))
+        
+        for band_number in range(num_slices):
+            start_y = band_number * effective_slice_height
+            if band_number == num_slices - 1:
+                end_y = height
+            else:
+                end_y = min(start_y + slice_height, height)
+            
+            band = reader.read_rows(start_y, end_y)
+            bubble_boxes, text_boxes = detect_func(band)
+            del band
+            
+            pending_bubbles = self._merge_band_boxes(pending_bubbles, bubble_boxes, start_y, slice_height)
+            pending_texts = self._merge_band_boxes(pending_texts, text_boxes, start_y, slice_height)
+            
+            # Anything ending clear of the next band (plus merge margin) is final
+            if band_number < num_slices - 1:
+                next_start = (band_number + 1) * effective_slice_height
+                final_bubbles, pending_bubbles = self._split_final_boxes(pending_bubbles, next_start - y_margin)
+                final_texts, pending_texts = self._split_final_boxes(pending_texts, next_start - y_margin)
+                
+                # Hold back text that may still sit inside a bubble that is not final yet,
+                # so every yielded text box can be matched against its bubble
+                if final_texts.size > 0 and pending_bubbles.size > 0:
+                    in_pending_bubble = (final_texts[:, 3][:, None] > pending_bubbles[:, 1][None, :]).any(axis=1)
+                    pending_texts = np.vstack([pending_texts, final_texts[in_pending_bubble]])
+                    final_texts = final_texts[~in_pending_bubble]
+            else:
+                final_bubbles, pending_bubbles = pending_bubbles, np.empty((0, 4))
+                final_texts, pending_texts = pending_texts, np.empty((0, 4))
+            
+            if final_bubbles.size > 0 or final_texts.size > 0:
+                yield final_bubbles, final_texts
+    
+    def _merge_band_boxes(self, pending: np.ndarray, boxes: np.ndarray,
+                          start_y: int, band_height: int) -> np.ndarray:
+        if not isinstance(boxes, np.ndarray) or boxes.size == 0:
+            return pending
+        boxes = self.adjust_box_coordinates(boxes.reshape(-1, 4), start_y)
+        combined = np.vstack([pending, boxes]) if pending.size > 0 else boxes
+        merged, _ = self.merge_overlapping_boxes(combined, image_height=band_height)
+        return merged.reshape(-1, 4)
+    
+    @staticmethod
+    def _split_final_boxes(boxes: np.ndarray, final_below_y: float) -> tuple[np.ndarray, np.ndarray]:
+        if boxes.size == 0:
+            return boxes, boxes
+        is_final = boxes[:, 3] < final_below_y
+        return boxes[is_final], boxes[~is_final]
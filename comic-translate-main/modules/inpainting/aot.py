@@ -3,12 +3,12 @@ import cv2
 import numpy as np
 import torch
 
+from ..utils.inpaint_runtime import load_inpaint_model
 from .base import InpaintModel
 from .schema import Config
 
 from ..utils.inpainting import (
     get_cache_path_by_url,
-    load_jit_model,
 )
 
 AOT_MODEL_URL = os.environ.get(
@@ -24,7 +24,10 @@ class AOT(InpaintModel):
     max_size = 1024
 
     def init_model(self, device, **kwargs):
-        self.model = load_jit_model(AOT_MODEL_URL, device, AOT_MODEL_MD5)
+        # Masked image in [-1, 1] and float mask, as built in forward
+        example_inputs = (torch.zeros(1, 3, 512, 512), torch.zeros(1, 1, 512, 512))
+        self.model = load_inpaint_model(AOT_MODEL_URL, device, AOT_MODEL_MD5,
+                                        example_inputs=example_inputs, **kwargs)
 		
     @staticmethod
     def is_downloaded() -> bool:
@@ -36,23 +39,35 @@ class AOT(InpaintModel):
         mask: [H, W] or [H, W, 1]
         return: BGR IMAGE
         """
-        
-        # Ensure mask is 2D
-        if len(mask.shape) == 3 and mask.shape[2] > 1:
-            mask = mask[:, :, 0]  # Take just one channel if mask is 3D
-        elif len(mask.shape) == 3:
-            mask = mask[:, :, 0]
+        return self.forward_batch([image], [mask], config)[0]
+
+    def forward_batch(self, images, masks, config: Config):
+        """Same as forward for a list of same-shaped images, run as one batch
+        images: N x [H, W, C] RGB
+        masks: N x [H, W] or [H, W, 1]
+        return: N x BGR IMAGE
+        """
         
         # Store original dimensions
-        im_h, im_w = image.shape[:2]
+        im_h, im_w = images[0].shape[:2]
+
+        img_batch = []
+        mask_batch = []
+        for image, mask in zip(images, masks):
+            # Ensure mask is 2D
+            if len(mask.shape) == 3:
+                mask = mask[:, :, 0]  # Take just one channel if mask is 3D
 
-        if max(image.shape[0:2]) > self.max_size:
-            image = resize_keep_aspect(image, self.max_size)
-            mask = resize_keep_aspect(mask, self.max_size)
+            if max(image.shape[0:2]) > self.max_size:
+                image = resize_keep_aspect(image, self.max_size)
+                mask = resize_keep_aspect(mask, self.max_size)
+
+            img_batch.append(image)
+            mask_batch.append(mask)
             
         # Convert to torch tensors with correct normalization
-        img_torch = torch.from_numpy(image).permute(2, 0, 1).unsqueeze_(0).float() / 127.5 - 1.0
-        mask_torch = torch.from_numpy(mask).unsqueeze_(0).unsqueeze_(0).float() / 255.0
+        img_torch = torch.from_numpy(np.stack(img_batch)).permute(0, 3, 1, 2).float() / 127.5 - 1.0
+        mask_torch = torch.from_numpy(np.stack(mask_batch)).unsqueeze_(1).float() / 255.0
         mask_torch[mask_torch < 0.5] = 0
         mask_torch[mask_torch >= 0.5] = 1
         
@@ -68,18 +83,20 @@ class AOT(InpaintModel):
             img_inpainted_torch = self.model(img_torch, mask_torch)
         
         # Post-process result
-        img_inpainted = ((img_inpainted_torch.cpu().squeeze_(0).permute(1, 2, 0).numpy() + 1.0) * 127.5)
-        img_inpainted = (np.clip(np.round(img_inpainted), 0, 255)).astype(np.uint8)
-        
-        # Ensure output dimensions match input
-        new_shape = img_inpainted.shape[:2]
-        if new_shape[0] != im_h or new_shape[1] != im_w:
-            img_inpainted = cv2.resize(img_inpainted, (im_w, im_h), interpolation=cv2.INTER_LINEAR)
+        img_inpainted_batch = ((img_inpainted_torch.cpu().permute(0, 2, 3, 1).numpy() + 1.0) * 127.5)
+        img_inpainted_batch = (np.clip(np.round(img_inpainted_batch), 0, 255)).astype(np.uint8)
         
-        # Convert to BGR for return
-        img_inpainted = cv2.cvtColor(img_inpainted, cv2.COLOR_RGB2BGR)
+        results = []
+        for img_inpainted in img_inpainted_batch:
+            # Ensure output dimensions match input
+            new_shape = img_inpainted.shape[:2]
+            if new_shape[0] != im_h or new_shape[1] != im_w:
+                img_inpainted = cv2.resize(img_inpainted, (im_w, im_h), interpolation=cv2.INTER_LINEAR)
+            
+            # Convert to BGR for return
+            results.append(cv2.cvtColor(img_inpainted, cv2.COLOR_RGB2BGR))
         
-        return img_inpainted
+        return results
 
 def resize_keep_aspect(img, target_size):
     max_dim = max(img.shape[:2])  
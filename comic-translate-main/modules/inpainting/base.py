@@ -1,4 +1,5 @@
 import abc
+import time
 from typing import Optional
 
 import cv2
@@ -10,9 +11,12 @@ from ..utils.inpainting import (
     boxes_from_mask,
     resize_max_size,
     pad_img_to_modulo,
+    pad_img_to_shape,
+    ceil_modulo,
     # switch_mps_device,
 )
 from .schema import Config, HDStrategy
+from .color_correction import match_histograms, normalized_cdf, histogram_lut
 
 
 class InpaintModel:
@@ -20,6 +24,10 @@ class InpaintModel:
     min_size: Optional[int] = None
     pad_mod = 8
     pad_to_square = False
+    # Crops are padded up to multiples of this size so that crops of similar
+    # size share a shape class and can run through the model as one batch
+    crop_bucket_step = 64
+    crop_batch_size = 8
 
     def __init__(self, device, **kwargs):
         """
@@ -29,7 +37,9 @@ class InpaintModel:
         """
         # device = switch_mps_device(self.name, device)
         self.device = device
+        start = time.perf_counter()
         self.init_model(device, **kwargs)
+        logger.info(f"{self.name} initialized in {time.perf_counter() - start:.2f}s")
 
     @abc.abstractmethod
     def init_model(self, device, **kwargs):
@@ -61,6 +71,10 @@ class InpaintModel:
         logger.info(f"final forward pad size: {pad_image.shape}")
 
         result = self.forward(pad_image, pad_mask, config)
+        return self._blend_result(result, image, mask, config)
+
+    def _blend_result(self, result, image, mask, config: Config):
+        origin_height, origin_width = image.shape[:2]
         result = result[0:origin_height, 0:origin_width, :]
 
         result, image, mask = self.forward_post_process(result, image, mask, config)
@@ -69,7 +83,63 @@ class InpaintModel:
         result = result * (mask / 255) + image[:, :, ::-1] * (1 - (mask / 255))
         return result
 
+    def forward_batch(self, images, masks, config: Config):
+        """Run forward on a list of same-shaped padded images.
+        Models that accept a batch dimension override this to run one batch.
+        """
+        return [self.forward(image, mask, config) for image, mask in zip(images, masks)]
+
+    def _bucket_shape(self, height, width):
+        step = ceil_modulo(self.crop_bucket_step, self.pad_mod)
+        out_height = ceil_modulo(height, step)
+        out_width = ceil_modulo(width, step)
+
+        if self.min_size is not None:
+            out_height = max(self.min_size, out_height)
+            out_width = max(self.min_size, out_width)
+
+        if self.pad_to_square:
+            out_height = out_width = max(out_height, out_width)
+
+        return out_height, out_width
+
+    def _pad_forward_batch(self, images, masks, config: Config):
+        """Batched equivalent of calling _pad_forward on each image/mask pair.
+        Crops are grouped into a few padded shape classes and each class runs
+        through the model in batches of up to crop_batch_size.
+        """
+        buckets = {}
+        for idx, image in enumerate(images):
+            shape = self._bucket_shape(*image.shape[:2])
+            buckets.setdefault(shape, []).append(idx)
+
+        logger.info(f"crop batches: {len(images)} crops in {len(buckets)} shape classes")
+
+        results = [None] * len(images)
+        for (bucket_h, bucket_w), indices in buckets.items():
+            for start in range(0, len(indices), self.crop_batch_size):
+                chunk = indices[start:start + self.crop_batch_size]
+                pad_images = [pad_img_to_shape(images[i], bucket_h, bucket_w) for i in chunk]
+                pad_masks = [pad_img_to_shape(masks[i], bucket_h, bucket_w) for i in chunk]
+
+                logger.info(f"final forward batch size: {len(chunk)}x{pad_images[0].shape}")
+
+                try:
+                    outputs = self.forward_batch(pad_images, pad_masks, config)
+                except RuntimeError as e:
+                    # Some traced models are fixed to a batch of one
+                    logger.warning(f"Batched forward failed, running crops one by one: {e}")
+                    outputs = InpaintModel.forward_batch(self, pad_images, pad_masks, config)
+
+                for i, output in zip(chunk, outputs):
+                    results[i] = self._blend_result(output, images[i], masks[i], config)
+
+        return results
+
     def forward_post_process(self, result, image, mask, config):
+        if config.match_histograms:
+            # Pull the result's tones towards the original, measured outside the mask
+            result = match_histograms(result, image[:, :, ::-1], mask)
         return result, image, mask
 
     @torch.no_grad()
@@ -79,19 +149,29 @@ class InpaintModel:
         masks: [H, W]
         return: BGR IMAGE
         """
+        img_h, img_w = image.shape[:2]
+        if img_h > config.hd_strategy_tile_trigger_size and img_h >= 2 * img_w:
+            return self._tiled_forward(image, mask, config)
+        return self._strategy_forward(image, mask, config)
+
+    def _strategy_forward(self, image, mask, config: Config):
         inpaint_result = None
+        if config.hd_strategy == HDStrategy.AUTO:
+            config = self.select_hd_strategy(image, mask, config)
         logger.info(f"hd_strategy: {config.hd_strategy}")
         if config.hd_strategy == HDStrategy.CROP:
             if max(image.shape) > config.hd_strategy_crop_trigger_size:
                 logger.info(f"Run crop strategy")
                 boxes = boxes_from_mask(mask)
-                crop_result = []
-                for box in boxes:
-                    crop_image, crop_box = self._run_box(image, mask, box, config)
-                    crop_result.append((crop_image, crop_box))
+                crops = [self._crop_box(image, mask, box, config) for box in boxes]
+                crop_images = self._pad_forward_batch(
+                    [crop_img for crop_img, _, _ in crops],
+                    [crop_mask for _, crop_mask, _ in crops],
+                    config,
+                )
 
                 inpaint_result = image[:, :, ::-1]
-                for crop_image, crop_box in crop_result:
+                for (_, _, crop_box), crop_image in zip(crops, crop_images):
                     x1, y1, x2, y2 = crop_box
                     inpaint_result[y1:y2, x1:x2, :] = crop_image
 
@@ -128,6 +208,120 @@ class InpaintModel:
 
         return inpaint_result
 
+    def _tile_windows(self, mask, config: Config):
+        """Row ranges [y0, y1) covering every masked row of a tall page.
+
+        Masked rows are grouped into runs, each run is padded with the tile
+        overlap as context, and runs longer than the tile size are split into
+        windows that overlap by at least hd_strategy_tile_overlap rows.
+        """
+        img_h = mask.shape[0]
+        overlap = config.hd_strategy_tile_overlap
+        tile_size = max(config.hd_strategy_tile_size, 2 * overlap + 1)
+
+        rows = np.flatnonzero(mask.reshape(img_h, -1).max(axis=1) > 127)
+        if rows.size == 0:
+            return []
+
+        # Runs further apart than two overlaps get separate, non-overlapping windows
+        breaks = np.flatnonzero(np.diff(rows) > 2 * overlap)
+        starts = np.r_[rows[0], rows[breaks + 1]]
+        ends = np.r_[rows[breaks], rows[-1]] + 1
+
+        windows = []
+        for start, end in zip(starts, ends):
+            start = max(0, int(start) - overlap)
+            end = min(img_h, int(end) + overlap)
+            if end - start <= tile_size:
+                windows.append((start, end))
+                continue
+            # Spread the windows evenly so none of them is a thin sliver
+            count = int(np.ceil((end - start - overlap) / (tile_size - overlap)))
+            step = (end - start - tile_size) / (count - 1)
+            for i in range(count):
+                y0 = start + int(round(i * step))
+                windows.append((y0, y0 + tile_size))
+        return windows
+
+    def _tiled_forward(self, image, mask, config: Config):
+        """Inpaint a tall page band by band, only where the mask is non-empty.
+
+        Each band is run through the configured strategy and written straight
+        into a single uint8 output buffer; rows shared with the previous band
+        are cross-faded to hide seams.
+
+        Returns:
+            BGR uint8 image
+        """
+        windows = self._tile_windows(mask, config)
+        logger.info(f"Run tiled inpainting, image size: {image.shape}, {len(windows)} bands")
+
+        result = np.ascontiguousarray(image[:, :, ::-1])
+        prev_end = 0
+        for y0, y1 in windows:
+            # Copy the band so strategies that paste into their input leave the page untouched
+            band = self._strategy_forward(image[y0:y1].copy(), mask[y0:y1].copy(), config)
+            band = cv2.convertScaleAbs(band)
+
+            seam = max(0, min(prev_end, y1) - y0)
+            if seam:
+                alpha = np.linspace(0, 1, seam + 2, dtype=np.float32)[1:-1, None, None]
+                blended = band[:seam] * alpha + result[y0:y0 + seam] * (1 - alpha)
+                result[y0:y0 + seam] = np.rint(blended).astype(np.uint8)
+            result[y0 + seam:y1] = band[seam:]
+            prev_end = y1
+
+        return result
+
+    def select_hd_strategy(self, image, mask, config: Config) -> Config:
+        """Resolve HDStrategy.AUTO into a concrete strategy for this image.
+
+        Small images run at original size. Otherwise, if the crops around the
+        masked regions cover clearly less than the image, crop is used with a
+        margin scaled to the regions; when they would cover most of the image,
+        resize is used for large images and original size for the rest.
+
+        Returns:
+            A copy of config with the chosen strategy
+        """
+        img_h, img_w = image.shape[:2]
+        image_area = img_h * img_w
+        coverage = float(np.count_nonzero(mask > 127)) / image_area
+        boxes = boxes_from_mask(mask)
+
+        if max(img_h, img_w) <= config.hd_strategy_auto_original_limit or not boxes:
+            update = {"hd_strategy": HDStrategy.ORIGINAL}
+        else:
+            # Context margin grows with the regions: half the median region size, within [64, 256]
+            region_sizes = [max(box[2] - box[0], box[3] - box[1]) for box in boxes]
+            margin = int(np.clip(np.median(region_sizes) / 2, 64, 256))
+
+            crop_area = sum(
+                min(box[2] - box[0] + 2 * margin, img_w) * min(box[3] - box[1] + 2 * margin, img_h)
+                for box in boxes
+            )
+
+            if crop_area < 0.5 * image_area:
+                update = {
+                    "hd_strategy": HDStrategy.CROP,
+                    "hd_strategy_crop_margin": margin,
+                    "hd_strategy_crop_trigger_size": 0,
+                }
+            elif max(img_h, img_w) > config.hd_strategy_auto_resize_limit:
+                update = {
+                    "hd_strategy": HDStrategy.RESIZE,
+                    "hd_strategy_resize_limit": config.hd_strategy_auto_resize_limit,
+                }
+            else:
+                update = {"hd_strategy": HDStrategy.ORIGINAL}
+
+        logger.info(
+            f"Auto hd_strategy: {update['hd_strategy'].value} for image {img_w}x{img_h}, "
+            f"mask coverage {coverage:.1%}, {len(boxes)} regions"
+            + (f", crop margin {update['hd_strategy_crop_margin']}" if "hd_strategy_crop_margin" in update else "")
+        )
+        return config.copy(update=update)
+
     def _crop_box(self, image, mask, box, config: Config):
         """
 
@@ -181,44 +375,13 @@ class InpaintModel:
         return crop_img, crop_mask, [l, t, r, b]
 
     def _calculate_cdf(self, histogram):
-        cdf = histogram.cumsum()
-        normalized_cdf = cdf / float(cdf.max())
-        return normalized_cdf
+        return normalized_cdf(np.asarray(histogram))
 
     def _calculate_lookup(self, source_cdf, reference_cdf):
-        lookup_table = np.zeros(256)
-        lookup_val = 0
-        for source_index, source_val in enumerate(source_cdf):
-            for reference_index, reference_val in enumerate(reference_cdf):
-                if reference_val >= source_val:
-                    lookup_val = reference_index
-                    break
-            lookup_table[source_index] = lookup_val
-        return lookup_table
+        return histogram_lut(source_cdf[np.newaxis], reference_cdf[np.newaxis])[0]
 
     def _match_histograms(self, source, reference, mask):
-        transformed_channels = []
-        for channel in range(source.shape[-1]):
-            source_channel = source[:, :, channel]
-            reference_channel = reference[:, :, channel]
-
-            # only calculate histograms for non-masked parts
-            source_histogram, _ = np.histogram(source_channel[mask == 0], 256, [0, 256])
-            reference_histogram, _ = np.histogram(
-                reference_channel[mask == 0], 256, [0, 256]
-            )
-
-            source_cdf = self._calculate_cdf(source_histogram)
-            reference_cdf = self._calculate_cdf(reference_histogram)
-
-            lookup = self._calculate_lookup(source_cdf, reference_cdf)
-
-            transformed_channels.append(cv2.LUT(source_channel, lookup))
-
-        result = cv2.merge(transformed_channels)
-        result = cv2.convertScaleAbs(result)
-
-        return result
+        return match_histograms(source, reference, mask)
 
     def _apply_cropper(self, image, mask, config: Config):
         img_h, img_w = image.shape[:2]
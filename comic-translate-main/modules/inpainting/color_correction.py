@@ -0,0 +1,70 @@
+import cv2
+import numpy as np
+
+
+def channel_histograms(image: np.ndarray, mask: np.ndarray = None) -> np.ndarray:
+    """
+    256-bin histograms of every channel of a uint8 image in one pass.
+
+    Args:
+        image: [H, W, C] uint8 image
+        mask: Optional [H, W] boolean mask of the pixels to count
+
+    Returns:
+        [C, 256] array of counts
+    """
+    channels = image.shape[-1]
+    pixels = image.reshape(-1, channels) if mask is None else image[mask]
+    # Offset each channel into its own block of 256 bins
+    binned = pixels.astype(np.intp) + np.arange(channels, dtype=np.intp) * 256
+    return np.bincount(binned.ravel(), minlength=channels * 256).reshape(channels, 256)
+
+
+def normalized_cdf(histograms: np.ndarray) -> np.ndarray:
+    """Cumulative histograms scaled to end at 1, along the last axis."""
+    cdf = histograms.cumsum(axis=-1).astype(np.float64)
+    return cdf / np.maximum(cdf[..., -1:], 1)
+
+
+def histogram_lut(source_cdf: np.ndarray, reference_cdf: np.ndarray) -> np.ndarray:
+    """
+    Lookup table mapping each source level to the first reference level whose
+    cumulative frequency reaches the source's.
+
+    Args:
+        source_cdf: [C, 256] normalized source CDFs
+        reference_cdf: [C, 256] normalized reference CDFs
+
+    Returns:
+        [C, 256] uint8 lookup table
+    """
+    lut = np.stack([
+        np.searchsorted(ref, src, side='left') for src, ref in zip(source_cdf, reference_cdf)
+    ])
+    return np.minimum(lut, 255).astype(np.uint8)
+
+
+def match_histograms(source: np.ndarray, reference: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """
+    Remap the tones of source so that, outside the mask, its channel histograms
+    match those of reference.
+
+    Args:
+        source: [H, W, C] uint8 image to correct (e.g. the inpainting result)
+        reference: [H, W, C] uint8 image with the target tones (e.g. the original)
+        mask: [H, W] mask, pixels equal to 0 are used to build the histograms
+
+    Returns:
+        Corrected uint8 image; source unchanged if there are no unmasked pixels
+    """
+    source = cv2.convertScaleAbs(source) if source.dtype != np.uint8 else source
+    known = mask.reshape(mask.shape[:2]) == 0
+    if not known.any():
+        return source
+
+    lut = histogram_lut(
+        normalized_cdf(channel_histograms(source, known)),
+        normalized_cdf(channel_histograms(reference, known)),
+    )
+    # cv2.LUT applies a per-channel table given as [256, 1, C]
+    return cv2.LUT(np.ascontiguousarray(source), lut.T.reshape(256, 1, -1))
@@ -6,9 +6,9 @@ import torch
 from ..utils.inpainting import (
     norm_img,
     get_cache_path_by_url,
-    load_jit_model,
     download_model
 )
+from ..utils.inpaint_runtime import load_inpaint_model
 from .base import InpaintModel
 from .schema import Config
 
@@ -35,7 +35,10 @@ class LaMa(InpaintModel):
     pad_mod = 8
 
     def init_model(self, device, **kwargs):
-        self.model = load_jit_model(LAMA_MODEL_URL, device, LAMA_MODEL_MD5).eval()
+        # Image in [0, 1] and binary int64 mask, as built in forward
+        example_inputs = (torch.zeros(1, 3, 512, 512), torch.zeros(1, 1, 512, 512, dtype=torch.int64))
+        self.model = load_inpaint_model(LAMA_MODEL_URL, device, LAMA_MODEL_MD5,
+                                        example_inputs=example_inputs, **kwargs)
 
     @staticmethod
     def download():
@@ -51,17 +54,23 @@ class LaMa(InpaintModel):
         mask: [H, W]
         return: BGR IMAGE
         """
-        image = norm_img(image)
-        mask = norm_img(mask)
+        return self.forward_batch([image], [mask], config)[0]
+
+    def forward_batch(self, images, masks, config: Config):
+        """Same as forward for a list of same-shaped images, run as one batch
+        images: N x [H, W, C] RGB
+        masks: N x [H, W]
+        return: N x BGR IMAGE
+        """
+        image = np.stack([norm_img(image) for image in images])
+        mask = np.stack([norm_img(mask) for mask in masks])
 
         mask = (mask > 0) * 1
-        image = torch.from_numpy(image).unsqueeze(0).to(self.device)
-        mask = torch.from_numpy(mask).unsqueeze(0).to(self.device)
+        image = torch.from_numpy(image).to(self.device)
+        mask = torch.from_numpy(mask).to(self.device)
 
         inpainted_image = self.model(image, mask)
 
-        cur_res = inpainted_image[0].permute(1, 2, 0).detach().cpu().numpy()
+        cur_res = inpainted_image.permute(0, 2, 3, 1).detach().cpu().numpy()
         cur_res = np.clip(cur_res * 255, 0, 255).astype("uint8")
-        cur_res = cv2.cvtColor(cur_res, cv2.COLOR_RGB2BGR)
-        return cur_res
-    
+        return [cv2.cvtColor(res, cv2.COLOR_RGB2BGR) for res in cur_res]
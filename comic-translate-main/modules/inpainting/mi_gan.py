@@ -1,16 +1,17 @@
 import os
 
 import cv2
+import numpy as np
 import torch
 
 from ..utils.inpainting import (
-    load_jit_model,
     download_model,
     get_cache_path_by_url,
     boxes_from_mask,
     resize_max_size,
     norm_img,
 )
+from ..utils.inpaint_runtime import load_inpaint_model
 from .base import InpaintModel
 from .schema import Config
 
@@ -29,7 +30,10 @@ class MIGAN(InpaintModel):
     is_erase_model = True
 
     def init_model(self, device, **kwargs):
-        self.model = load_jit_model(MIGAN_MODEL_URL, device, MIGAN_MODEL_MD5).eval()
+        # Mask and masked image stacked into 4 channels, as built in forward
+        example_inputs = (torch.zeros(1, 4, 512, 512),)
+        self.model = load_inpaint_model(MIGAN_MODEL_URL, device, MIGAN_MODEL_MD5,
+                                        example_inputs=example_inputs, **kwargs)
 
     @staticmethod
     def download():
@@ -50,14 +54,20 @@ class MIGAN(InpaintModel):
             return self._pad_forward(image, mask, config)
 
         boxes = boxes_from_mask(mask)
-        crop_result = []
         config.hd_strategy_crop_margin = 128
-        for box in boxes:
-            crop_image, crop_mask, crop_box = self._crop_box(image, mask, box, config)
+        crops = [self._crop_box(image, mask, box, config) for box in boxes]
+
+        # Every crop is resized to fit 512 and padded to a 512 square,
+        # so all crops run through the model as batches of one shape
+        inpaint_results = self._pad_forward_batch(
+            [resize_max_size(crop_image, size_limit=512) for crop_image, _, _ in crops],
+            [resize_max_size(crop_mask, size_limit=512) for _, crop_mask, _ in crops],
+            config,
+        )
+
+        crop_result = []
+        for (crop_image, crop_mask, crop_box), inpaint_result in zip(crops, inpaint_results):
             origin_size = crop_image.shape[:2]
-            resize_image = resize_max_size(crop_image, size_limit=512)
-            resize_mask = resize_max_size(crop_mask, size_limit=512)
-            inpaint_result = self._pad_forward(resize_image, resize_mask, config)
 
             # only paste masked area result
             inpaint_result = cv2.resize(
@@ -86,14 +96,21 @@ class MIGAN(InpaintModel):
         masks: [H, W] mask area == 255
         return: BGR IMAGE
         """
+        return self.forward_batch([image], [mask], config)[0]
+
+    def forward_batch(self, images, masks, config: Config):
+        """Same as forward for a list of same-shaped images, run as one batch
+        images: N x [H, W, C] RGB
+        masks: N x [H, W] mask area == 255
+        return: N x BGR IMAGE
+        """
 
-        image = norm_img(image)  # [0, 1]
+        image = np.stack([norm_img(image) for image in images])  # [0, 1]
         image = image * 2 - 1  # [0, 1] -> [-1, 1]
-        mask = (mask > 120) * 255
-        mask = norm_img(mask)
+        mask = np.stack([norm_img((mask > 120) * 255) for mask in masks])
 
-        image = torch.from_numpy(image).unsqueeze(0).to(self.device)
-        mask = torch.from_numpy(mask).unsqueeze(0).to(self.device)
+        image = torch.from_numpy(image).to(self.device)
+        mask = torch.from_numpy(mask).to(self.device)
 
         erased_img = image * (1 - mask)
         input_image = torch.cat([0.5 - mask, erased_img], dim=1)
@@ -105,6 +122,5 @@ class MIGAN(InpaintModel):
             .clamp(0, 255)
             .to(torch.uint8)
         )
-        output = output[0].cpu().numpy()
-        cur_res = cv2.cvtColor(output, cv2.COLOR_RGB2BGR)
-        return cur_res
+        output = output.cpu().numpy()
+        return [cv2.cvtColor(res, cv2.COLOR_RGB2BGR) for res in output]
@@ -16,6 +16,9 @@ class HDStrategy(str, Enum):
     RESIZE = "Resize"
     # Crop masking area(with a margin controlled by hd_strategy_crop_margin) from the original image to do inpainting
     CROP = "Crop"
+    # Pick one of the strategies above (and the crop margin) per image from the mask coverage,
+    # the number of masked regions and the image size
+    AUTO = "Auto"
 
 
 # class LDMSampler(str, Enum):
@@ -51,6 +54,22 @@ class Config(BaseModel):
     hd_strategy_crop_trigger_size: int = 512
     hd_strategy_resize_limit: int = 512
 
+    # Pages taller than hd_strategy_tile_trigger_size (and at least twice as tall as wide)
+    # are inpainted in overlapping horizontal bands around the masked rows, each band
+    # going through the selected strategy on its own
+    hd_strategy_tile_trigger_size: int = 4096
+    hd_strategy_tile_size: int = 2048
+    hd_strategy_tile_overlap: int = 128
+
+    # Match the tones of the inpainted result to the original image outside the mask
+    match_histograms: bool = True
+
+    # Configs for the Auto strategy
+    # Images whose longer side is at most this size are always inpainted at original size
+    hd_strategy_auto_original_limit: int = 1024
+    # Resize limit used when Auto falls back to the resize strategy
+    hd_strategy_auto_resize_limit: int = 1536
+
     # # Configs for Stable Diffusion 1.5
     # prompt: str = ""
     # negative_prompt: str = ""
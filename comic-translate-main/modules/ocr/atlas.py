@@ -0,0 +1,145 @@
+import numpy as np
+
+from ..utils.textblock import TextBlock, sort_textblock_rectangles
+
+
+class AtlasPlacement:
+    """Where one block crop sits in an atlas and where it came from on its page."""
+
+    __slots__ = ('blk', 'atlas_xyxy', 'page_xy')
+
+    def __init__(self, blk: TextBlock, atlas_xyxy: tuple, page_xy: tuple):
+        self.blk = blk
+        self.atlas_xyxy = atlas_xyxy
+        self.page_xy = page_xy
+
+
+def block_crop_box(blk: TextBlock, img: np.ndarray, padding: int) -> tuple:
+    """
+    Region of a block to OCR, grown by padding pixels and clipped to the image.
+
+    This is the bubble box when the block has one, as whole-page OCR gives a
+    block every line inside its bubble, and the text box otherwise.
+    """
+    h, w = img.shape[:2]
+    box = blk.bubble_xyxy if blk.bubble_xyxy is not None else blk.xyxy
+    x1, y1, x2, y2 = [int(v) for v in box]
+    return max(0, x1 - padding), max(0, y1 - padding), min(w, x2 + padding), min(h, y2 + padding)
+
+
+def pack_atlases(pages: list[tuple[np.ndarray, list[TextBlock]]], max_width: int = 2048,
+                 max_height: int = 8192, gap: int = 24, padding: int = 8,
+                 background: int = 255) -> list[tuple[np.ndarray, list[AtlasPlacement]]]:
+    """
+    Pack the text crops of every block into as few mosaics as fit the size limits.
+
+    Crops are placed on shelves, tallest first, separated by gap pixels of
+    background so the OCR service does not read across two blocks. A new
+    atlas is started when the current one would exceed max_height.
+
+    Args:
+        pages: (image, blocks) pairs; crops of several pages can share an atlas
+        max_width: Width of each atlas (wider crops get an atlas row of their own)
+        max_height: Height limit of each atlas
+        gap: Blank pixels between crops and around the border
+        padding: Pixels added around each block's crop box
+        background: Gray level of the blank space
+
+    Returns:
+        List of (atlas image, placements)
+    """
+    items = []
+    for img, blk_list in pages:
+        for blk in blk_list:
+            x1, y1, x2, y2 = block_crop_box(blk, img, padding)
+            if x1 < x2 and y1 < y2:
+                items.append((img, blk, (x1, y1, x2, y2)))
+            else:
+                blk.text = ""
+    items.sort(key=lambda item: item[2][3] - item[2][1], reverse=True)
+
+    # Lay out shelves first, then draw each atlas once its size is known
+    layouts = []
+    placements, shelf_x, shelf_y, shelf_h, atlas_w, atlas_h = [], gap, gap, 0, 0, 0
+    for img, blk, (x1, y1, x2, y2) in items:
+        cw, ch = x2 - x1, y2 - y1
+        if shelf_x > gap and shelf_x + cw + gap > max_width:
+            shelf_x, shelf_y, shelf_h = gap, shelf_y + shelf_h + gap, 0
+        if placements and shelf_y + ch + gap > max_height:
+            layouts.append((placements, atlas_w, atlas_h))
+            placements, shelf_x, shelf_y, shelf_h, atlas_w = [], gap, gap, 0, 0
+        placements.append((img, blk, (x1, y1, x2, y2), (shelf_x, shelf_y)))
+        shelf_x += cw + gap
+        shelf_h = max(shelf_h, ch)
+        atlas_w = max(atlas_w, shelf_x)
+        atlas_h = shelf_y + shelf_h + gap
+    if placements:
+        layouts.append((placements, atlas_w, atlas_h))
+
+    atlases = []
+    for placements, atlas_w, atlas_h in layouts:
+        channels = placements[0][0].shape[2:]
+        atlas = np.full((atlas_h, atlas_w) + channels, background, dtype=np.uint8)
+        atlas_placements = []
+        for img, blk, (x1, y1, x2, y2), (ax, ay) in placements:
+            atlas[ay:ay + y2 - y1, ax:ax + x2 - x1] = img[y1:y2, x1:x2]
+            atlas_placements.append(AtlasPlacement(blk, (ax, ay, ax + x2 - x1, ay + y2 - y1), (x1, y1)))
+        atlases.append((atlas, atlas_placements))
+    return atlases
+
+
+def assign_atlas_lines(placements: list[AtlasPlacement], texts_bboxes: list, texts_string: list) -> None:
+    """
+    Give every block the text of the lines read inside its crop of the atlas.
+
+    Each line box goes to the crop it overlaps most and is moved back to page
+    coordinates before the lines of a block are ordered and joined. Lines that
+    fall only in the gaps between crops are dropped.
+    """
+    if not placements:
+        return
+    crops = np.array([p.atlas_xyxy for p in placements], dtype=np.float64)
+    entries = [[] for _ in placements]
+    for (x1, y1, x2, y2), text in zip(texts_bboxes, texts_string):
+        # Polygons may come back with their corners in either order
+        x1, x2 = sorted((x1, x2))
+        y1, y2 = sorted((y1, y2))
+        overlap = (
+            np.clip(np.minimum(crops[:, 2], x2) - np.maximum(crops[:, 0], x1), 0, None) *
+            np.clip(np.minimum(crops[:, 3], y2) - np.maximum(crops[:, 1], y1), 0, None)
+        )
+        index = int(overlap.argmax())
+        if overlap[index] <= 0:
+            continue
+        placement = placements[index]
+        cx1, cy1, cx2, cy2 = placement.atlas_xyxy
+        dx = placement.page_xy[0] - cx1
+        dy = placement.page_xy[1] - cy1
+        # Clip to the crop so a line can not spill into a neighbour's coordinates
+        line = (
+            max(x1, cx1) + dx, max(y1, cy1) + dy,
+            min(x2, cx2) + dx, min(y2, cy2) + dy,
+        )
+        entries[index].append((line, text))
+
+    for placement, blk_entries in zip(placements, entries):
+        blk = placement.blk
+        sorted_entries = sort_textblock_rectangles(blk_entries, blk.source_lang_direction)
+        if blk.source_lang in ['ja', 'zh']:
+            blk.text = ''.join(text for bbox, text in sorted_entries)
+        else:
+            blk.text = ' '.join(text for bbox, text in sorted_entries)
+
+
+def ocr_atlases(pages: list[tuple[np.ndarray, list[TextBlock]]], read_lines, **pack_kwargs) -> None:
+    """
+    OCR the blocks of one or more pages with one request per atlas.
+
+    Args:
+        pages: (image, blocks) pairs whose blocks receive the recognized text
+        read_lines: Callable taking an image and returning (line boxes, line texts)
+        **pack_kwargs: Layout options passed on to pack_atlases
+    """
+    for atlas, placements in pack_atlases(pages, **pack_kwargs):
+        texts_bboxes, texts_string = read_lines(atlas)
+        assign_atlas_lines(placements, texts_bboxes, texts_string)
@@ -3,7 +3,7 @@ import numpy as np
 import cv2
 import base64
 
-from ..utils.textblock import TextBlock
+from ..utils.textblock import TextBlock, adjust_text_line_coordinates
 
 
 class OCREngine(ABC):
@@ -11,6 +11,13 @@ class OCREngine(ABC):
     Abstract base class for all OCR engines.
     Each OCR implementation should inherit from this class and implement the process_image method.
     """
+
+    # Engines calling a paid web API set this, so nothing runs them speculatively
+    remote = False
+    # Engines reading a page in one pass (one request or one detector run per
+    # page, whatever the number of blocks) gain nothing from being sent fewer
+    # blocks, so their blocks are not deduplicated
+    whole_page = False
     
     @abstractmethod
     def process_image(self, img: np.ndarray, blk_list: list[TextBlock]) -> list[TextBlock]:
@@ -36,6 +43,10 @@ class OCREngine(ABC):
         """
         pass
 
+    def close(self) -> None:
+        """Release threads, sessions and other resources held by the engine."""
+        pass
+
     @staticmethod
     def set_source_language(blk_list: list[TextBlock], lang_code: str) -> None:
         """
@@ -48,6 +59,45 @@ class OCREngine(ABC):
         for blk in blk_list:
             blk.source_lang = lang_code
 
+    @staticmethod
+    def crop_blocks(img: np.ndarray, blk_list: list[TextBlock],
+                    expansion_percentage: int) -> tuple[list[TextBlock], list[np.ndarray]]:
+        """
+        Crop the region of every block, using its bubble when it has one.
+        Blocks whose region falls outside the image get empty text and are skipped.
+        
+        Args:
+            img: Input image as numpy array
+            blk_list: List of TextBlock objects
+            expansion_percentage: Percentage to expand text bounding boxes
+            
+        Returns:
+            Tuple of (blocks with a valid crop, their crops), in block order
+        """
+        crop_blocks = []
+        crops = []
+        for blk in blk_list:
+            # Get box coordinates
+            if blk.bubble_xyxy is not None:
+                x1, y1, x2, y2 = blk.bubble_xyxy
+            else:
+                x1, y1, x2, y2 = adjust_text_line_coordinates(
+                    blk.xyxy, 
+                    expansion_percentage, 
+                    expansion_percentage, 
+                    img
+                )
+            
+            # Check if coordinates are valid
+            if x1 < x2 and y1 < y2 and x1 >= 0 and y1 >= 0 and x2 <= img.shape[1] and y2 <= img.shape[0]:
+                crop_blocks.append(blk)
+                crops.append(img[y1:y2, x1:x2])
+            else:
+                print('Invalid textbbox to target img')
+                blk.text = ""
+                
+        return crop_blocks, crops
+
     @staticmethod
     def encode_image(image: np.ndarray, ext: str = '.jpg') -> str:
         """
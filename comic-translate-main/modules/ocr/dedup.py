@@ -0,0 +1,103 @@
+import hashlib
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+from ..utils.textblock import TextBlock
+
+
+def block_crop(img: np.ndarray, blk: TextBlock) -> np.ndarray:
+    """Pixels of the block's text box, clipped to the image (None if empty)."""
+    h, w = img.shape[:2]
+    x1, y1, x2, y2 = [int(v) for v in blk.xyxy]
+    x1, y1, x2, y2 = max(0, x1), max(0, y1), min(w, x2), min(h, y2)
+    if x1 >= x2 or y1 >= y2:
+        return None
+    return img[y1:y2, x1:x2]
+
+
+def exact_hash(crop: np.ndarray) -> str:
+    digest = hashlib.blake2b(np.ascontiguousarray(crop).tobytes(), digest_size=16)
+    digest.update(str(crop.shape).encode('utf-8'))
+    return 'x' + digest.hexdigest()
+
+
+def perceptual_hash(crop: np.ndarray, hash_size: int = 16, min_step: int = 8) -> tuple[int, np.ndarray]:
+    """
+    Difference hash of the crop and a coarse aspect-ratio bucket, so that
+    differently shaped boxes never match. Only brightness steps above min_step
+    set a bit, which keeps flat paper from flipping bits under re-encoding noise.
+    
+    Returns:
+        Tuple of (aspect bucket, hash_size * hash_size boolean array)
+    """
+    gray = cv2.cvtColor(crop, cv2.COLOR_RGB2GRAY) if crop.ndim == 3 else crop
+    small = cv2.resize(gray, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA).astype(np.int16)
+    bits = (small[:, 1:] - small[:, :-1]) > min_step
+    aspect = int(round(np.log2(crop.shape[1] / crop.shape[0]) * 4))
+    return aspect, bits.ravel()
+
+
+class OCRCropCache:
+    """
+    Text already recognized for a crop, keyed by the crop's hash.
+
+    Lets identical crops (repeated sound effects, recurring captions) be OCR'd
+    once, within a page and across the pages of a batch. Entries are scoped to
+    the OCR engine and language they were produced with and the oldest are
+    dropped past max_entries.
+
+    Exact matching is the default. Perceptual matching also catches re-encoded
+    or resampled copies, but two captions that differ by a single small
+    character can fall within max_distance, so it is opt-in.
+    """
+
+    def __init__(self, perceptual: bool = False, max_distance: int = 6, max_entries: int = 4096):
+        self.perceptual = perceptual
+        self.max_distance = max_distance
+        self.max_entries = max_entries
+        self._texts: OrderedDict[tuple, str] = OrderedDict()
+        # Perceptual hashes seen so far, per aspect bucket, with their keys
+        self._perceptual_index: dict[int, list[tuple[np.ndarray, str]]] = {}
+
+    def crop_key(self, img: np.ndarray, blk: TextBlock) -> str:
+        """
+        Key of the block's crop. In perceptual mode, crops within max_distance
+        differing bits of a crop seen before get that crop's key.
+        """
+        crop = block_crop(img, blk)
+        if crop is None:
+            return None
+        if not self.perceptual:
+            return exact_hash(crop)
+
+        aspect, bits = perceptual_hash(crop)
+        seen = self._perceptual_index.setdefault(aspect, [])
+        for other_bits, key in seen:
+            if np.count_nonzero(bits != other_bits) <= self.max_distance:
+                return key
+        key = f"p{aspect}:{np.packbits(bits).tobytes().hex()}"
+        seen.append((bits, key))
+        if len(seen) > self.max_entries:
+            del seen[0]
+        return key
+
+    def get(self, scope: tuple, key: str) -> str:
+        text = self._texts.get((scope, key))
+        if text is not None:
+            self._texts.move_to_end((scope, key))
+        return text
+
+    def put(self, scope: tuple, key: str, text: str) -> None:
+        # Empty results may be failed requests, so they are never reused
+        if not text:
+            return
+        self._texts[(scope, key)] = text
+        self._texts.move_to_end((scope, key))
+        while len(self._texts) > self.max_entries:
+            self._texts.popitem(last=False)
+
+    def clear(self) -> None:
+        self._texts.clear()
+        self._perceptual_index.clear()
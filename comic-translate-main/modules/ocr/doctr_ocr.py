@@ -2,6 +2,7 @@ import numpy as np
 import torch
 
 from .base import OCREngine
+from .atlas import ocr_atlases
 from ..utils.textblock import TextBlock
 from ..utils.pipeline_utils import lists_to_blk_list
 
@@ -9,21 +10,33 @@ from ..utils.pipeline_utils import lists_to_blk_list
 class DocTROCR(OCREngine):
     """OCR engine using DocTR"""
     
+    # The detector resizes its input to fit 1024 x 1024, so atlases are packed
+    # no larger than that and their text is read at its original scale
+    atlas_size = 1024
+    
     def __init__(self):
         self.model = None
         self.device = 'cpu'
+        self.use_atlas = True
+        
+    @property
+    def whole_page(self) -> bool:
+        return not self.use_atlas
         
-    def initialize(self, device: str = 'cpu') -> None:
+    def initialize(self, device: str = 'cpu', use_atlas: bool = True) -> None:
         """
          Initialize the DocTR engine.
          
          Args:
              device: Device to use ('cpu' or 'cuda')
+             use_atlas: Run only on the block regions, packed into a compact
+                 image, instead of the whole page
          """
         
         from doctr.models import ocr_predictor
 
         self.device = device
+        self.use_atlas = use_atlas
         # Initialize model if not already loaded
         if self.model is None:
             self.model = ocr_predictor(
@@ -37,14 +50,23 @@ class DocTROCR(OCREngine):
                 self.model.cuda().half()
         
     def process_image(self, img: np.ndarray, blk_list: list[TextBlock]) -> list[TextBlock]:
+        if self.use_atlas:
+            # Detection only sees the block regions, not the art around them
+            ocr_atlases([(img, blk_list)], self._read_lines,
+                        max_width=self.atlas_size, max_height=self.atlas_size)
+            return blk_list
+
+        texts_bboxes, texts_string = self._read_lines(img)
+        return lists_to_blk_list(blk_list, texts_bboxes, texts_string)
+
+    def _read_lines(self, img: np.ndarray) -> tuple[list, list]:
+        # Extract text and bounding boxes
+        texts_bboxes = []
+        texts_string = []
+        
         try:
-            # Process whole image with DocTR
             result = self.model([img])
             
-            # Extract text and bounding boxes
-            texts_bboxes = []
-            texts_string = []
-            
             # Process result to extract boxes and text
             for page in result.pages:
                 h, w = page.dimensions
@@ -68,10 +90,8 @@ class DocTROCR(OCREngine):
                         texts_bboxes.append((x1, y1, x2, y2))
                         texts_string.append(line_text)
             
-            # Match detected text to provided blocks using lists_to_blk_list
-            return lists_to_blk_list(blk_list, texts_bboxes, texts_string)
-            
         except Exception as e:
             print(f"DocTR OCR error: {str(e)}")
-            return blk_list
+            
+        return texts_bboxes, texts_string
     
@@ -1,86 +1,44 @@
 import json
 import hashlib
+import importlib
 
 from .base import OCREngine
-from .microsoft_ocr import MicrosoftOCR
-from .google_ocr import GoogleOCR
-from .gpt_ocr import GPTOCR
-from .paddle_ocr import PaddleOCREngine
-from .manga_ocr.engine import MangaOCREngine
-from .pororo.engine import PororoOCREngine
-from .doctr_ocr import DocTROCR
-from .gemini_ocr import GeminiOCR
-from .easy_ocr import EasyOCREngine
-from huggingface_hub import snapshot_download
+from ..utils.model_pool import model_pool
 
 
-from transformers import pipeline, AutoTokenizer, AutoModelForSeq2SeqLM
-from pathlib import Path
+# Engine class name -> module defining it, relative to this package. Modules
+# (and their SDKs: azure, paddle, doctr, transformers...) are only imported
+# when that engine is first created.
+ENGINE_MODULES = {
+    'MicrosoftOCR': '.microsoft_ocr',
+    'GoogleOCR': '.google_ocr',
+    'GPTOCR': '.gpt_ocr',
+    'GeminiOCR': '.gemini_ocr',
+    'PaddleOCREngine': '.paddle_ocr',
+    'MangaOCREngine': '.manga_ocr.engine',
+    'PororoOCREngine': '.pororo.engine',
+    'DocTROCR': '.doctr_ocr',
+    'EasyOCREngine': '.easy_ocr',
+}
 
 
-# Fonction utilitaire pour charger le traducteur local à la demande
-def get_local_translator(model_path=None):
-    if not model_path:
-        raise ValueError("Aucun chemin de modèle local HuggingFace n'a été fourni à get_local_translator.")
-    tokenizer = AutoTokenizer.from_pretrained(str(model_path), local_files_only=True)
-    model = AutoModelForSeq2SeqLM.from_pretrained(str(model_path), local_files_only=True)
-    return pipeline('translation', model=model, tokenizer=tokenizer, device=-1)
+def get_engine_class(name: str) -> type[OCREngine]:
+    """Import and return the OCR engine class registered under name."""
+    module = importlib.import_module(ENGINE_MODULES[name], __package__)
+    return getattr(module, name)
 
-# SUPPRESSION DU TEST MANUEL
 
-from PySide6 import QtWidgets
+def _requests_per_minute(settings) -> int:
+    """OCR rate limit from the LLM settings, None when unset (0)."""
+    return settings.get_llm_settings().get('ocr_requests_per_minute') or None
 
-# --- TEST MINIMAL DE TRADUCTION LOCALE ---
-if __name__ == "__main__":
-    print("[TEST] Test minimal du pipeline de traduction HuggingFace local...")
-    translator = get_local_translator()
-    print(f"[TEST] Type pipeline: {type(translator)}")
-    # Codes de langue NLLB-200: voir https://huggingface.co/facebook/nllb-200-distilled-600M#languages
-    src = "fra_Latn"
-    tgt = "eng_Latn"
-    test_text = "Bonjour, comment vas-tu ?"
-    try:
-        result = translator(test_text, src_lang=src, tgt_lang=tgt, max_length=128)
-        print(f"[TEST] Résultat pipeline: {result}")
-        if result and isinstance(result, list) and 'translation_text' in result[0]:
-            print(f"[TEST] Traduction: {result[0]['translation_text']}")
-        else:
-            print(f"[TEST] Format inattendu: {result}")
-    except Exception as e:
-        print(f"[TEST][CRITICAL] Erreur lors de la traduction: {e}")
-from app.ui.dayu_widgets.label import MLabel
-from app.ui.dayu_widgets.check_box import MCheckBox
-from app.ui.dayu_widgets.spin_box import MSpinBox
-
-class SettingsTextRenderingWidget(QtWidgets.QWidget):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        layout = QtWidgets.QVBoxLayout(self)
-
-        # Checkbox majuscule
-        self.uppercase_checkbox = MCheckBox(self.tr("Render Text in UpperCase"))
-        layout.addWidget(self.uppercase_checkbox)
-
-        # Marge intérieure
-        margin_layout = QtWidgets.QHBoxLayout()
-        margin_label = MLabel(self.tr("Marge intérieure (px):"))
-        self.margin_spinbox = MSpinBox().small()
-        self.margin_spinbox.setFixedWidth(60)
-        self.margin_spinbox.setMaximum(50)
-        self.margin_spinbox.setValue(10) # Valeur par défaut
-        margin_layout.addWidget(margin_label)
-        margin_layout.addWidget(self.margin_spinbox)
-        margin_layout.addStretch()
-        layout.addLayout(margin_layout)
 
 class OCRFactory:
     """Factory for creating appropriate OCR engines based on settings."""
-    
-    _engines = {}  # Cache of created engines
 
     LLM_ENGINE_IDENTIFIERS = {
-        "GPT": GPTOCR,
-        "Gemini": GeminiOCR,
+        "GPT": "GPTOCR",
+        "Gemini": "GeminiOCR",
     }
     
     @classmethod
@@ -99,14 +57,11 @@ class OCRFactory:
         # Create a cache key based on model and language
         cache_key = cls._create_cache_key(ocr_model, source_lang_english, settings)
         
-        # Return cached engine if available
-        if cache_key in cls._engines:
-            return cls._engines[cache_key]
-        
-        # Create engine based on model or language
-        engine = cls._create_new_engine(settings, source_lang_english, ocr_model)
-        cls._engines[cache_key] = engine
-        return engine
+        # Return the pooled engine, creating it based on model or language if needed
+        return model_pool.get(
+            f"ocr:{cache_key}",
+            lambda: cls._create_new_engine(settings, source_lang_english, ocr_model)
+        )
     
     @classmethod
     def _create_cache_key(cls, ocr_key: str,
@@ -143,6 +98,14 @@ class OCRFactory:
         # if is_llm:
         #     extras["llm"] = settings.get_llm_settings()
 
+        # Except for the request rate limit, which the engine's executor is built with
+        if any(identifier in ocr_key for identifier in cls.LLM_ENGINE_IDENTIFIERS):
+            extras["requests_per_minute"] = _requests_per_minute(settings)
+
+        # And the runtime MangaOCR, the Default engine for Japanese, is loaded with
+        if ocr_key == 'Default' and source_lang == 'Japanese':
+            extras["manga_ocr_runtime"] = settings.get_manga_ocr_runtime()
+
         if not extras:
             return base
 
@@ -193,7 +156,7 @@ class OCRFactory:
     @staticmethod
     def _create_microsoft_ocr(settings) -> OCREngine:
         credentials = settings.get_credentials(settings.ui.tr("Microsoft Azure"))
-        engine = MicrosoftOCR()
+        engine = get_engine_class('MicrosoftOCR')()
         engine.initialize(
             api_key=credentials['api_key_ocr'],
             endpoint=credentials['endpoint']
@@ -203,7 +166,7 @@ class OCRFactory:
     @staticmethod
     def _create_google_ocr(settings) -> OCREngine:
         credentials = settings.get_credentials(settings.ui.tr("Google Cloud"))
-        engine = GoogleOCR()
+        engine = get_engine_class('GoogleOCR')()
         engine.initialize(api_key=credentials['api_key'])
         return engine
     
@@ -211,40 +174,41 @@ class OCRFactory:
     def _create_gpt_ocr(settings, model) -> OCREngine:
         credentials = settings.get_credentials(settings.ui.tr("Open AI GPT"))
         api_key = credentials.get('api_key', '')
-        engine = GPTOCR()
-        engine.initialize(api_key=api_key, model=model)
+        engine = get_engine_class('GPTOCR')()
+        engine.initialize(api_key=api_key, model=model,
+                          requests_per_minute=_requests_per_minute(settings))
         return engine
     
     @staticmethod
     def _create_manga_ocr(settings) -> OCREngine:
         device = 'cuda' if settings.is_gpu_enabled() else 'cpu'
-        engine = MangaOCREngine()
-        engine.initialize(device=device)
+        engine = get_engine_class('MangaOCREngine')()
+        engine.initialize(device=device, runtime=settings.get_manga_ocr_runtime())
         return engine
     
     @staticmethod
     def _create_pororo_ocr(settings) -> OCREngine:
-        engine = PororoOCREngine()
+        engine = get_engine_class('PororoOCREngine')()
         engine.initialize()
         return engine
     
     @staticmethod
     def _create_paddle_ocr(settings) -> OCREngine:
-        engine = PaddleOCREngine()
+        engine = get_engine_class('PaddleOCREngine')()
         engine.initialize()
         return engine
     
     @staticmethod
     def _create_doctr_ocr(settings) -> OCREngine:
         device = 'cuda' if settings.is_gpu_enabled() else 'cpu'
-        engine = DocTROCR()
+        engine = get_engine_class('DocTROCR')()
         engine.initialize(device=device)
         return engine
     
     @staticmethod
     def _create_gemini_ocr(settings, model) -> OCREngine:
-        engine = GeminiOCR()
-        engine.initialize(settings, model)
+        engine = get_engine_class('GeminiOCR')()
+        engine.initialize(settings, model, requests_per_minute=_requests_per_minute(settings))
         return engine
 
     @staticmethod
@@ -265,6 +229,6 @@ class OCRFactory:
             }
             lang_code = fallback.get(lang_name, 'en')
         use_gpu = settings.is_gpu_enabled() if hasattr(settings, 'is_gpu_enabled') else False
-        engine = EasyOCREngine()
+        engine = get_engine_class('EasyOCREngine')()
         engine.initialize(languages=[lang_code], use_gpu=use_gpu)
         return engine
\ No newline at end of file
@@ -1,16 +1,18 @@
 import base64
 import cv2
 import numpy as np
-import requests
 
 from .base import OCREngine
-from ..utils.textblock import TextBlock, adjust_text_line_coordinates
+from .request_executor import OCRRequestExecutor
+from ..utils.textblock import TextBlock
 from ..utils.translator_utils import MODEL_MAP
 from app.ui.settings.settings_page import SettingsPage
 
 
 class GeminiOCR(OCREngine):
     """OCR engine using Google Gemini models via REST API with block processing method."""
+
+    remote = True
     
     def __init__(self):
         self.api_key = None
@@ -18,9 +20,11 @@ class GeminiOCR(OCREngine):
         self.model = ''
         self.api_base_url = "https://generativelanguage.googleapis.com/v1beta/models"
         self.max_output_tokens = 5000
+        self.executor = OCRRequestExecutor()
         
     def initialize(self, settings: SettingsPage, model: str = 'Gemini-2.0-Flash', 
-                   expansion_percentage: int = 5) -> None:
+                   expansion_percentage: int = 5, max_concurrency: int = 8,
+                   requests_per_minute: int = None) -> None:
         """
         Initialize the Gemini OCR with API key and parameters.
         
@@ -28,11 +32,18 @@ class GeminiOCR(OCREngine):
             settings: Settings page containing credentials
             model: Gemini model to use for OCR (defaults to Gemini-2.0-Flash)
             expansion_percentage: Percentage to expand text bounding boxes
+            max_concurrency: Number of block requests in flight at once
+            requests_per_minute: Provider rate limit to stay under, if any
         """
         self.expansion_percentage = expansion_percentage
+        self.executor.close()
+        self.executor = OCRRequestExecutor(max_concurrency, requests_per_minute)
         credentials = settings.get_credentials(settings.ui.tr('Google Gemini'))
         self.api_key = credentials.get('api_key', '')
         self.model = MODEL_MAP.get(model)
+
+    def close(self) -> None:
+        self.executor.close()
         
     def process_image(self, img: np.ndarray, blk_list: list[TextBlock]) -> list[TextBlock]:
         """
@@ -59,33 +70,22 @@ class GeminiOCR(OCREngine):
         Returns:
             List of updated TextBlock objects with recognized text
         """
-        for blk in blk_list:
-            try:
-                # Get box coordinates
-                if blk.bubble_xyxy is not None:
-                    x1, y1, x2, y2 = blk.bubble_xyxy
-                else:
-                    x1, y1, x2, y2 = adjust_text_line_coordinates(
-                        blk.xyxy, 
-                        self.expansion_percentage, 
-                        self.expansion_percentage, 
-                        img
-                    )
-                
-                # Check if coordinates are valid
-                if x1 < x2 and y1 < y2 and x1 >= 0 and y1 >= 0 and x2 <= img.shape[1] and y2 <= img.shape[0]:
-                    # Crop image and encode
-                    cropped_img = img[y1:y2, x1:x2]
-                    encoded_img = self.encode_image(cropped_img)
-                    
-                    # Get OCR result from Gemini
-                    blk.text = self._get_gemini_block_ocr(encoded_img)
-            except Exception as e:
-                print(f"Gemini OCR error on block: {str(e)}")
-                blk.text = ""
+        crop_blocks, crops = self.crop_blocks(img, blk_list, self.expansion_percentage)
+
+        # Blocks are sent concurrently; results come back in block order
+        texts = self.executor.map(self._ocr_crop, crops)
+        for blk, text in zip(crop_blocks, texts):
+            blk.text = text
                 
         return blk_list
     
+    def _ocr_crop(self, cropped_img: np.ndarray) -> str:
+        try:
+            return self._get_gemini_block_ocr(self.encode_image(cropped_img))
+        except Exception as e:
+            print(f"Gemini OCR error on block: {str(e)}")
+            return ""
+    
     def _get_gemini_block_ocr(self, base64_image: str) -> str:
         """
         Get OCR result for a single block from Gemini model.
@@ -132,7 +132,7 @@ class GeminiOCR(OCREngine):
             
             # Make POST request to Gemini API
             headers = {"Content-Type": "application/json"}
-            response = requests.post(
+            response = self.executor.post(
                 url,
                 headers=headers, 
                 json=payload,
@@ -5,26 +5,42 @@ import numpy as np
 import requests
 
 from .base import OCREngine
+from .atlas import ocr_atlases
 from ..utils.textblock import TextBlock
 from ..utils.pipeline_utils import lists_to_blk_list
 
 
 class GoogleOCR(OCREngine):
     """OCR engine using Google Cloud Vision API."""
+
+    remote = True
+    whole_page = True
     
     def __init__(self):
         self.api_key = None
+        self.use_atlas = True
         
-    def initialize(self, api_key: str) -> None:
+    def initialize(self, api_key: str, use_atlas: bool = True) -> None:
         """
         Initialize the Google OCR with API key.
         
         Args:
             api_key: Google Cloud API key
+            use_atlas: Send only the block crops, packed into one mosaic,
+                instead of the whole page
         """
         self.api_key = api_key
+        self.use_atlas = use_atlas
         
     def process_image(self, img: np.ndarray, blk_list: list[TextBlock]) -> list[TextBlock]:
+        if self.use_atlas:
+            ocr_atlases([(img, blk_list)], self._read_lines)
+            return blk_list
+
+        texts_bboxes, texts_string = self._read_lines(img)
+        return lists_to_blk_list(blk_list, texts_bboxes, texts_string)
+
+    def _read_lines(self, img: np.ndarray) -> tuple[list, list]:
         texts_bboxes = []
         texts_string = []
         
@@ -69,4 +85,4 @@ class GoogleOCR(OCREngine):
         except Exception as e:
             print(f"Google OCR error: {str(e)}")
             
-        return lists_to_blk_list(blk_list, texts_bboxes, texts_string)
\ No newline at end of file
+        return texts_bboxes, texts_string
\ No newline at end of file
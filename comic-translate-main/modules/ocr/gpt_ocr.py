@@ -1,16 +1,18 @@
 import base64
 import cv2
 import numpy as np
-import requests
 import json
 
 from .base import OCREngine
-from ..utils.textblock import TextBlock, adjust_text_line_coordinates
+from .request_executor import OCRRequestExecutor
+from ..utils.textblock import TextBlock
 from ..utils.translator_utils import MODEL_MAP
 
 
 class GPTOCR(OCREngine):
     """OCR engine using GPT vision capabilities via direct REST API calls."""
+
+    remote = True
     
     def __init__(self):
         self.api_key = None
@@ -18,9 +20,11 @@ class GPTOCR(OCREngine):
         self.model = None
         self.api_base_url = 'https://api.openai.com/v1/chat/completions'
         self.max_tokens = 5000
+        self.executor = OCRRequestExecutor()
         
     def initialize(self, api_key: str, model: str = 'GPT-4.1-mini', 
-                  expansion_percentage: int = 0) -> None:
+                  expansion_percentage: int = 0, max_concurrency: int = 8,
+                  requests_per_minute: int = None) -> None:
         """
         Initialize the GPT OCR with API key and parameters.
         
@@ -28,10 +32,17 @@ class GPTOCR(OCREngine):
             api_key: OpenAI API key for authentication
             model: GPT model to use for OCR (defaults to gpt-4o)
             expansion_percentage: Percentage to expand text bounding boxes
+            max_concurrency: Number of block requests in flight at once
+            requests_per_minute: Provider rate limit to stay under, if any
         """
         self.api_key = api_key
         self.model = MODEL_MAP.get(model)
         self.expansion_percentage = expansion_percentage
+        self.executor.close()
+        self.executor = OCRRequestExecutor(max_concurrency, requests_per_minute)
+
+    def close(self) -> None:
+        self.executor.close()
         
     def process_image(self, img: np.ndarray, blk_list: list[TextBlock]) -> list[TextBlock]:
         """
@@ -44,33 +55,22 @@ class GPTOCR(OCREngine):
         Returns:
             List of updated TextBlock objects with recognized text
         """
-        for blk in blk_list:
-            try:
-                # Get box coordinates
-                if blk.bubble_xyxy is not None:
-                    x1, y1, x2, y2 = blk.bubble_xyxy
-                else:
-                    x1, y1, x2, y2 = adjust_text_line_coordinates(
-                        blk.xyxy, 
-                        self.expansion_percentage, 
-                        self.expansion_percentage, 
-                        img
-                    )
-                
-                # Check if coordinates are valid
-                if x1 < x2 and y1 < y2 and x1 >= 0 and y1 >= 0 and x2 <= img.shape[1] and y2 <= img.shape[0]:
-                    # Crop image and encode
-                    cropped_img = img[y1:y2, x1:x2]
-                    cv2_to_gpt = self.encode_image(cropped_img)
-                    
-                    # Get OCR result from GPT
-                    blk.text = self._get_gpt_ocr(cv2_to_gpt)
-            except Exception as e:
-                print(f"GPT OCR error on block: {str(e)}")
-                blk.text = ""
+        crop_blocks, crops = self.crop_blocks(img, blk_list, self.expansion_percentage)
+
+        # Blocks are sent concurrently; results come back in block order
+        texts = self.executor.map(self._ocr_crop, crops)
+        for blk, text in zip(crop_blocks, texts):
+            blk.text = text
                 
         return blk_list
     
+    def _ocr_crop(self, cropped_img: np.ndarray) -> str:
+        try:
+            return self._get_gpt_ocr(self.encode_image(cropped_img))
+        except Exception as e:
+            print(f"GPT OCR error on block: {str(e)}")
+            return ""
+    
     def _get_gpt_ocr(self, base64_image: str) -> str:
         """
         Get OCR result from GPT model using direct REST API call.
@@ -107,7 +107,7 @@ class GPTOCR(OCREngine):
             }
             
             # Make POST request to OpenAI API
-            response = requests.post(
+            response = self.executor.post(
                 self.api_base_url,
                 headers=headers,
                 data=json.dumps(payload),
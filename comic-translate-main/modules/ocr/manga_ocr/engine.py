@@ -2,7 +2,7 @@ import os
 import numpy as np
 
 from ..base import OCREngine
-from ...utils.textblock import TextBlock, adjust_text_line_coordinates
+from ...utils.textblock import TextBlock
 from ...utils.download import get_models, manga_ocr_data
 
 
@@ -16,13 +16,15 @@ class MangaOCREngine(OCREngine):
         self.current_file_dir = os.path.dirname(os.path.abspath(__file__))
         self.project_root = os.path.abspath(os.path.join(self.current_file_dir, '..', '..', '..'))
         
-    def initialize(self, device: str = 'cpu', expansion_percentage: int = 5) -> None:
+    def initialize(self, device: str = 'cpu', expansion_percentage: int = 5,
+                   runtime: str = 'torch') -> None:
         """
          Initialize the MangaOCR engine.
          
          Args:
              device: Device to use ('cpu' or 'cuda')
              expansion_percentage: Percentage to expand text bounding boxes
+             runtime: 'torch', or 'onnx' to decode with onnxruntime on CPU
          """
         
         from .manga_ocr import MangaOcr
@@ -32,32 +34,35 @@ class MangaOCREngine(OCREngine):
         if self.model is None:
             get_models(manga_ocr_data)
             manga_ocr_path = os.path.join(self.project_root, 'models/ocr/manga-ocr-base')
-            self.model = MangaOcr(pretrained_model_name_or_path=manga_ocr_path, device=device)
+            if runtime == 'onnx' and device == 'cpu':
+                try:
+                    from .manga_ocr_onnx import MangaOcrOnnx
+                    self.model = MangaOcrOnnx(pretrained_model_name_or_path=manga_ocr_path)
+                except Exception as e:
+                    print(f"MangaOCR ONNX runtime unavailable, using PyTorch: {str(e)}")
+            if self.model is None:
+                self.model = MangaOcr(pretrained_model_name_or_path=manga_ocr_path, device=device)
         
     def process_image(self, img: np.ndarray, blk_list: list[TextBlock]) -> list[TextBlock]:
-        for blk in blk_list:
-            try:
-                # Get box coordinates
-                if blk.bubble_xyxy is not None:
-                    x1, y1, x2, y2 = blk.bubble_xyxy
-                else:
-                    x1, y1, x2, y2 = adjust_text_line_coordinates(
-                        blk.xyxy, 
-                        self.expansion_percentage, 
-                        self.expansion_percentage, 
-                        img
-                    )
-                
-                # Check if coordinates are valid
-                if x1 < x2 and y1 < y2 and x1 >= 0 and y1 >= 0 and x2 <= img.shape[1] and y2 <= img.shape[0]:
-                    # Crop image and run OCR
-                    cropped_img = img[y1:y2, x1:x2]
-                    blk.text = self.model(cropped_img)
-                else:
-                    print('Invalid textbbox to target img')
-                    blk.text = ""
-            except Exception as e:
-                print(f"MangaOCR error on block: {str(e)}")
-                blk.text = ""
+        # Collect every valid crop first so the page runs through the model in batches
+        crop_blocks, crops = self.crop_blocks(img, blk_list, self.expansion_percentage)
+
+        if not crops:
+            return blk_list
+
+        try:
+            texts = self.model.recognize_batch(crops)
+        except Exception as e:
+            print(f"MangaOCR batch error, falling back to per-block OCR: {str(e)}")
+            texts = []
+            for crop in crops:
+                try:
+                    texts.append(self.model(crop))
+                except Exception as e:
+                    print(f"MangaOCR error on block: {str(e)}")
+                    texts.append("")
+
+        for blk, text in zip(crop_blocks, texts):
+            blk.text = text
                 
-        return blk_list
\ No newline at end of file
+        return blk_list
@@ -21,11 +21,25 @@ class MangaOcr:
 
     @torch.no_grad()
     def __call__(self, img: np.ndarray):
-        x = self.processor(img, return_tensors="pt").pixel_values.squeeze()
-        x = self.model.generate(x[None].to(self.model.device))[0].cpu()
-        x = self.tokenizer.decode(x, skip_special_tokens=True)
-        x = post_process(x)
-        return x
+        return self.recognize_batch([img])[0]
+
+    @torch.no_grad()
+    def recognize_batch(self, imgs: list[np.ndarray], batch_size: int = 16) -> list[str]:
+        """
+        Recognize several crops with batched preprocessing and generation.
+
+        Crops are resized to the encoder's fixed input size, so any mix of crop
+        sizes forms one batch; finished sequences are padded by generate until
+        the longest one in the batch stops.
+        """
+        texts = []
+        for start in range(0, len(imgs), batch_size):
+            chunk = imgs[start:start + batch_size]
+            x = self.processor(chunk, return_tensors="pt").pixel_values
+            x = self.model.generate(x.to(self.model.device)).cpu()
+            decoded = self.tokenizer.batch_decode(x, skip_special_tokens=True)
+            texts.extend(post_process(text) for text in decoded)
+        return texts
 
 def post_process(text):
     text = ''.join(text.split())
@@ -0,0 +1,250 @@
+"""
+MangaOCR running in onnxruntime with greedy KV-cache decoding.
+
+The ViT encoder and the BERT decoder are exported once from the PyTorch
+checkpoint into <model dir>/onnx. The decoder is exported twice: for the
+first step, and for the later steps where it takes the self- and
+cross-attention key/values of the previous steps (past) instead of the whole
+sequence. After export, the ONNX decoding is checked against the PyTorch
+model's generate() on the real manga crops in samples/; the export is
+discarded if any token differs.
+"""
+import glob
+import json
+import os
+
+import cv2
+import numpy as np
+from transformers import ViTImageProcessor, AutoTokenizer
+
+from .manga_ocr import MANGA_OCR_PATH, post_process
+
+ONNX_DIR = 'onnx'
+ENCODER_FILE = 'encoder.onnx'
+DECODER_FILE = 'decoder.onnx'
+DECODER_WITH_PAST_FILE = 'decoder_with_past.onnx'
+GENERATION_FILE = 'generation.json'
+SAMPLES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'samples')
+
+
+def load_parity_samples() -> list[np.ndarray]:
+    """Real manga text crops (RGB) on which the ONNX and PyTorch decodings must agree."""
+    samples = []
+    for path in sorted(glob.glob(os.path.join(SAMPLES_DIR, '*.jpg'))):
+        image = cv2.imread(path)
+        if image is not None:
+            samples.append(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+    if not samples:
+        raise FileNotFoundError(f"No MangaOCR parity samples found in {SAMPLES_DIR}")
+    return samples
+
+
+class MangaOcrOnnx:
+    """Drop-in replacement for MangaOcr backed by onnxruntime (CPU)."""
+
+    def __init__(self, pretrained_model_name_or_path=MANGA_OCR_PATH):
+        import onnxruntime as ort
+
+        self.processor = ViTImageProcessor.from_pretrained(pretrained_model_name_or_path)
+        self.tokenizer = AutoTokenizer.from_pretrained(pretrained_model_name_or_path)
+
+        onnx_dir = os.path.join(pretrained_model_name_or_path, ONNX_DIR)
+        if not all(os.path.exists(os.path.join(onnx_dir, name))
+                   for name in (ENCODER_FILE, DECODER_FILE, DECODER_WITH_PAST_FILE, GENERATION_FILE)):
+            export_onnx(pretrained_model_name_or_path, onnx_dir)
+
+        with open(os.path.join(onnx_dir, GENERATION_FILE)) as f:
+            generation = json.load(f)
+        self.decoder_start_token_id = generation['decoder_start_token_id']
+        self.eos_token_id = generation['eos_token_id']
+        self.pad_token_id = generation['pad_token_id']
+        self.max_length = generation['max_length']
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        providers = ['CPUExecutionProvider']
+        self.encoder = ort.InferenceSession(os.path.join(onnx_dir, ENCODER_FILE), options, providers=providers)
+        self.decoder = ort.InferenceSession(os.path.join(onnx_dir, DECODER_FILE), options, providers=providers)
+        self.decoder_with_past = ort.InferenceSession(
+            os.path.join(onnx_dir, DECODER_WITH_PAST_FILE), options, providers=providers
+        )
+        self.past_names = [i.name for i in self.decoder_with_past.get_inputs()][2:]
+
+    def __call__(self, img: np.ndarray):
+        return self.recognize_batch([img])[0]
+
+    def recognize_batch(self, imgs: list[np.ndarray], batch_size: int = 16) -> list[str]:
+        texts = []
+        for start in range(0, len(imgs), batch_size):
+            chunk = imgs[start:start + batch_size]
+            x = self.processor(chunk, return_tensors="np").pixel_values.astype(np.float32)
+            tokens = self.generate(x)
+            decoded = self.tokenizer.batch_decode(tokens, skip_special_tokens=True)
+            texts.extend(post_process(text) for text in decoded)
+        return texts
+
+    def generate(self, pixel_values: np.ndarray) -> np.ndarray:
+        """
+        Greedy decoding, equivalent to generate() with num_beams=1.
+
+        Args:
+            pixel_values: [B, 3, H, W] float32 preprocessed images
+
+        Returns:
+            [B, L] token ids, starting with the decoder start token
+        """
+        encoder_hidden_states = self.encoder.run(None, {'pixel_values': pixel_values})[0]
+        batch = pixel_values.shape[0]
+
+        tokens = np.full((batch, 1), self.decoder_start_token_id, dtype=np.int64)
+        logits, *past = self.decoder.run(None, {
+            'input_ids': tokens,
+            'encoder_hidden_states': encoder_hidden_states,
+        })
+
+        sequences = [tokens]
+        finished = np.zeros(batch, dtype=bool)
+        for _ in range(self.max_length - 1):
+            next_tokens = logits[:, -1].argmax(-1).astype(np.int64)
+            # Finished rows keep emitting padding, as generate() does
+            next_tokens = np.where(finished, self.pad_token_id, next_tokens)
+            sequences.append(next_tokens[:, None])
+            finished |= next_tokens == self.eos_token_id
+            if finished.all():
+                break
+
+            feeds = {'input_ids': next_tokens[:, None], 'encoder_hidden_states': encoder_hidden_states}
+            feeds.update(zip(self.past_names, past))
+            logits, *past = self.decoder_with_past.run(None, feeds)
+
+        return np.concatenate(sequences, axis=1)
+
+
+def _flatten_past(past) -> tuple:
+    if hasattr(past, 'to_legacy_cache'):
+        past = past.to_legacy_cache()
+    return tuple(tensor for layer in past for tensor in layer)
+
+
+def _unflatten_past(flat: tuple):
+    # Per layer: self-attention key/value, then cross-attention key/value
+    past = tuple(tuple(flat[i:i + 4]) for i in range(0, len(flat), 4))
+    try:
+        from transformers.cache_utils import EncoderDecoderCache
+    except ImportError:
+        return past
+    return EncoderDecoderCache.from_legacy_cache(past)
+
+
+def export_onnx(pretrained_model_name_or_path: str, onnx_dir: str, opset_version: int = 17) -> None:
+    """
+    Export the encoder and the decoder (with and without past) to onnx_dir and
+    check that greedy decoding matches the PyTorch model.
+    """
+    import torch
+    from .manga_ocr import MangaOcrModel
+
+    print(f"Exporting MangaOCR to ONNX: {onnx_dir}")
+    model = MangaOcrModel.from_pretrained(pretrained_model_name_or_path).eval()
+    processor = ViTImageProcessor.from_pretrained(pretrained_model_name_or_path)
+
+    class Encoder(torch.nn.Module):
+        def __init__(self, encoder):
+            super().__init__()
+            self.encoder = encoder
+
+        def forward(self, pixel_values):
+            return self.encoder(pixel_values=pixel_values, return_dict=True).last_hidden_state
+
+    class Decoder(torch.nn.Module):
+        def __init__(self, decoder):
+            super().__init__()
+            self.decoder = decoder
+
+        def forward(self, input_ids, encoder_hidden_states, *past):
+            out = self.decoder(
+                input_ids=input_ids,
+                encoder_hidden_states=encoder_hidden_states,
+                past_key_values=_unflatten_past(past) if past else None,
+                use_cache=True,
+                return_dict=True,
+            )
+            return (out.logits,) + _flatten_past(out.past_key_values)
+
+    generation_config = model.generation_config
+    generation = {
+        'decoder_start_token_id': generation_config.decoder_start_token_id
+        if generation_config.decoder_start_token_id is not None else model.config.decoder_start_token_id,
+        'eos_token_id': generation_config.eos_token_id
+        if generation_config.eos_token_id is not None else model.config.eos_token_id,
+        'pad_token_id': generation_config.pad_token_id
+        if generation_config.pad_token_id is not None else model.config.pad_token_id,
+        'max_length': generation_config.max_length,
+    }
+
+    # Real manga crops, used as the export inputs and for the parity check
+    pixel_values = processor(load_parity_samples(), return_tensors="pt").pixel_values
+
+    os.makedirs(onnx_dir, exist_ok=True)
+    paths = [os.path.join(onnx_dir, name) for name in (ENCODER_FILE, DECODER_FILE, DECODER_WITH_PAST_FILE)]
+    try:
+        with torch.no_grad():
+            encoder = Encoder(model.encoder)
+            torch.onnx.export(
+                encoder, (pixel_values,), paths[0],
+                input_names=['pixel_values'], output_names=['last_hidden_state'],
+                dynamic_axes={'pixel_values': {0: 'batch'}, 'last_hidden_state': {0: 'batch'}},
+                opset_version=opset_version,
+            )
+
+            decoder = Decoder(model.decoder)
+            encoder_hidden_states = encoder(pixel_values)
+            input_ids = torch.full((pixel_values.shape[0], 1), generation['decoder_start_token_id'], dtype=torch.long)
+            first = decoder(input_ids, encoder_hidden_states)
+            n_past = len(first) - 1
+            past_names, present_names = [], []
+            for layer in range(n_past // 4):
+                for kind in ('self_key', 'self_value', 'cross_key', 'cross_value'):
+                    past_names.append(f'past_{layer}_{kind}')
+                    present_names.append(f'present_{layer}_{kind}')
+
+            batch_axes = {'input_ids': {0: 'batch', 1: 'sequence'},
+                          'encoder_hidden_states': {0: 'batch', 1: 'encoder_sequence'},
+                          'logits': {0: 'batch', 1: 'sequence'}}
+            for past_name, present_name in zip(past_names, present_names):
+                length = 'encoder_sequence' if 'cross' in past_name else 'past_sequence'
+                batch_axes[past_name] = {0: 'batch', 2: length}
+                batch_axes[present_name] = {0: 'batch', 2: length if 'cross' in past_name else 'total_sequence'}
+
+            torch.onnx.export(
+                decoder, (input_ids, encoder_hidden_states), paths[1],
+                input_names=['input_ids', 'encoder_hidden_states'],
+                output_names=['logits'] + present_names,
+                dynamic_axes={k: v for k, v in batch_axes.items() if not k.startswith('past_')},
+                opset_version=opset_version,
+            )
+
+            next_ids = first[0][:, -1:].argmax(-1)
+            torch.onnx.export(
+                decoder, (next_ids, encoder_hidden_states) + tuple(first[1:]), paths[2],
+                input_names=['input_ids', 'encoder_hidden_states'] + past_names,
+                output_names=['logits'] + present_names,
+                dynamic_axes=batch_axes,
+                opset_version=opset_version,
+            )
+
+        with open(os.path.join(onnx_dir, GENERATION_FILE), 'w') as f:
+            json.dump(generation, f)
+
+        # Parity check against the PyTorch engine, generating as MangaOcr does
+        onnx_model = MangaOcrOnnx(pretrained_model_name_or_path)
+        with torch.no_grad():
+            expected = model.generate(pixel_values).numpy()
+        actual = onnx_model.generate(pixel_values.numpy().astype(np.float32))
+        if expected.shape != actual.shape or not (expected == actual).all():
+            raise RuntimeError("ONNX MangaOCR decoding does not match the PyTorch model")
+    except Exception:
+        for path in paths + [os.path.join(onnx_dir, GENERATION_FILE)]:
+            if os.path.exists(path):
+                os.remove(path)
+        raise
@@ -2,26 +2,32 @@ import cv2
 import numpy as np
 
 from .base import OCREngine
+from .atlas import ocr_atlases
 from ..utils.textblock import TextBlock
 from ..utils.pipeline_utils import lists_to_blk_list
 
 
 class MicrosoftOCR(OCREngine):
     """OCR engine using Microsoft Azure Computer Vision API."""
+
+    remote = True
+    whole_page = True
     
     def __init__(self):
         self.client = None
         self.api_key = None
         self.endpoint = None
+        self.use_atlas = True
         
-    def initialize(self, api_key: str, endpoint: str) -> None:
+    def initialize(self, api_key: str, endpoint: str, use_atlas: bool = True) -> None:
         """
         Initialize the Microsoft OCR with API key and endpoint.
         
         Args:
             api_key: Microsoft Azure API key
             endpoint: Microsoft Azure endpoint URL
-            **kwargs: Additional parameters (ignored)
+            use_atlas: Send only the block crops, packed into one mosaic,
+                instead of the whole page
         """
 
         from azure.ai.vision.imageanalysis import ImageAnalysisClient
@@ -29,11 +35,20 @@ class MicrosoftOCR(OCREngine):
 
         self.api_key = api_key
         self.endpoint = endpoint
+        self.use_atlas = use_atlas
         self.client = ImageAnalysisClient(
             endpoint=endpoint, credential=AzureKeyCredential(api_key)
         )
         
     def process_image(self, img: np.ndarray, blk_list: list[TextBlock]) -> list[TextBlock]:
+        if self.use_atlas:
+            ocr_atlases([(img, blk_list)], self._read_lines)
+            return blk_list
+
+        texts_bboxes, texts_string = self._read_lines(img)
+        return lists_to_blk_list(blk_list, texts_bboxes, texts_string)
+
+    def _read_lines(self, img: np.ndarray) -> tuple[list, list]:
 
         from azure.ai.vision.imageanalysis.models import VisualFeatures
 
@@ -64,4 +79,4 @@ class MicrosoftOCR(OCREngine):
         except Exception as e:
             print(f"Microsoft OCR error: {str(e)}")
             
-        return lists_to_blk_list(blk_list, texts_bboxes, texts_string)
\ No newline at end of file
+        return texts_bboxes, texts_string
@@ -1,6 +1,7 @@
 import numpy as np
 
 from .base import OCREngine
+from .atlas import ocr_atlases
 from ..utils.textblock import TextBlock
 from ..utils.pipeline_utils import lists_to_blk_list
 
@@ -8,45 +9,65 @@ from ..utils.pipeline_utils import lists_to_blk_list
 class PaddleOCREngine(OCREngine):
     """OCR engine using PaddleOCR for Chinese text."""
     
+    # The detector limits the longer side of its input to 960 pixels, so
+    # atlases are packed no larger than that and their text is read at its
+    # original scale
+    atlas_size = 960
+    
     def __init__(self):
         self.ocr = None
+        self.use_atlas = True
+        
+    @property
+    def whole_page(self) -> bool:
+        return not self.use_atlas
         
-    def initialize(self, lang: str = 'ch') -> None:
+    def initialize(self, lang: str = 'ch', use_atlas: bool = True) -> None:
         """
         Initialize the PaddleOCR engine.
         
         Args:
             lang: Language code for OCR
+            use_atlas: Run only on the block regions, packed into a compact
+                image, instead of the whole page
         """
 
         from paddleocr import PaddleOCR
 
+        self.use_atlas = use_atlas
         if self.ocr is None:
             self.ocr = PaddleOCR(lang=lang)
         
     def process_image(self, img: np.ndarray, blk_list: list[TextBlock]) -> list[TextBlock]:
+        if self.use_atlas:
+            # Detection only sees the block regions, not the art around them
+            ocr_atlases([(img, blk_list)], self._read_lines,
+                        max_width=self.atlas_size, max_height=self.atlas_size)
+            return blk_list
+
+        texts_bboxes, texts_string = self._read_lines(img)
+        return lists_to_blk_list(blk_list, texts_bboxes, texts_string)
+
+    def _read_lines(self, img: np.ndarray) -> tuple[list, list]:
+        # Extract bounding boxes and text
+        texts_bboxes = []
+        texts_string = []
+        
         try:
             result = self.ocr.ocr(img)
             
             if not result or not result[0]:
-                return blk_list
+                return texts_bboxes, texts_string
                 
-            result = result[0]
-            
-            # Extract bounding boxes and text
-            texts_bboxes = []
-            texts_string = []
-            
-            for line in result:
+            for line in result[0]:
                 bbox, text_info = line
                 # Convert from points [(x1,y1), (x2,y1), (x2,y2), (x1,y2)] to (x1,y1,x2,y2)
                 x1, y1 = bbox[0]
                 x2, y2 = bbox[2]
                 texts_bboxes.append((x1, y1, x2, y2))
                 texts_string.append(text_info[0])
-                
-            return lists_to_blk_list(blk_list, texts_bboxes, texts_string)
         
         except Exception as e:
             print(f"PaddleOCR error: {str(e)}")
-            return blk_list
\ No newline at end of file
+            
+        return texts_bboxes, texts_string
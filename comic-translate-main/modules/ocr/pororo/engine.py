@@ -1,7 +1,7 @@
 import numpy as np
 
 from ..base import OCREngine
-from ...utils.textblock import TextBlock, adjust_text_line_coordinates
+from ...utils.textblock import TextBlock
 from ...utils.download import get_models, pororo_data
 
 
@@ -29,32 +29,27 @@ class PororoOCREngine(OCREngine):
             self.model = PororoOcr(lang=lang)
         
     def process_image(self, img: np.ndarray, blk_list: list[TextBlock]) -> list[TextBlock]:
-        for blk in blk_list:
-            try:
-                # Get box coordinates
-                if blk.bubble_xyxy is not None:
-                    x1, y1, x2, y2 = blk.bubble_xyxy
-                else:
-                    x1, y1, x2, y2 = adjust_text_line_coordinates(
-                        blk.xyxy, 
-                        self.expansion_percentage, 
-                        self.expansion_percentage, 
-                        img
-                    )
-                
-                # Check if coordinates are valid
-                if x1 < x2 and y1 < y2 and x1 >= 0 and y1 >= 0 and x2 <= img.shape[1] and y2 <= img.shape[0]:
-                    # Crop image and run OCR
-                    cropped_img = img[y1:y2, x1:x2]
-                    self.model.run_ocr(cropped_img)
-                    result = self.model.get_ocr_result()
-                    descriptions = result.get('description', [])
-                    blk.text = ' '.join(descriptions)
-                else:
-                    print('Invalid textbbox to target img')
-                    blk.text = ""
-            except Exception as e:
-                print(f"PororoOCR error on block: {str(e)}")
-                blk.text = ""
+        # Collect every valid crop first so all text lines of the page are recognized together
+        crop_blocks, crops = self.crop_blocks(img, blk_list, self.expansion_percentage)
+
+        if not crops:
+            return blk_list
+
+        try:
+            results = self.model.run_ocr_batch(crops)
+        except Exception as e:
+            print(f"PororoOCR batch error, falling back to per-block OCR: {str(e)}")
+            results = []
+            for crop in crops:
+                try:
+                    self.model.run_ocr(crop)
+                    results.append(self.model.get_ocr_result())
+                except Exception as e:
+                    print(f"PororoOCR error on block: {str(e)}")
+                    results.append({})
+
+        for blk, result in zip(crop_blocks, results):
+            descriptions = result.get('description', [])
+            blk.text = ' '.join(descriptions)
                 
-        return blk_list
\ No newline at end of file
+        return blk_list
@@ -29,6 +29,10 @@ class PororoOcr:
 
         return ocr_text
 
+    def run_ocr_batch(self, imgs: list) -> list[dict]:
+        """Run OCR on several images, recognizing all their text lines together."""
+        return self._ocr.predict_batch(imgs, detail=True)
+
     @staticmethod
     def get_available_langs():
         return SUPPORTED_TASKS["ocr"].get_available_langs()
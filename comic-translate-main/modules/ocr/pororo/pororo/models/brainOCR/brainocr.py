@@ -9,6 +9,7 @@ Basic usage:
 """
 
 import ast
+import inspect
 from logging import getLogger
 from typing import List
 
@@ -243,3 +244,62 @@ class Reader(object):
         )
 
         return result
+
+    def read_batch(
+        self,
+        images: list,
+        batch_size: int = 32,
+        n_workers: int = 0,
+        skip_details: bool = False,
+        paragraph: bool = False,
+        **kwargs,
+    ):
+        """
+        Detect and recognize text in several images with one recognition pass.
+        CRAFT runs once per image; the text lines of all images are then
+        recognized together in `get_text`, so the recognizer sees full batches.
+        :param images: list of file paths, numpy-arrays or byte streams
+        :param kwargs: any other option of `__call__`
+        :return: one result per image, as returned by `__call__`
+        """
+        # Same defaults as a single-image call
+        options = {
+            name: param.default
+            for name, param in inspect.signature(Reader.__call__).parameters.items()
+            if param.default is not inspect.Parameter.empty
+        }
+        options.update(kwargs)
+        options.update(
+            batch_size=batch_size,
+            n_workers=n_workers,
+            skip_details=skip_details,
+            paragraph=paragraph,
+        )
+        self.opt2val.update(options)
+
+        lines, owners = [], []
+        for idx, image in enumerate(images):
+            img, img_cv_grey = reformat_input(image)
+            horizontal_list, free_list = self.detect(img, self.opt2val)
+            image_list, _ = get_image_list(
+                horizontal_list,
+                free_list,
+                img_cv_grey,
+                model_height=self.opt2val["imgH"],
+            )
+            lines.extend(image_list)
+            owners.extend([idx] * len(image_list))
+
+        recognized = get_text(lines, self.recognizer, self.converter,
+                              self.opt2val) if lines else []
+
+        results = [[] for _ in images]
+        for owner, item in zip(owners, recognized):
+            results[owner].append(item)
+
+        if paragraph:
+            results = [get_paragraph(result, mode="ltr") if result else result
+                       for result in results]
+        if skip_details:
+            results = [[item[1] for item in result] for result in results]
+        return results
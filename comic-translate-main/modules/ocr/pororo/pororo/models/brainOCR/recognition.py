@@ -185,6 +185,29 @@ def get_recognizer(opt2val: dict):
     return recognizer, converter
 
 
+def make_loader(img_list: list, collate_fn, batch_size: int, n_workers: int,
+                device: str):
+    """
+    Batches of collated line images. Small inputs are collated in-process:
+    spinning up DataLoader workers costs more than the whole recognition.
+    """
+    if n_workers == 0 or len(img_list) <= batch_size * n_workers:
+        dataset = ListDataset(img_list)
+        return [
+            collate_fn([dataset[i] for i in range(start, min(start + batch_size, len(dataset)))])
+            for start in range(0, len(dataset), batch_size)
+        ]
+
+    return torch.utils.data.DataLoader(
+        ListDataset(img_list),
+        batch_size=batch_size,
+        shuffle=False,
+        num_workers=n_workers,
+        collate_fn=collate_fn,
+        pin_memory=device == "cuda",
+    )
+
+
 def get_text(image_list, recognizer, converter, opt2val: dict):
     imgW = opt2val["imgW"]
     imgH = opt2val["imgH"]
@@ -199,15 +222,8 @@ def get_text(image_list, recognizer, converter, opt2val: dict):
     coord = [item[0] for item in image_list]
     img_list = [item[1] for item in image_list]
     AlignCollate_normal = AlignCollate(imgH, imgW, adjust_contrast)
-    test_data = ListDataset(img_list)
-    test_loader = torch.utils.data.DataLoader(
-        test_data,
-        batch_size=batch_size,
-        shuffle=False,
-        num_workers=n_workers,
-        collate_fn=AlignCollate_normal,
-        pin_memory=True,
-    )
+    test_loader = make_loader(img_list, AlignCollate_normal, batch_size,
+                              n_workers, opt2val["device"])
 
     # predict first round
     result1 = recognizer_predict(recognizer, converter, test_loader, opt2val)
@@ -219,15 +235,8 @@ def get_text(image_list, recognizer, converter, opt2val: dict):
     if len(low_confident_idx) > 0:
         img_list2 = [img_list[i] for i in low_confident_idx]
         AlignCollate_contrast = AlignCollate(imgH, imgW, adjust_contrast)
-        test_data = ListDataset(img_list2)
-        test_loader = torch.utils.data.DataLoader(
-            test_data,
-            batch_size=batch_size,
-            shuffle=False,
-            num_workers=n_workers,
-            collate_fn=AlignCollate_contrast,
-            pin_memory=True,
-        )
+        test_loader = make_loader(img_list2, AlignCollate_contrast, batch_size,
+                                  n_workers, opt2val["device"])
         result2 = recognizer_predict(recognizer, converter, test_loader,
                                      opt2val)
 
@@ -179,3 +179,26 @@ class PororoOCR(PororoSimpleBase):
             ),
             detail,
         )
+
+    def predict_batch(self, images: list, **kwargs):
+        """
+        Conduct Optical Character Recognition (OCR) on several images at once
+
+        Args:
+            images (list): image file paths or numpy arrays
+            detail (bool): if True, returned to include details. (bounding poly, vertices, etc)
+            batch_size (int): number of text lines recognized per forward pass
+
+        """
+        detail = kwargs.get("detail", False)
+        batch_size = kwargs.get("batch_size", 32)
+
+        return [
+            self._postprocess(ocr_results, detail)
+            for ocr_results in self._model.read_batch(
+                images,
+                skip_details=False,
+                batch_size=batch_size,
+                paragraph=True,
+            )
+        ]
@@ -4,6 +4,7 @@ from typing import Any
 from ..utils.textblock import TextBlock
 from ..utils.pipeline_utils import language_codes
 from .factory import OCRFactory
+from .dedup import OCRCropCache
 
 
 class OCRProcessor:
@@ -37,13 +38,17 @@ class OCRProcessor:
     def _get_english_lang(self, translated_lang: str) -> str:
         return self.main_page.lang_mapping.get(translated_lang, translated_lang)
 
-    def process(self, img: np.ndarray, blk_list: list[TextBlock]) -> list[TextBlock]:
+    def process(self, img: np.ndarray, blk_list: list[TextBlock],
+                crop_cache: OCRCropCache = None) -> list[TextBlock]:
         """
         Process image with appropriate OCR engine.
         
         Args:
             img: Input image as numpy array
             blk_list: List of TextBlock objects to update with OCR text
+            crop_cache: Text of crops read on earlier pages of the same run.
+                Without it only blocks repeated on this page are read once,
+                so OCR run again by hand always reads the crops again.
             
         Returns:
             Updated list of TextBlock objects with recognized text
@@ -55,13 +60,65 @@ class OCRProcessor:
             # Get appropriate OCR engine from factory
             engine = OCRFactory.create_engine(self.settings, self.source_lang_english, self.ocr_key)
             
-            # Process image with selected engine
-            return engine.process_image(img, blk_list)
+            if engine.whole_page:
+                engine.process_image(img, blk_list)
+                return blk_list
+            
+            # Only send the engine one block per crop it has not read yet
+            if crop_cache is None:
+                crop_cache = OCRCropCache()
+            pending, duplicates, reused = self._dedup_blocks(img, blk_list, crop_cache)
+            if pending:
+                engine.process_image(img, pending)
+            self._fan_out(duplicates, crop_cache)
+            
+            n_duplicates = sum(len(group) - 1 for group in duplicates.values())
+            if reused or n_duplicates:
+                print(f"OCR dedup: {reused + n_duplicates} of {len(blk_list)} blocks reused "
+                      f"({reused} seen on earlier pages, {n_duplicates} repeated on this page)")
+            return blk_list
         
         except Exception as e:
             print(f"OCR processing error: {str(e)}")
             return blk_list
             
+    def _dedup_blocks(self, img: np.ndarray, blk_list: list[TextBlock],
+                      crop_cache: OCRCropCache) -> tuple[list, dict, int]:
+        """
+        Split blocks into those to OCR and those whose crop was already read.
+        
+        Returns:
+            Tuple of (blocks to send to the engine, crop key -> blocks sharing it
+            with the one sent first, number of blocks filled from the cache)
+        """
+        scope = (self.ocr_key, self.source_lang_english)
+        pending = []
+        duplicates = {}
+        reused = 0
+        for blk in blk_list:
+            key = crop_cache.crop_key(img, blk)
+            if key is None:
+                pending.append(blk)
+                continue
+            text = crop_cache.get(scope, key)
+            if text is not None:
+                blk.text = text
+                reused += 1
+            elif key in duplicates:
+                duplicates[key].append(blk)
+            else:
+                duplicates[key] = [blk]
+                pending.append(blk)
+        return pending, duplicates, reused
+
+    def _fan_out(self, duplicates: dict, crop_cache: OCRCropCache) -> None:
+        scope = (self.ocr_key, self.source_lang_english)
+        for key, group in duplicates.items():
+            text = group[0].text
+            for blk in group[1:]:
+                blk.text = text
+            crop_cache.put(scope, key, text)
+
     def _set_source_language(self, blk_list: list[TextBlock]) -> None:
         source_lang_code = language_codes.get(self.source_lang_english, 'en')
         for blk in blk_list:
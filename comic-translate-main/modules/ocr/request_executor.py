@@ -0,0 +1,103 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class OCRRequestExecutor:
+    """
+    Runs per-block OCR requests concurrently over one pooled HTTP session.
+
+    Requests are spaced to stay under requests_per_minute (if set), and
+    responses with a retryable status (429, 5xx) are retried with exponential
+    backoff, honouring the provider's Retry-After header. Results of map()
+    are returned in input order.
+    """
+
+    RETRY_STATUS = {429, 500, 502, 503, 504}
+
+    def __init__(self, max_concurrency: int = 8, requests_per_minute: int = None,
+                 max_retries: int = 3, backoff: float = 1.0, max_backoff: float = 30.0,
+                 timeout: float = 20):
+        self.max_concurrency = max(1, max_concurrency)
+        self.requests_per_minute = requests_per_minute
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.max_concurrency, pool_maxsize=self.max_concurrency)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self._executor = None
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def _wait_for_slot(self) -> None:
+        if not self.requests_per_minute:
+            return
+        interval = 60.0 / self.requests_per_minute
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def _retry_delay(self, response: requests.Response, attempt: int) -> float:
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), self.max_backoff)
+            except ValueError:
+                pass
+        # Exponential backoff with jitter so parallel workers do not retry in lockstep
+        return min(self.backoff * (2 ** attempt), self.max_backoff) * (0.5 + random.random() / 2)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """
+        POST through the shared session with rate limiting and retries.
+
+        Returns:
+            The last response; callers check status_code as with requests.post
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        for attempt in range(self.max_retries + 1):
+            self._wait_for_slot()
+            try:
+                response = self.session.post(url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.max_retries:
+                    raise
+                time.sleep(self._retry_delay(None, attempt))
+                continue
+
+            if response.status_code not in self.RETRY_STATUS or attempt == self.max_retries:
+                return response
+            time.sleep(self._retry_delay(response, attempt))
+        return response
+
+    def map(self, func: Callable, items: Iterable) -> list:
+        """Apply func to every item concurrently, returning results in input order."""
+        items = list(items)
+        if len(items) <= 1 or self.max_concurrency == 1:
+            return [func(item) for item in items]
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency,
+                                                    thread_name_prefix='ocr-request')
+        return list(self._executor.map(func, items))
+
+    def close(self) -> None:
+        """Stop the worker threads and close the pooled connections."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+        self.session.close()
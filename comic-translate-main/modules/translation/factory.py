@@ -12,13 +12,12 @@ from .llm.gemini import GeminiTranslation
 from .llm.deepseek import DeepseekTranslation
 from .llm.custom import CustomTranslation
 from .local_transformers import LocalTransformersTranslation
+from ..utils.model_pool import model_pool
 
 
 class TranslationFactory:
     """Factory for creating appropriate translation engines based on settings."""
     
-    _engines = {}  # Cache of created engines
-    
     # Map traditional translation services to their engine classes
     TRADITIONAL_ENGINES = {
         "Google Translate": GoogleTranslation,
@@ -59,10 +58,15 @@ class TranslationFactory:
         # Create a cache key based on translator and language pair
         cache_key = cls._create_cache_key(translator_key, source_lang, target_lang, settings)
         
-        # Return cached engine if available
-        if cache_key in cls._engines:
-            return cls._engines[cache_key]
-        
+        # Return the pooled engine, creating it if needed
+        return model_pool.get(
+            f"translation:{cache_key}",
+            lambda: cls._create_new_engine(settings, source_lang, target_lang, translator_key)
+        )
+    
+    @classmethod
+    def _create_new_engine(cls, settings, source_lang: str, target_lang: str, translator_key: str) -> TranslationEngine:
+        """Create and initialize a new translation engine instance."""
         # Determine engine class and create engine
         engine_class = cls._get_engine_class(translator_key)
         engine = engine_class()
@@ -72,9 +76,6 @@ class TranslationFactory:
             engine.initialize(settings, source_lang, target_lang)
         else:
             engine.initialize(settings, source_lang, target_lang, translator_key)
-        
-        # Cache the engine
-        cls._engines[cache_key] = engine
         return engine
     
     @classmethod
@@ -0,0 +1,207 @@
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+from loguru import logger
+
+from .inpainting import boxes_from_mask
+
+INPAINT_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'comic-translate-inpainting')
+
+
+def config_json(config) -> str:
+    """Inpainting Config serialized the same way under pydantic v1 and v2."""
+    if hasattr(config, 'model_dump_json'):
+        return config.model_dump_json()
+    return config.json()
+
+
+class InpaintResultCache:
+    """
+    Content-addressed on-disk cache of inpainted regions.
+
+    Every connected mask region is keyed by a hash of the image and mask around
+    it (with context_margin pixels of surrounding context), the inpainter and
+    its device, and the inpainting config. Cached regions are reused and only
+    the missed regions are inpainted and stored; when every region of a page
+    is cached the inpainter is skipped entirely. Patches are PNG files evicted
+    least recently used first once the cache grows beyond max_bytes. If the
+    cache directory can't be created or read, enabled is False and inpaint()
+    runs the inpainter directly.
+    """
+
+    context_margin = 128
+
+    def __init__(self, cache_dir: str = None, max_bytes: int = 512 * 1024 * 1024):
+        self.cache_dir = cache_dir or INPAINT_CACHE_DIR
+        self.max_bytes = max_bytes
+        self.enabled = True
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        self._total_bytes = 0
+        try:
+            self._load_index()
+        except OSError as e:
+            logger.warning(f"Inpainting cache disabled, {self.cache_dir} is not usable: {e}")
+            self.enabled = False
+
+    def _load_index(self) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        files = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.png'):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.cache_dir, name))
+            except OSError:
+                continue
+            files.append((stat.st_mtime, name[:-4], stat.st_size))
+        # Oldest first, so the OrderedDict front is the eviction end
+        for _, key, size in sorted(files):
+            self._entries[key] = size
+            self._total_bytes += size
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.png")
+
+    def _region_key(self, image, mask, box, inpainter_key: str, config_key: str) -> str:
+        img_h, img_w = image.shape[:2]
+        x1, y1, x2, y2 = (int(v) for v in box)
+        cx1 = max(0, x1 - self.context_margin)
+        cy1 = max(0, y1 - self.context_margin)
+        cx2 = min(img_w, x2 + self.context_margin)
+        cy2 = min(img_h, y2 + self.context_margin)
+
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(np.ascontiguousarray(image[cy1:cy2, cx1:cx2]).tobytes())
+        digest.update(np.ascontiguousarray(mask[cy1:cy2, cx1:cx2]).tobytes())
+        # Position of the region inside its context and the page size it came from
+        digest.update(str((x1 - cx1, y1 - cy1, x2 - x1, y2 - y1, image.shape)).encode())
+        digest.update(inpainter_key.encode())
+        digest.update(config_key.encode())
+        return digest.hexdigest()
+
+    def _get(self, key: str):
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+        path = self._path(key)
+        patch = cv2.imread(path, cv2.IMREAD_UNCHANGED)
+        if patch is None:
+            with self._lock:
+                self._total_bytes -= self._entries.pop(key, 0)
+            return None
+        os.utime(path)
+        return patch
+
+    def _put(self, key: str, patch: np.ndarray) -> None:
+        path = self._path(key)
+        if not cv2.imwrite(path, patch):
+            return
+        size = os.path.getsize(path)
+        with self._lock:
+            self._total_bytes += size - self._entries.pop(key, 0)
+            self._entries[key] = size
+            self._evict(keep=1)
+
+    def _evict(self, keep: int = 0) -> None:
+        # Caller holds self._lock; keep spares the newest entries
+        while self._total_bytes > self.max_bytes and len(self._entries) > keep:
+            old_key, old_size = self._entries.popitem(last=False)
+            self._total_bytes -= old_size
+            try:
+                os.remove(self._path(old_key))
+            except OSError:
+                pass
+
+    def set_max_bytes(self, max_bytes: int) -> None:
+        """Change the size limit, evicting the oldest patches beyond it."""
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def inpaint(self, inpainter, inpainter_key: str, image: np.ndarray, mask: np.ndarray, config) -> np.ndarray:
+        """
+        Inpaint image with inpainter, reusing cached regions where possible.
+
+        Cached regions are pasted into the image before the inpainter runs, and
+        only the regions that missed are left in its mask; the inpainter is
+        skipped when every region hits.
+
+        Args:
+            inpainter: InpaintModel instance
+            inpainter_key: Name of the inpainter, part of the cache key
+            image: Image as passed to the inpainter
+            mask: Inpainting mask, 255 where the image should be inpainted
+            config: Inpainting Config
+
+        Returns:
+            Inpainted image as uint8, in the inpainter's output channel order
+        """
+        boxes = boxes_from_mask(mask)
+        model_key = f"{inpainter_key}:{getattr(inpainter, 'device', '')}"
+        config_key = config_json(config)
+        keys = [self._region_key(image, mask, box, model_key, config_key) for box in boxes]
+
+        hits = {}
+        for index, ((x1, y1, x2, y2), key) in enumerate(zip(boxes, keys)):
+            patch = self._get(key)
+            if patch is not None and patch.shape[:2] == (y2 - y1, x2 - x1):
+                hits[index] = patch
+
+        if boxes and len(hits) == len(boxes):
+            logger.info(f"Inpainting cache hit for all {len(boxes)} regions")
+            result = np.ascontiguousarray(image[:, :, ::-1])
+            for (x1, y1, x2, y2), patch in zip(boxes, hits.values()):
+                result[y1:y2, x1:x2] = patch
+            return result
+
+        mask_2d = mask.reshape(mask.shape[:2])
+        misses = [index for index in range(len(boxes)) if index not in hits]
+        if hits:
+            logger.info(f"Inpainting cache hit for {len(hits)} of {len(boxes)} regions")
+            # Paste the cached regions so the inpainter sees them already
+            # cleaned, and keep only the missed regions in its mask. Boxes of
+            # missed regions are restored last, as boxes can overlap.
+            image = image.copy()
+            miss_mask = mask_2d.copy()
+            for index, patch in hits.items():
+                x1, y1, x2, y2 = boxes[index]
+                masked = mask_2d[y1:y2, x1:x2] > 127
+                image[y1:y2, x1:x2][masked] = patch[:, :, ::-1][masked]
+                miss_mask[y1:y2, x1:x2] = 0
+            for index in misses:
+                x1, y1, x2, y2 = boxes[index]
+                miss_mask[y1:y2, x1:x2] = mask_2d[y1:y2, x1:x2]
+            mask = miss_mask.reshape(mask.shape)
+        else:
+            miss_mask = mask_2d
+
+        result = inpainter(image, mask, config)
+        if result.dtype != np.uint8:
+            result = cv2.convertScaleAbs(result)
+
+        for index, patch in hits.items():
+            x1, y1, x2, y2 = boxes[index]
+            keep = miss_mask[y1:y2, x1:x2] <= 127
+            result[y1:y2, x1:x2][keep] = patch[keep]
+        for index in misses:
+            x1, y1, x2, y2 = boxes[index]
+            self._put(keys[index], result[y1:y2, x1:x2])
+        return result
+
+    def clear(self) -> None:
+        with self._lock:
+            keys = list(self._entries)
+            self._entries.clear()
+            self._total_bytes = 0
+        for key in keys:
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
@@ -0,0 +1,228 @@
+"""
+Optional CPU inference runtimes for the TorchScript inpainting models.
+
+The runtime is picked with the INPAINT_RUNTIME environment variable:
+    torchscript  the downloaded TorchScript model as is (default)
+    optimized    frozen TorchScript passed through torch.jit.optimize_for_inference
+    onnx         ONNX export executed with onnxruntime
+
+INPAINT_QUANTIZATION optionally reduces precision: "int8" (dynamic weight
+quantization, onnx runtime) or "bf16" (autocast, optimized runtime).
+
+Converted models are cached next to the downloaded .pt file, so conversion
+only happens once, when the model is first loaded. Any conversion or runtime
+failure falls back to the plain TorchScript model.
+"""
+import os
+from typing import Callable
+
+import numpy as np
+import torch
+from loguru import logger
+
+from .inpainting import download_model, load_jit_model
+
+INPAINT_RUNTIME = os.environ.get("INPAINT_RUNTIME", "torchscript").lower()
+INPAINT_QUANTIZATION = os.environ.get("INPAINT_QUANTIZATION", "").lower()
+
+
+def _artifact_path(model_path: str, suffix: str) -> str:
+    return os.path.splitext(model_path)[0] + suffix
+
+
+class OptimizedTorchScriptModel:
+    """Frozen, inference-optimized TorchScript module with optional bf16 autocast."""
+
+    def __init__(self, model, bf16: bool = False):
+        self.model = model
+        self.bf16 = bf16
+
+    def eval(self):
+        return self
+
+    @torch.no_grad()
+    def __call__(self, *inputs):
+        if not self.bf16:
+            return self.model(*inputs)
+        with torch.autocast("cpu", dtype=torch.bfloat16):
+            output = self.model(*inputs)
+        return output.float()
+
+
+class OnnxInpaintModel:
+    """
+    Drop-in replacement for a TorchScript inpainting model backed by onnxruntime.
+
+    The ONNX graph is exported by export_onnx when the model is loaded. The
+    TorchScript model is not kept alongside the session; if the session fails
+    at run time, load_fallback loads it again and it is used from then on.
+    Inputs and outputs stay torch tensors for callers.
+    """
+
+    def __init__(self, onnx_path: str, load_fallback: Callable[[], torch.nn.Module]):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(onnx_path, options, providers=["CPUExecutionProvider"])
+        self.load_fallback = load_fallback
+        self.fallback_model = None
+        logger.info(f"Using ONNX runtime for inpainting: {onnx_path}")
+
+    def eval(self):
+        return self
+
+    @torch.no_grad()
+    def __call__(self, *inputs):
+        if self.session is not None:
+            try:
+                feeds = {}
+                for session_input, tensor in zip(self.session.get_inputs(), inputs):
+                    array = tensor.detach().cpu().numpy()
+                    if session_input.type == "tensor(float)":
+                        array = array.astype(np.float32, copy=False)
+                    elif session_input.type == "tensor(int64)":
+                        array = array.astype(np.int64, copy=False)
+                    feeds[session_input.name] = array
+
+                output = self.session.run(None, feeds)[0]
+                return torch.from_numpy(output)
+            except Exception as e:
+                logger.warning(f"ONNX inpainting runtime failed, falling back to TorchScript: {e}")
+                self.session = None
+
+        if self.fallback_model is None:
+            self.fallback_model = self.load_fallback()
+        return self.fallback_model(*inputs)
+
+
+def export_onnx(jit_model, example_inputs: tuple, onnx_path: str) -> None:
+    """
+    Export a TorchScript inpainting model to ONNX.
+
+    Args:
+        jit_model: The TorchScript model
+        example_inputs: Inputs of the model's dtypes, traced at a fixed shape;
+            the batch and spatial axes of 4D inputs are exported as dynamic
+        onnx_path: Where to write the graph
+    """
+    input_names = [f"input_{i}" for i in range(len(example_inputs))]
+    dynamic_axes = {
+        name: {0: "batch", 2: "height", 3: "width"}
+        for name, tensor in zip(input_names, example_inputs) if tensor.dim() == 4
+    }
+    dynamic_axes["output"] = {0: "batch", 2: "height", 3: "width"}
+
+    logger.info(f"Exporting inpainting model to ONNX: {onnx_path}")
+    tmp_path = _artifact_path(onnx_path, ".tmp.onnx")
+    with torch.no_grad():
+        torch.onnx.export(
+            jit_model,
+            tuple(tensor.cpu() for tensor in example_inputs),
+            tmp_path,
+            input_names=input_names,
+            output_names=["output"],
+            dynamic_axes=dynamic_axes,
+            opset_version=17,
+            dynamo=False,
+        )
+    os.replace(tmp_path, onnx_path)
+
+
+def _onnx_model_path(url_or_path, device, model_md5: str, model_path: str,
+                     example_inputs: tuple, quantization: str) -> str:
+    """Path of the ONNX graph to run, exporting and quantizing it first if needed."""
+    onnx_path = _artifact_path(model_path, ".onnx")
+    if not os.path.exists(onnx_path):
+        if example_inputs is None:
+            raise ValueError("the model has no example inputs to export it with")
+        # The TorchScript model is only needed for the export and is released after it
+        export_onnx(load_jit_model(url_or_path, device, model_md5), example_inputs, onnx_path)
+
+    if quantization != "int8":
+        return onnx_path
+    quantized_path = _artifact_path(model_path, ".int8.onnx")
+    if not os.path.exists(quantized_path):
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+
+        logger.info(f"Quantizing inpainting model to int8: {quantized_path}")
+        quantize_dynamic(onnx_path, quantized_path, weight_type=QuantType.QInt8)
+    return quantized_path
+
+
+def _load_optimized(jit_model, model_path: str):
+    optimized_path = _artifact_path(model_path, ".opt.pt")
+    if os.path.exists(optimized_path):
+        try:
+            return torch.jit.load(optimized_path, map_location="cpu")
+        except Exception as e:
+            logger.warning(f"Could not load {optimized_path}, rebuilding it: {e}")
+
+    optimized = torch.jit.optimize_for_inference(torch.jit.freeze(jit_model.eval()))
+    torch.jit.save(optimized, optimized_path)
+    logger.info(f"Saved optimized inpainting model to: {optimized_path}")
+    return optimized
+
+
+def load_inpaint_model(url_or_path, device, model_md5: str, runtime: str = None,
+                       quantization: str = None, example_inputs: tuple = None):
+    """
+    Load a TorchScript inpainting model with the configured inference runtime.
+
+    Args:
+        url_or_path: Model URL or local path, as for load_jit_model
+        device: Torch device the model should run on
+        model_md5: Expected md5 of the downloaded model
+        runtime: "torchscript", "optimized" or "onnx"; defaults to INPAINT_RUNTIME
+        quantization: "", "int8" or "bf16"; defaults to INPAINT_QUANTIZATION
+        example_inputs: Tensors shaped and typed like the model's inputs, used to
+            export it to ONNX
+
+    Returns:
+        A callable taking and returning torch tensors, like the TorchScript model
+    """
+    runtime = (runtime or INPAINT_RUNTIME).lower()
+    quantization = (quantization if quantization is not None else INPAINT_QUANTIZATION).lower()
+
+    def load_torchscript():
+        return load_jit_model(url_or_path, device, model_md5)
+
+    if runtime == "torchscript":
+        return load_torchscript()
+
+    # The optimized runtimes target CPU inference; other devices keep TorchScript
+    if torch.device(device).type != "cpu":
+        logger.info(f"Inpainting runtime '{runtime}' is CPU only, using TorchScript on {device}")
+        return load_torchscript()
+
+    model_path = url_or_path if os.path.exists(url_or_path) else download_model(url_or_path, model_md5)
+
+    if runtime == "onnx":
+        if quantization == "bf16":
+            logger.warning("bf16 is not supported by the onnx inpainting runtime, ignoring")
+            quantization = ""
+        try:
+            import onnxruntime  # noqa: F401
+        except ImportError:
+            logger.warning("onnxruntime is not installed, using TorchScript for inpainting")
+            return load_torchscript()
+        try:
+            onnx_path = _onnx_model_path(url_or_path, device, model_md5, model_path, example_inputs, quantization)
+            return OnnxInpaintModel(onnx_path, load_torchscript)
+        except Exception as e:
+            logger.warning(f"Could not use the ONNX runtime for inpainting, using TorchScript: {e}")
+            return load_torchscript()
+
+    jit_model = load_torchscript()
+    if runtime == "optimized":
+        if quantization == "int8":
+            logger.warning("int8 is only supported by the onnx inpainting runtime, ignoring")
+        try:
+            optimized = _load_optimized(jit_model, model_path)
+        except Exception as e:
+            logger.warning(f"Could not optimize inpainting model, using TorchScript: {e}")
+            return jit_model
+        return OptimizedTorchScriptModel(optimized, bf16=quantization == "bf16")
+
+    logger.warning(f"Unknown inpainting runtime '{runtime}', using TorchScript")
+    return jit_model
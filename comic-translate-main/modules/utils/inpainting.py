@@ -3,6 +3,7 @@
 import io
 import os
 import sys
+import time
 from typing import List, Optional
 
 from urllib.parse import urlparse
@@ -101,6 +102,78 @@ def handle_error(model_path, model_md5, e):
     exit(-1)
 
 
+def _split_paths(model_path):
+    base = os.path.splitext(model_path)[0]
+    return base + ".skeleton.pt", base + ".weights.pt"
+
+
+def _named_tensors(model):
+    tensors = dict(model.named_parameters())
+    tensors.update(model.named_buffers())
+    return tensors
+
+
+def _bind_weights(model, weights):
+    """
+    Point every parameter and buffer of model at the tensor of the same name in
+    weights. Storages are swapped in place with set_, so the module keeps its
+    own tensor objects (a ScriptModule never sees an attribute reassigned).
+    Raises if the names, shapes or dtypes do not all match.
+    """
+    tensors = _named_tensors(model)
+    if tensors.keys() != weights.keys():
+        raise ValueError("weights file does not match the model's parameters and buffers")
+    for name, tensor in tensors.items():
+        weight = weights[name]
+        if weight.shape != tensor.shape or weight.dtype != tensor.dtype:
+            raise ValueError(f"weights file does not match the model at {name}")
+    with torch.no_grad():
+        for name, tensor in tensors.items():
+            tensor.set_(weights[name])
+
+
+def _split_weights(model, model_path):
+    """
+    Save a CPU model as a TorchScript archive without weights (<name>.skeleton.pt)
+    plus its weights (<name>.weights.pt), then rebind model to the mapped weights.
+
+    In the skeleton every parameter and buffer is a one-element storage viewed at
+    its full shape, so the archive stays a few hundred KB and deserializes
+    almost instantly. Later loads map the weights file as their only weight load.
+    """
+    skeleton_path, weights_path = _split_paths(model_path)
+    tensors = _named_tensors(model)
+
+    tmp_path = weights_path + ".tmp"
+    torch.save({name: tensor.detach().contiguous() for name, tensor in tensors.items()}, tmp_path)
+    os.replace(tmp_path, weights_path)
+    weights = torch.load(weights_path, map_location="cpu", mmap=True, weights_only=True)
+
+    try:
+        with torch.no_grad():
+            for tensor in tensors.values():
+                placeholder = torch.zeros(1, dtype=tensor.dtype).untyped_storage()
+                tensor.set_(placeholder, 0, tensor.shape, [0] * tensor.dim())
+        tmp_path = skeleton_path + ".tmp"
+        torch.jit.save(model, tmp_path)
+        os.replace(tmp_path, skeleton_path)
+    finally:
+        _bind_weights(model, weights)
+
+
+def _load_split_model(model_path):
+    """Load the skeleton archive and map the weights into it, or return None if they are missing or stale."""
+    skeleton_path, weights_path = _split_paths(model_path)
+    if not (os.path.exists(skeleton_path) and os.path.exists(weights_path)):
+        return None
+    model_mtime = os.path.getmtime(model_path)
+    if os.path.getmtime(skeleton_path) < model_mtime or os.path.getmtime(weights_path) < model_mtime:
+        return None
+    model = torch.jit.load(skeleton_path, map_location="cpu")
+    _bind_weights(model, torch.load(weights_path, map_location="cpu", mmap=True, weights_only=True))
+    return model
+
+
 def load_jit_model(url_or_path, device, model_md5: str):
     if os.path.exists(url_or_path):
         model_path = url_or_path
@@ -108,11 +181,31 @@ def load_jit_model(url_or_path, device, model_md5: str):
         model_path = download_model(url_or_path, model_md5)
 
     logger.info(f"Loading model from: {model_path}")
-    try:
-        model = torch.jit.load(model_path, map_location="cpu").to(device)
-    except Exception as e:
-        handle_error(model_path, model_md5, e)
+    start = time.perf_counter()
+    on_cpu = torch.device(device).type == "cpu"
+
+    model = None
+    if on_cpu:
+        try:
+            model = _load_split_model(model_path)
+        except Exception as e:
+            logger.warning(f"Could not load memory-mapped weights of {model_path}, loading the full archive: {e}")
+            model = None
+
+    if model is None:
+        try:
+            model = torch.jit.load(model_path, map_location="cpu").to(device)
+        except Exception as e:
+            handle_error(model_path, model_md5, e)
+
+        if on_cpu:
+            try:
+                _split_weights(model, model_path)
+            except Exception as e:
+                logger.warning(f"Could not split weights of {model_path}, keeping them in memory: {e}")
+
     model.eval()
+    logger.info(f"Loaded {os.path.basename(model_path)} in {time.perf_counter() - start:.2f}s")
     return model
 
 
@@ -250,6 +343,27 @@ def pad_img_to_modulo(
     )
 
 
+def pad_img_to_shape(img: np.ndarray, height: int, width: int):
+    """
+    Symmetrically pad an image at the bottom/right to exactly (height, width).
+
+    Args:
+        img: [H, W, C] or [H, W]
+        height: Target height, >= H
+        width: Target width, >= W
+
+    Returns:
+        [height, width, C]
+    """
+    if len(img.shape) == 2:
+        img = img[:, :, np.newaxis]
+    return np.pad(
+        img,
+        ((0, height - img.shape[0]), (0, width - img.shape[1]), (0, 0)),
+        mode="symmetric",
+    )
+
+
 def boxes_from_mask(mask: np.ndarray) -> List[np.ndarray]:
     """
     Args:
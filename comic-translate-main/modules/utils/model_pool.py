@@ -0,0 +1,213 @@
+import gc
+import itertools
+import os
+import sys
+import threading
+import types
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable
+
+import psutil
+from loguru import logger
+
+
+def tensor_bytes(model, max_depth: int = 4) -> int:
+    """
+    Bytes of the parameters and buffers of every torch module reachable from
+    model through its attributes, lists and dicts, on any device. Tensors
+    sharing a storage are counted once.
+
+    Returns:
+        The byte count, 0 if no torch module was found
+    """
+    # Only look for modules if something already imported torch
+    torch = sys.modules.get('torch')
+    if torch is None:
+        return 0
+    leaf_types = (str, bytes, int, float, bool, type(None), type, types.ModuleType,
+                  types.FunctionType, types.MethodType)
+
+    total = 0
+    seen_objects, seen_storages = set(), set()
+    stack = [(model, 0)]
+    while stack:
+        obj, depth = stack.pop()
+        if isinstance(obj, leaf_types) or id(obj) in seen_objects:
+            continue
+        seen_objects.add(id(obj))
+        if isinstance(obj, torch.nn.Module):
+            for tensor in itertools.chain(obj.parameters(), obj.buffers()):
+                storage = tensor.untyped_storage()
+                key = (str(tensor.device), storage.data_ptr(), storage.nbytes())
+                if key not in seen_storages:
+                    seen_storages.add(key)
+                    total += storage.nbytes()
+            continue
+        if depth >= max_depth:
+            continue
+        if isinstance(obj, dict):
+            children = obj.values()
+        elif isinstance(obj, (list, tuple, set)):
+            children = obj
+        elif hasattr(obj, '__dict__'):
+            children = vars(obj).values()
+        else:
+            continue
+        stack.extend((child, depth + 1) for child in children)
+    return total
+
+
+class _PoolEntry:
+    __slots__ = ('model', 'size')
+
+    def __init__(self, model, size: int):
+        self.model = model
+        self.size = size
+
+
+class ModelPool:
+    """
+    Process-wide pool of loaded models and engines.
+
+    Models are looked up by key and loaded on first use. The size of each
+    model is the bytes of its torch parameters and buffers (CPU and GPU);
+    models without any, such as onnxruntime or Paddle engines, fall back to
+    the process RSS growth while they load. When the pool exceeds its budget
+    (or max_entries), the least recently used models are dropped. Callers
+    must fetch models from the pool for each use rather than keep them, or
+    an evicted model stays alive. Evicted models with a close() method, such
+    as OCR engines holding request threads and sessions, are closed. Loads of
+    the same key are deduplicated, and models can be preloaded on a
+    background thread.
+    """
+
+    def __init__(self, ram_budget_mb: int = None, max_entries: int = 32):
+        if ram_budget_mb is None:
+            ram_budget_mb = int(os.environ.get(
+                'MODEL_POOL_RAM_MB', psutil.virtual_memory().total // (2 * 1024 * 1024)
+            ))
+        self.ram_budget = ram_budget_mb * 1024 * 1024
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, _PoolEntry] = OrderedDict()
+        self._pending: dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    @property
+    def total_size(self) -> int:
+        with self._lock:
+            return sum(entry.size for entry in self._entries.values())
+
+    def get(self, key: str, loader: Callable[[], object]):
+        """
+        Return the model for key, loading it with loader() if it is not pooled.
+
+        Args:
+            key: Unique key of the model (engine name, device, settings hash...)
+            loader: Zero-argument callable creating the model
+
+        Returns:
+            The pooled model
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry.model
+            future = self._pending.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._pending[key] = future
+
+        # Another thread is already loading this model
+        if not owner:
+            return future.result()
+
+        try:
+            rss_before = psutil.Process().memory_info().rss
+            model = loader()
+            rss_growth = max(0, psutil.Process().memory_info().rss - rss_before)
+            size = tensor_bytes(model)
+        except BaseException as e:
+            with self._lock:
+                self._pending.pop(key, None)
+            future.set_exception(e)
+            raise
+
+        if size:
+            logger.info(f"Model pool: loaded {key} ({size / (1024 * 1024):.0f} MB of weights)")
+        else:
+            # Concurrent loads also count towards this estimate
+            size = rss_growth
+            logger.info(f"Model pool: loaded {key} (~{size / (1024 * 1024):.0f} MB RSS growth)")
+        with self._lock:
+            self._entries[key] = _PoolEntry(model, size)
+            self._pending.pop(key, None)
+            evicted = self._evict(keep=key)
+        future.set_result(model)
+
+        if evicted:
+            self._release(evicted)
+        return model
+
+    def preload(self, key: str, loader: Callable[[], object]) -> Future:
+        """Load a model on the background thread; the future resolves to the model."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='model-preload')
+        return self._executor.submit(self.get, key, loader)
+
+    def evict(self, key: str) -> None:
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        if entry is not None:
+            evicted = [(key, entry)]
+            del entry
+            self._release(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            evicted = list(self._entries.items())
+            self._entries.clear()
+        self._release(evicted)
+
+    def _evict(self, keep: str) -> list:
+        # Called with the lock held
+        evicted = []
+        total = sum(entry.size for entry in self._entries.values())
+        while len(self._entries) > 1 and (total > self.ram_budget or len(self._entries) > self.max_entries):
+            key = next(iter(self._entries))
+            if key == keep:
+                self._entries.move_to_end(key)
+                key = next(iter(self._entries))
+            entry = self._entries.pop(key)
+            total -= entry.size
+            evicted.append((key, entry))
+        return evicted
+
+    def _release(self, evicted: list) -> None:
+        for key, entry in evicted:
+            logger.info(f"Model pool: evicted {key} (~{entry.size / (1024 * 1024):.0f} MB)")
+            close = getattr(entry.model, 'close', None)
+            if callable(close):
+                try:
+                    close()
+                except Exception as e:
+                    logger.warning(f"Model pool: closing {key} failed: {e}")
+        entry = close = None
+        # Drop the last references before collecting
+        evicted.clear()
+        gc.collect()
+        # Only touch torch if something already imported it
+        torch = sys.modules.get('torch')
+        if torch is not None and torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+
+model_pool = ModelPool()
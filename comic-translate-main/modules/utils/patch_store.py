@@ -0,0 +1,122 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+
+def patch_hash(image: np.ndarray, bbox) -> str:
+    """Composite hash of a patch's pixel buffer and its bounding box, used for deduplication."""
+    digest = hashlib.sha256(np.ascontiguousarray(image).tobytes())
+    digest.update(str(image.shape).encode('utf-8'))
+    digest.update(str(bbox).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class PatchStore:
+    """
+    Decoded inpainting patches keyed by their PNG path.
+
+    Patches are handed over as arrays and kept in a memory cache bounded by
+    max_bytes (least recently used first out); the PNG is written on a
+    background thread. Reads are served from memory, from a write that is still
+    pending, or by decoding the PNG as a last resort. Call flush() before
+    anything reads the PNG files directly, and close() before removing the
+    directories they are written to.
+    """
+
+    def __init__(self, max_bytes: int = 512 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._cache: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._cache_bytes = 0
+        self._pending: dict[str, tuple[np.ndarray, Future]] = {}
+        self._failed: dict[str, Exception] = {}
+        self._lock = threading.Lock()
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='patch-writer')
+
+    def put(self, png_path: str, image: np.ndarray) -> None:
+        """Store a patch and schedule writing it to png_path."""
+        image = np.ascontiguousarray(image)
+        with self._lock:
+            self._insert(png_path, image)
+            future = self._writer.submit(self._write, png_path, image)
+            self._pending[png_path] = (image, future)
+
+    def get(self, png_path: str) -> np.ndarray:
+        """Return the patch stored at png_path, decoding the PNG only if it is not held in memory."""
+        with self._lock:
+            image = self._cache.get(png_path)
+            if image is not None:
+                self._cache.move_to_end(png_path)
+                return image
+            pending = self._pending.get(png_path)
+            if pending is not None:
+                return pending[0]
+
+        image = cv2.imread(png_path)
+        if image is not None:
+            with self._lock:
+                self._insert(png_path, image)
+        return image
+
+    def flush(self) -> None:
+        """
+        Wait until every scheduled PNG has been written.
+
+        Raises:
+            OSError: If any write since the last flush failed
+        """
+        with self._lock:
+            futures = [future for _, future in self._pending.values()]
+        for future in futures:
+            # Failures are collected below, including those of writes that
+            # finished before this flush
+            future.exception()
+        with self._lock:
+            failed, self._failed = self._failed, {}
+        if failed:
+            details = '; '.join(f"{path}: {error}" for path, error in failed.items())
+            raise OSError(f"Could not write {len(failed)} inpainting patch(es): {details}")
+
+    def close(self) -> None:
+        """Write every scheduled PNG and stop the writer thread."""
+        try:
+            self.flush()
+        finally:
+            self._writer.shutdown(wait=True)
+
+    def clear(self) -> None:
+        self.flush()
+        with self._lock:
+            self._cache.clear()
+            self._cache_bytes = 0
+
+    def _write(self, png_path: str, image: np.ndarray) -> None:
+        try:
+            os.makedirs(os.path.dirname(png_path), exist_ok=True)
+            if not cv2.imwrite(png_path, image):
+                raise OSError(f"cv2.imwrite failed for {png_path}")
+        except Exception as e:
+            with self._lock:
+                self._failed[png_path] = e
+            raise
+        finally:
+            with self._lock:
+                self._pending.pop(png_path, None)
+
+    def _insert(self, png_path: str, image: np.ndarray) -> None:
+        # Called with the lock held
+        previous = self._cache.pop(png_path, None)
+        if previous is not None:
+            self._cache_bytes -= previous.nbytes
+        self._cache[png_path] = image
+        self._cache_bytes += image.nbytes
+        while self._cache_bytes > self.max_bytes and len(self._cache) > 1:
+            _, evicted = self._cache.popitem(last=False)
+            self._cache_bytes -= evicted.nbytes
+
+
+patch_store = PatchStore()
@@ -5,7 +5,7 @@ import base64
 
 from .textblock import TextBlock, sort_textblock_rectangles
 from ..detection.utils.general import does_rectangle_fit, is_mostly_contained, \
-                                      get_inpaint_bboxes
+                                      get_inpaint_bboxes_batch
 from ..inpainting.lama import LaMa
 from ..inpainting.mi_gan import MIGAN
 from ..inpainting.aot import AOT
@@ -56,6 +56,8 @@ def get_config(settings_page):
     elif strategy_settings['strategy'] == settings_page.ui.tr("Crop"):
         config = Config(hd_strategy="Crop", hd_strategy_crop_margin = strategy_settings['crop_margin'],
                         hd_strategy_crop_trigger_size = strategy_settings['crop_trigger_size'])
+    elif strategy_settings['strategy'] == settings_page.ui.tr("Auto"):
+        config = Config(hd_strategy="Auto")
     else:
         config = Config(hd_strategy="Original")
 
@@ -74,22 +76,22 @@ def encode_image_array(img_array: np.ndarray):
     return base64.b64encode(img_bytes).decode('utf-8')
 
 def lists_to_blk_list(blk_list: list[TextBlock], texts_bboxes: list, texts_string: list):  
-    group = list(zip(texts_bboxes, texts_string))  
+    """
+    Give every block the text of the OCR lines that fit in it (or lie at least
+    half inside it), using the bubble box when the block has one. The
+    containment of every line in every block is computed in one pass.
+    """
+    if not blk_list:
+        return blk_list
 
-    for blk in blk_list:
-        blk_entries = []
-        
-        for line, text in group:
-            if blk.bubble_xyxy is not None:
-                if does_rectangle_fit(blk.bubble_xyxy, line):
-                    blk_entries.append((line, text))  
-                elif is_mostly_contained(blk.bubble_xyxy, line, 0.5):
-                    blk_entries.append((line, text)) 
-
-            elif does_rectangle_fit(blk.xyxy, line):
-                blk_entries.append((line, text)) 
-            elif is_mostly_contained(blk.xyxy, line, 0.5):
-                blk_entries.append((line, text)) 
+    group = list(zip(texts_bboxes, texts_string))
+    fits = lines_in_blocks(
+        [blk.bubble_xyxy if blk.bubble_xyxy is not None else blk.xyxy for blk in blk_list],
+        texts_bboxes
+    )
+
+    for blk, blk_fits in zip(blk_list, fits):
+        blk_entries = [group[i] for i in np.flatnonzero(blk_fits)]
 
         # Sort and join text entries
         sorted_entries = sort_textblock_rectangles(blk_entries, blk.source_lang_direction)
@@ -100,102 +102,233 @@ def lists_to_blk_list(blk_list: list[TextBlock], texts_bboxes: list, texts_strin
 
     return blk_list
 
-def generate_mask(img: np.ndarray, blk_list: list[TextBlock], default_padding: int = 5) -> np.ndarray:
+def lines_in_blocks(block_boxes: list, line_boxes: list, threshold: float = 0.5) -> np.ndarray:
+    """
+    Vectorized does_rectangle_fit / is_mostly_contained for every block-line pair.
+
+    Args:
+        block_boxes: N block boxes (x1, y1, x2, y2)
+        line_boxes: M line boxes (x1, y1, x2, y2)
+        threshold: Share of a line's area that must lie inside a block
+
+    Returns:
+        [N, M] boolean array, True where the line belongs to the block
+    """
+    blocks = np.array(block_boxes, dtype=np.float64).reshape(-1, 4)[:, None, :]
+    lines = np.array(line_boxes, dtype=np.float64).reshape(-1, 4)[None, :, :]
+    bx1, by1, bx2, by2 = (blocks[..., i] for i in range(4))
+    lx1, ly1, lx2, ly2 = (lines[..., i] for i in range(4))
+
+    # does_rectangle_fit, on properly ordered corners
+    fits = (
+        (np.minimum(bx1, bx2) <= np.minimum(lx1, lx2)) & (np.maximum(bx1, bx2) >= np.maximum(lx1, lx2)) &
+        (np.minimum(by1, by2) <= np.minimum(ly1, ly2)) & (np.maximum(by1, by2) >= np.maximum(ly1, ly2))
+    )
+
+    # is_mostly_contained, on the boxes as given
+    inner_area = (lx2 - lx1) * (ly2 - ly1)
+    outer_area = (bx2 - bx1) * (by2 - by1)
+    intersection = (
+        np.maximum(0, np.minimum(lx2, bx2) - np.maximum(lx1, bx1)) *
+        np.maximum(0, np.minimum(ly2, by2) - np.maximum(ly1, by1))
+    )
+    valid = (outer_area >= inner_area) & (inner_area != 0)
+    ratio = intersection / np.where(inner_area == 0, 1, inner_area)
+    mostly = valid & (ratio >= threshold)
+
+    return fits | mostly
+
+def generate_mask(img: np.ndarray, blk_list: list[TextBlock], default_padding: int = 5,
+                  segmentation_store=None) -> np.ndarray:
     """
     Generate a mask by fitting a merged shape around each block's inpaint bboxes,
     then dilating that shape according to padding logic.
+
+    Work is kept local to each block's padded ROI. Blocks that share a dilation
+    kernel are dilated together in one pass, since dilating a union of shapes
+    gives the same result as OR-ing the individually dilated shapes.
     """
     h, w, _ = img.shape
     mask = np.zeros((h, w), dtype=np.uint8)
-    LONG_EDGE = 2048
+    DILATE_ITERATIONS = 4
+
+    # kernel_size -> list of polygon lists, one per block
+    polys_by_kernel: dict[int, list[list[np.ndarray]]] = {}
+
+    text_bboxes = [blk.xyxy for blk in blk_list]
+    if segmentation_store is not None:
+        all_bboxes = segmentation_store.get_inpaint_bboxes(img, text_bboxes)
+    else:
+        all_bboxes = get_inpaint_bboxes_batch(text_bboxes, img)
 
-    for blk in blk_list:
-        bboxes = get_inpaint_bboxes(blk.xyxy, img)
+    for blk, bboxes in zip(blk_list, all_bboxes):
         blk.inpaint_bboxes = bboxes
         if bboxes is None or len(bboxes) == 0:
             continue
 
-        # 1) Compute tight per-block ROI
-        xs = [x for x1, _, x2, _ in bboxes for x in (x1, x2)]
-        ys = [y for _, y1, _, y2 in bboxes for y in (y1, y2)]
-        min_x, max_x = int(min(xs)), int(max(xs))
-        min_y, max_y = int(min(ys)), int(max(ys))
-        roi_w, roi_h = max_x - min_x + 1, max_y - min_y + 1
-
-        # 2) Down-sample factor to limit mask size
-        ds = max(1.0, max(roi_w, roi_h) / LONG_EDGE)
-        mw, mh = int(roi_w / ds) + 2, int(roi_h / ds) + 2
-
-        # 3) Paint bboxes into small mask
-        small = np.zeros((mh, mw), dtype=np.uint8)
-        for x1, y1, x2, y2 in bboxes:
-            x1i = int((x1 - min_x) / ds)
-            y1i = int((y1 - min_y) / ds)
-            x2i = int((x2 - min_x) / ds)
-            y2i = int((y2 - min_y) / ds)
-            cv2.rectangle(small, (x1i, y1i), (x2i, y2i), 255, -1)
-
-        # 4) Close small mask to bridge gaps
-        KSIZE = 15
-        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (KSIZE, KSIZE))
-        closed = cv2.morphologyEx(small, cv2.MORPH_CLOSE, kernel)
-
-        # 5) Extract all contours
-        contours, _ = cv2.findContours(closed, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        if not contours:
+        polys = _inpaint_polygons(bboxes)
+        if not polys:
             continue
 
-        # 6) Merge contours: collect valid polygons in full image coords
-        polys = []
-        for cnt in contours:
-            pts = cnt.squeeze(1)
-            if pts.ndim != 2 or pts.shape[0] < 3:
-                continue
-            pts_f = (pts.astype(np.float32) * ds)
-            pts_f[:, 0] += min_x
-            pts_f[:, 1] += min_y
-            polys.append(pts_f.astype(np.int32))
-        if not polys:
+        kernel_size = _mask_kernel_size(blk, polys, default_padding)
+        polys_by_kernel.setdefault(kernel_size, []).append(polys)
+
+    for kernel_size, block_polys in polys_by_kernel.items():
+        all_polys = [p for polys in block_polys for p in polys]
+
+        # Padded ROI covering every polygon of this kernel group
+        pad = kernel_size * DILATE_ITERATIONS
+        points = np.concatenate(all_polys)
+        x0 = max(int(points[:, 0].min()) - pad, 0)
+        y0 = max(int(points[:, 1].min()) - pad, 0)
+        x1 = min(int(points[:, 0].max()) + pad + 1, w)
+        y1 = min(int(points[:, 1].max()) + pad + 1, h)
+        if x1 <= x0 or y1 <= y0:
             continue
 
-        # 7) Create per-block mask and fill all polygons
-        block_mask = np.zeros((h, w), dtype=np.uint8)
-        cv2.fillPoly(block_mask, polys, 255)
-
-        # 8) Determine dilation kernel size
-        kernel_size = default_padding
-        src_lang = getattr(blk, 'source_lang', None)
-        if src_lang and src_lang not in ['ja', 'ko']:
-            kernel_size = 3
-        # Adjust for text bubbles: only consider contours wholly inside the bubble
-        if getattr(blk, 'text_class', None) == 'text_bubble' and getattr(blk, 'bubble_xyxy', None) is not None:
-            bx1, by1, bx2, by2 = blk.bubble_xyxy
-            # filter polygons fully within bubble bounds
-            valid = [p for p in polys 
-                     if (p[:,0] >= bx1).all() and (p[:,0] <= bx2).all() 
-                     and (p[:,1] >= by1).all() and (p[:,1] <= by2).all()]
-            if valid:
-                # compute distances for each polygon and get overall minimum
-                dists = []
-                for p in valid:
-                    left   = p[:,0].min() - bx1
-                    right  = bx2 - p[:,0].max()
-                    top    = p[:,1].min() - by1
-                    bottom = by2 - p[:,1].max()
-                    dists.extend([left, right, top, bottom])
-                min_dist = min(dists)
-                if kernel_size >= min_dist:
-                    kernel_size = max(1, int(min_dist * 0.8))
-
-        # 9) Dilate the block mask
+        roi_mask = np.zeros((y1 - y0, x1 - x0), dtype=np.uint8)
+        cv2.fillPoly(roi_mask, all_polys, 255, offset=(-x0, -y0))
+
         dil_kernel = np.ones((kernel_size, kernel_size), np.uint8)
-        dilated = cv2.dilate(block_mask, dil_kernel, iterations=4)
+        dilated = cv2.dilate(roi_mask, dil_kernel, iterations=DILATE_ITERATIONS)
 
-        # 10) Combine with global mask
-        mask = cv2.bitwise_or(mask, dilated)
+        roi = mask[y0:y1, x0:x1]
+        np.bitwise_or(roi, dilated, out=roi)
 
     return mask
 
+def _inpaint_polygons(bboxes) -> list[np.ndarray]:
+    """
+    Merge a block's inpaint bboxes into closed polygons in full image coordinates.
+    """
+    LONG_EDGE = 2048
+    boxes = np.asarray(bboxes, dtype=np.float64).reshape(-1, 4)
+
+    # 1) Compute tight per-block ROI
+    min_x, min_y = int(boxes[:, [0, 2]].min()), int(boxes[:, [1, 3]].min())
+    max_x, max_y = int(boxes[:, [0, 2]].max()), int(boxes[:, [1, 3]].max())
+    roi_w, roi_h = max_x - min_x + 1, max_y - min_y + 1
+
+    # 2) Down-sample factor to limit mask size
+    ds = max(1.0, max(roi_w, roi_h) / LONG_EDGE)
+    mw, mh = int(roi_w / ds) + 2, int(roi_h / ds) + 2
+
+    # 3) Paint bboxes into small mask
+    small = np.zeros((mh, mw), dtype=np.uint8)
+    local = ((boxes - [min_x, min_y, min_x, min_y]) / ds).astype(int)
+    for x1i, y1i, x2i, y2i in local:
+        cv2.rectangle(small, (x1i, y1i), (x2i, y2i), 255, -1)
+
+    # 4) Close small mask to bridge gaps
+    KSIZE = 15
+    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (KSIZE, KSIZE))
+    closed = cv2.morphologyEx(small, cv2.MORPH_CLOSE, kernel)
+
+    # 5) Extract all contours
+    contours, _ = cv2.findContours(closed, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+    # 6) Merge contours: collect valid polygons in full image coords
+    polys = []
+    for cnt in contours:
+        pts = cnt.squeeze(1)
+        if pts.ndim != 2 or pts.shape[0] < 3:
+            continue
+        pts_f = (pts.astype(np.float32) * ds)
+        pts_f[:, 0] += min_x
+        pts_f[:, 1] += min_y
+        polys.append(pts_f.astype(np.int32))
+
+    return polys
+
+def _mask_kernel_size(blk: TextBlock, polys: list[np.ndarray], default_padding: int) -> int:
+    """
+    Determine the dilation kernel size for a block's polygons.
+    """
+    kernel_size = default_padding
+    src_lang = getattr(blk, 'source_lang', None)
+    if src_lang and src_lang not in ['ja', 'ko']:
+        kernel_size = 3
+    # Adjust for text bubbles: only consider contours wholly inside the bubble
+    if getattr(blk, 'text_class', None) == 'text_bubble' and getattr(blk, 'bubble_xyxy', None) is not None:
+        bx1, by1, bx2, by2 = blk.bubble_xyxy
+        # Per-polygon extents as an (n, 4) array of [min_x, min_y, max_x, max_y]
+        extents = np.array([[p[:, 0].min(), p[:, 1].min(), p[:, 0].max(), p[:, 1].max()]
+                            for p in polys])
+        inside = ((extents[:, 0] >= bx1) & (extents[:, 2] <= bx2)
+                  & (extents[:, 1] >= by1) & (extents[:, 3] <= by2))
+        if inside.any():
+            # Distances from each valid polygon to the bubble edges
+            valid = extents[inside]
+            dists = np.concatenate([valid[:, 0] - bx1, bx2 - valid[:, 2],
+                                    valid[:, 1] - by1, by2 - valid[:, 3]])
+            min_dist = dists.min()
+            if kernel_size >= min_dist:
+                kernel_size = max(1, int(min_dist * 0.8))
+
+    return kernel_size
+
+def fill_flat_regions(img: np.ndarray, mask: np.ndarray, blk_list: list[TextBlock],
+                      ring_width: int = 6, max_std: float = 6.0, min_ring_pixels: int = 20):
+    """
+    Fill mask regions that sit on a flat bubble background with that background colour.
+
+    A connected mask region qualifies when it lies inside a block's bubble_xyxy and
+    the ring of unmasked pixels around it (clipped to the bubble) is near-uniform.
+    Such regions are painted with the ring's median colour and removed from the
+    mask, so only textured regions are left for the neural inpainter.
+
+    Args:
+        img: Page image
+        mask: Inpainting mask, 255 where text should be removed
+        blk_list: Blocks of the page, providing bubble boxes
+        ring_width: Width in pixels of the background ring sampled around a region
+        max_std: Largest per-channel standard deviation of a flat ring
+        min_ring_pixels: Smallest ring that is trusted as a background sample
+
+    Returns:
+        Tuple of (filled image, remaining mask, flat region count, total region count)
+    """
+    binary = (mask > 127).astype(np.uint8)
+    n_labels, labels, stats, _ = cv2.connectedComponentsWithStats(binary, connectivity=8)
+    n_regions = n_labels - 1
+
+    bubbles = np.array([blk.bubble_xyxy for blk in blk_list
+                        if getattr(blk, 'bubble_xyxy', None) is not None], dtype=np.int64).reshape(-1, 4)
+    if n_regions == 0 or len(bubbles) == 0:
+        return img, mask, 0, n_regions
+
+    # Region boxes as [x1, y1, x2, y2] and the first bubble containing each one
+    x1, y1 = stats[1:, cv2.CC_STAT_LEFT], stats[1:, cv2.CC_STAT_TOP]
+    x2, y2 = x1 + stats[1:, cv2.CC_STAT_WIDTH], y1 + stats[1:, cv2.CC_STAT_HEIGHT]
+    contained = ((x1[:, None] >= bubbles[None, :, 0]) & (y1[:, None] >= bubbles[None, :, 1])
+                 & (x2[:, None] <= bubbles[None, :, 2]) & (y2[:, None] <= bubbles[None, :, 3]))
+
+    filled = img
+    remaining = mask
+    ring_kernel = np.ones((2 * ring_width + 1, 2 * ring_width + 1), np.uint8)
+    n_flat = 0
+    for idx in np.flatnonzero(contained.any(axis=1)):
+        bx1, by1, bx2, by2 = bubbles[contained[idx].argmax()]
+        rx1, ry1 = max(int(x1[idx]) - ring_width, bx1), max(int(y1[idx]) - ring_width, by1)
+        rx2, ry2 = min(int(x2[idx]) + ring_width, bx2), min(int(y2[idx]) + ring_width, by2)
+
+        region = labels[ry1:ry2, rx1:rx2] == idx + 1
+        ring = cv2.dilate(region.astype(np.uint8), ring_kernel).astype(bool)
+        ring &= binary[ry1:ry2, rx1:rx2] == 0
+
+        samples = img[ry1:ry2, rx1:rx2][ring]
+        if len(samples) < min_ring_pixels or samples.std(axis=0).max() > max_std:
+            continue
+
+        if filled is img:
+            filled = img.copy()
+            remaining = mask.copy()
+        filled[ry1:ry2, rx1:rx2][region] = np.median(samples, axis=0).astype(img.dtype)
+        remaining[ry1:ry2, rx1:rx2][region] = 0
+        n_flat += 1
+
+    return filled, remaining, n_flat, n_regions
+
 def validate_ocr(main_page, source_lang):
     settings_page = main_page.settings_page
     tr = settings_page.ui.tr
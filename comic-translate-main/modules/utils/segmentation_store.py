@@ -0,0 +1,79 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from ..detection.utils.general import get_inpaint_bboxes_batch
+
+
+def page_fingerprint(image: np.ndarray) -> str:
+    """Content hash of every pixel of a page and its shape."""
+    digest = hashlib.blake2b(np.ascontiguousarray(image), digest_size=16)
+    digest.update(str((image.shape, image.dtype.str)).encode())
+    return digest.hexdigest()
+
+
+def _geometry_key(kind: str, bbox) -> tuple:
+    return (kind,) + tuple(int(v) for v in bbox)
+
+
+class SegmentationStore:
+    """
+    Per-page cache of text component boxes shared between mask generation
+    and the segmentation view.
+
+    Entries are keyed by the page fingerprint and the block geometry, so a block
+    that is moved or resized simply misses the cache and is recomputed. Pages are
+    evicted least recently used first.
+    """
+
+    def __init__(self, max_pages: int = 20):
+        self.max_pages = max_pages
+        self._pages: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _page(self, fingerprint: str) -> dict:
+        page = self._pages.get(fingerprint)
+        if page is None:
+            page = {}
+            self._pages[fingerprint] = page
+            while len(self._pages) > self.max_pages:
+                self._pages.popitem(last=False)
+        else:
+            self._pages.move_to_end(fingerprint)
+        return page
+
+    def get_inpaint_bboxes(self, image: np.ndarray, text_bboxes) -> list:
+        """
+        Text component boxes for each text bbox, computing only the missing ones.
+
+        Args:
+            image: Full page image
+            text_bboxes: Iterable of text bounding boxes [x1, y1, x2, y2]
+
+        Returns:
+            List of inpaint bounding box lists, in the same order as text_bboxes
+        """
+        text_bboxes = list(text_bboxes)
+        fingerprint = page_fingerprint(image)
+        keys = [_geometry_key('text', bbox) for bbox in text_bboxes]
+
+        with self._lock:
+            page = self._page(fingerprint)
+            missing = [i for i, key in enumerate(keys) if key not in page]
+
+        if missing:
+            computed = get_inpaint_bboxes_batch([text_bboxes[i] for i in missing], image)
+            with self._lock:
+                page = self._page(fingerprint)
+                for i, bboxes in zip(missing, computed):
+                    page[keys[i]] = bboxes
+
+        with self._lock:
+            page = self._page(fingerprint)
+            return [list(page[key]) if key in page else [] for key in keys]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pages.clear()
@@ -127,56 +127,50 @@ def sort_blk_list(blk_list: List[TextBlock], right_to_left=True) -> List[TextBlo
     return sorted_blk_list
 
 def sort_textblock_rectangles(coords_text_list: List[Tuple[Tuple[int, int, int, int], str]], direction: str = 'ver_rtl', threshold: int = 10):
-    
-    def in_same_line(bbox_a, bbox_b, direction, threshold):
-        """
-        Checks if two bounding boxes are on the same line based on their relative positions.
-
-        Args:
-            bbox_a (tuple): Bounding box coordinates for the first object (x1, y1, x2, y2).
-            bbox_b (tuple): Bounding box coordinates for the second object (x1, y1, x2, y2).
-            direction (str): The predominant text direction, either 'horizontal' or 'vertical'.
-            threshold (float): Maximum distance between the centers of the bounding boxes to be considered on the same line.
-
-        Returns:
-            bool: True if the bounding boxes are on the same line, False otherwise.
-        """
-        # Calculate the center points of the bounding boxes
-        center_a = ((bbox_a[0] + bbox_a[2]) / 2, (bbox_a[1] + bbox_a[3]) / 2)
-        center_b = ((bbox_b[0] + bbox_b[2]) / 2, (bbox_b[1] + bbox_b[3]) / 2)
-
-        # For horizontal text, check if the centers are within the same horizontal band
-        if 'hor' in direction:
-            return abs(center_a[1] - center_b[1]) <= threshold
-        # For vertical text, check if the centers are within the same vertical band
-        elif 'ver' in direction:
-            return abs(center_a[0] - center_b[0]) <= threshold
+    """
+    Group word/line boxes into lines and order them for reading.
 
-    # Group word bounding boxes into lines
+    Each box, in input order, joins the existing line holding the nearest box
+    (Manhattan distance between top-left corners) whose center lies within
+    threshold on the axis across the text direction; otherwise it starts a
+    new line. Center offsets and distances are computed for all pairs at
+    once, leaving one argmin per box.
+    """
     lines = []
-    remaining_boxes = coords_text_list[:]  # create a shallow copy
+    if not coords_text_list:
+        return []
 
-    while remaining_boxes:
-        box = remaining_boxes.pop(0)
-        current_line = [box]
-        closest_line = None
-        closest_distance = float('inf')
+    boxes = np.array([box[0] for box in coords_text_list], dtype=np.float64).reshape(-1, 4)
+    if 'hor' in direction:
+        # For horizontal text, centers must be within the same horizontal band
+        centers = (boxes[:, 1] + boxes[:, 3]) / 2
+    elif 'ver' in direction:
+        # For vertical text, centers must be within the same vertical band
+        centers = (boxes[:, 0] + boxes[:, 2]) / 2
+    else:
+        centers = None
 
-        # Find the closest existing line to the current bounding box
-        for line in lines:
-            for line_box in line:
-                if in_same_line(box[0], line_box[0], direction, threshold):
-                    distance = abs(box[0][0] - line_box[0][0]) + abs(box[0][1] - line_box[0][1])
-                    if distance < closest_distance:
-                        closest_line = line
-                        closest_distance = distance
+    if centers is None:
+        lines = [[box] for box in coords_text_list]
+    else:
+        same_line = np.abs(centers[:, None] - centers[None, :]) <= threshold
+        distances = (np.abs(boxes[:, None, 0] - boxes[None, :, 0]) +
+                     np.abs(boxes[:, None, 1] - boxes[None, :, 1]))
+        distances[~same_line] = np.inf
 
-        # If a close line was found, add the bounding box to that line
-        if closest_line is not None:
-            closest_line.append(box)
-        # Otherwise, create a new line with the current bounding box
-        else:
-            lines.append(current_line)
+        line_of = np.empty(len(coords_text_list), dtype=np.intp)
+        for i, box in enumerate(coords_text_list):
+            row = distances[i, :i]
+            if i and np.isfinite(row.min()):
+                # Ties go to the earliest line, then the earliest box in it,
+                # as when scanning the lines in order
+                candidates = np.flatnonzero(row == row.min())
+                line_index = int(line_of[candidates].min())
+                lines[line_index].append(box)
+            else:
+                line_index = len(lines)
+                lines.append([box])
+            line_of[i] = line_index
 
     # Sort the boxes in each line based on the reading direction
     for i, line in enumerate(lines):
@@ -0,0 +1,83 @@
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from loguru import logger
+
+
+def _lower_thread_priority() -> None:
+    # On Linux, niceness is per thread, so this leaves the UI and the worker
+    # threads of real operations at normal priority
+    if sys.platform.startswith('linux'):
+        try:
+            os.nice(10)
+        except OSError:
+            pass
+
+
+class ModelWarmup:
+    """
+    Runs model warm-up steps on one low-priority background thread.
+
+    Each schedule() supersedes the previous one: steps of an older schedule
+    that have not started yet are skipped, so changing a setting cancels the
+    warm-up of the models that are no longer selected. A step that is
+    already running is left to finish, since loads can not be interrupted;
+    its model stays pooled for later use. Steps that already completed are
+    not run again.
+    """
+
+    def __init__(self):
+        self._executor = None
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._done = set()
+        self.started = False
+
+    def schedule(self, steps: list[tuple[str, Callable[[], None]]]) -> None:
+        """
+        Replace any pending warm-up with steps, run in order.
+
+        Args:
+            steps: (name, callable) pairs; each callable loads a model and runs a
+                tiny inference with it. The name identifies the model and its
+                settings, and is used to skip steps that already ran.
+        """
+        with self._lock:
+            self.started = True
+            self._generation += 1
+            generation = self._generation
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix='model-warmup', initializer=_lower_thread_priority
+                )
+        for name, step in steps:
+            self._executor.submit(self._run, generation, name, step)
+
+    def shutdown(self) -> None:
+        """
+        Cancel the pending steps and stop the worker thread.
+
+        Does not wait: a step that is already running finishes in the
+        background, and the interpreter joins the thread at exit.
+        """
+        with self._lock:
+            self._generation += 1
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, generation: int, name: str, step: Callable[[], None]) -> None:
+        if generation != self._generation or name in self._done:
+            return
+        start = time.perf_counter()
+        try:
+            step()
+        except Exception as e:
+            logger.warning(f"Warm-up of {name} failed: {e}")
+            return
+        self._done.add(name)
+        logger.info(f"Warm-up: {name} ready in {time.perf_counter() - start:.2f}s")
@@ -14,12 +14,19 @@ from pathlib import Path
 
 from modules.detection.processor import TextBlockDetector
 from modules.ocr.processor import OCRProcessor
+from modules.ocr.factory import OCRFactory
+from modules.ocr.dedup import OCRCropCache
 from modules.translation.processor import Translator
 from modules.utils.textblock import TextBlock, sort_blk_list
 from modules.utils.pipeline_utils import inpaint_map, get_config
 from modules.rendering.render import get_best_render_area, pyside_word_wrap
-from modules.utils.pipeline_utils import generate_mask, get_language_code, is_directory_empty
+from modules.utils.pipeline_utils import generate_mask, get_language_code, is_directory_empty, \
+                                        fill_flat_regions
 from modules.utils.translator_utils import get_raw_translation, get_raw_text, format_translations, set_upper_case
+from modules.utils.segmentation_store import SegmentationStore
+from modules.utils.inpaint_cache import InpaintResultCache
+from modules.utils.model_pool import model_pool
+from modules.utils.warmup import ModelWarmup
 from modules.utils.archives import make
 
 from app.ui.canvas.rectangle import MoveableRectItem
@@ -41,12 +48,12 @@ def limiter_ressources(cpu_limit=60, ram_limit_gb=4):
 class ComicTranslatePipeline:
     def __init__(self, main_page):
         self.main_page = main_page
-        self.block_detector_cache = None
-        self.inpainter_cache = None
-        self.cached_inpainter_key = None
         self.ocr = OCRProcessor()
         self.ocr_cache = {} # OCR results cache: {(image_hash, model_key, source_lang): {block_id: text}}
         self.translation_cache = {} # Translation results cache: {(image_hash, translator_key, source_lang, target_lang, extra_context): {block_id: {source_text: str, translation: str}}}
+        self.segmentation_store = SegmentationStore() # Text component boxes and bubble interiors per page and block geometry
+        self.inpaint_result_cache = None # Inpainted regions on disk, created on first use when enabled in the settings: {hash(image crop, mask crop, inpainter_key, config): patch}
+        self.warmup = ModelWarmup() # Loads the selected models in the background after start-up
 
     def clear_ocr_cache(self):
         """Clear the OCR cache. Note: Cache now persists across image and model changes automatically."""
@@ -78,13 +85,19 @@ class ComicTranslatePipeline:
 
     def detect_blocks(self, load_rects=True):
         if self.main_page.image_viewer.hasPhoto():
-            if self.block_detector_cache is None:
-                self.block_detector_cache = TextBlockDetector(self.main_page.settings_page)
             image = self.main_page.image_viewer.get_cv2_image()
-            blk_list = self.block_detector_cache.detect(image)
+            blk_list = self._detect(TextBlockDetector(self.main_page.settings_page), image)
 
             return blk_list, load_rects
 
+    @staticmethod
+    def _detect(detector: TextBlockDetector, image: np.ndarray) -> List[TextBlock]:
+        # Long strips are detected band by band, so only one band's
+        # intermediate results are held at a time
+        if detector.is_long_strip(image.shape):
+            return detector.detect_strip(image)
+        return detector.detect(image)
+
     def on_blk_detect_complete(self, result): 
         blk_list, load_rects = result
         source_lang = self.main_page.s_combo.currentText()
@@ -95,25 +108,104 @@ class ComicTranslatePipeline:
         if load_rects:
             self.load_box_coords(blk_list)
 
+    def _pooled_inpainter(self, settings_page):
+        # Fetched from the pool for every use and never kept, so that an
+        # inpainter the pool evicts is released
+        device = 'cuda' if settings_page.is_gpu_enabled() else 'cpu'
+        inpainter_key = settings_page.get_tool_selection('inpainter')
+        InpainterClass = inpaint_map[inpainter_key]
+        return model_pool.get(f"inpainter:{inpainter_key}:{device}", lambda: InpainterClass(device))
+
+    def warm_up_models(self):
+        """
+        Load the selected detector, OCR engine and inpainter in the background
+        and run each once on a tiny dummy input, so that the first real
+        operation does not pay for loading and first-inference compilation.
+        Models go through the same pool keys as real operations, which wait for
+        an in-flight warm-up load instead of loading a second copy.
+        """
+        settings_page = self.main_page.settings_page
+        source_lang = self.main_page.s_combo.currentText()
+        device = 'cuda' if settings_page.is_gpu_enabled() else 'cpu'
+        ocr_options = device
+        if settings_page.get_tool_selection('ocr') == settings_page.ui.tr('Default'):
+            # The Default engine for Japanese, MangaOCR, also depends on its runtime
+            ocr_options += f", {settings_page.get_manga_ocr_runtime()}"
+        dummy_image = np.full((128, 128, 3), 255, dtype=np.uint8)
+
+        def warm_detector():
+            detector = TextBlockDetector(settings_page)
+            detector.initialize()
+            detector.detect(dummy_image)
+
+        def warm_ocr():
+            ocr = OCRProcessor()
+            ocr.initialize(self.main_page, source_lang)
+            engine = OCRFactory.create_engine(ocr.settings, ocr.source_lang_english, ocr.ocr_key)
+            # Web engines have nothing to load, and a dummy request would be billed
+            if not engine.remote:
+                engine.process_image(dummy_image, [TextBlock(text_bbox=np.array([16, 16, 112, 48]))])
+
+        def warm_inpainter():
+            inpainter = self._pooled_inpainter(settings_page)
+            mask = np.zeros(dummy_image.shape[:2], dtype=np.uint8)
+            mask[48:80, 48:80] = 255
+            inpainter(dummy_image, mask, get_config(settings_page))
+
+        self.warmup.schedule([
+            (f"detector {settings_page.get_tool_selection('detector')} ({device})", warm_detector),
+            (f"OCR {settings_page.get_tool_selection('ocr')} for {source_lang} ({ocr_options})", warm_ocr),
+            (f"inpainter {settings_page.get_tool_selection('inpainter')} ({device})", warm_inpainter),
+        ])
+
+    def on_model_settings_changed(self, *args):
+        """Re-target the warm-up at the new selection, once it has been started."""
+        if self.warmup.started:
+            self.warm_up_models()
+
     def manual_inpaint(self):
         image_viewer = self.main_page.image_viewer
         settings_page = self.main_page.settings_page
         mask = image_viewer.get_mask_for_inpainting()
         image = image_viewer.get_cv2_image()
 
-        if self.inpainter_cache is None or self.cached_inpainter_key != settings_page.get_tool_selection('inpainter'):
-            device = 'cuda' if settings_page.is_gpu_enabled() else 'cpu'
-            inpainter_key = settings_page.get_tool_selection('inpainter')
-            InpainterClass = inpaint_map[inpainter_key]
-            self.inpainter_cache = InpainterClass(device)
-            self.cached_inpainter_key = inpainter_key
-
         config = get_config(settings_page)
-        inpaint_input_img = self.inpainter_cache(image, mask, config)
-        inpaint_input_img = cv2.convertScaleAbs(inpaint_input_img) 
+        inpaint_input_img = self.inpaint(image, mask, config, self.main_page.blk_list)
 
         return inpaint_input_img
 
+    def inpaint(self, image: np.ndarray, mask: np.ndarray, config, blk_list: List[TextBlock]) -> np.ndarray:
+        """Fill regions on flat bubble backgrounds directly and run the selected inpainter on the rest."""
+        filled, neural_mask, n_flat, n_regions = fill_flat_regions(image, mask, blk_list)
+        logger.info(f"Flat fill: {n_flat} of {n_regions} mask regions skipped the inpainter")
+
+        if n_regions and n_flat == n_regions:
+            return np.ascontiguousarray(filled[:, :, ::-1])
+        settings_page = self.main_page.settings_page
+        inpainter = self._pooled_inpainter(settings_page)
+        cache = self._inpaint_cache(settings_page)
+        if cache is not None:
+            return cache.inpaint(
+                inpainter, settings_page.get_tool_selection('inpainter'),
+                filled, neural_mask, config
+            )
+        result = inpainter(filled, neural_mask, config)
+        if result.dtype != np.uint8:
+            result = cv2.convertScaleAbs(result)
+        return result
+
+    def _inpaint_cache(self, settings_page):
+        """The inpainted region cache sized from the settings, or None when it is off or unusable."""
+        cache_settings = settings_page.get_inpaint_cache_settings()
+        if not cache_settings['enabled']:
+            return None
+        max_bytes = cache_settings['max_size_mb'] * 1024 * 1024
+        if self.inpaint_result_cache is None:
+            self.inpaint_result_cache = InpaintResultCache(max_bytes=max_bytes)
+        elif self.inpaint_result_cache.max_bytes != max_bytes:
+            self.inpaint_result_cache.set_max_bytes(max_bytes)
+        return self.inpaint_result_cache if self.inpaint_result_cache.enabled else None
+
     def inpaint_complete(self, patch_list):
         self.main_page.apply_inpaint_patches(patch_list)
         self.main_page.image_viewer.clear_brush_strokes() 
@@ -622,6 +714,9 @@ class ComicTranslatePipeline:
         if output_base_dir:
             output_base_dir = Path(output_base_dir)
 
+        # Text of crops already read, shared by the pages of this run only
+        crop_cache = OCRCropCache()
+
         for index, image_path in enumerate(image_list):
             limiter_ressources()
 
@@ -677,10 +772,7 @@ class ComicTranslatePipeline:
                 self.main_page.current_worker = None
                 break
 
-            if self.block_detector_cache is None:
-                self.block_detector_cache = TextBlockDetector(self.main_page.settings_page)
-            
-            blk_list = self.block_detector_cache.detect(image)
+            blk_list = self._detect(TextBlockDetector(self.main_page.settings_page), image)
 
             self.main_page.progress_update.emit(index, total_images, 2, 10, False)
             if self.main_page.current_worker and self.main_page.current_worker.is_cancelled:
@@ -690,7 +782,7 @@ class ComicTranslatePipeline:
             if blk_list:
                 self.ocr.initialize(self.main_page, source_lang)
                 try:
-                    self.ocr.process(image, blk_list)
+                    self.ocr.process(image, blk_list, crop_cache)
                     source_lang_english = self.main_page.lang_mapping.get(source_lang, source_lang)
                     rtl = True if source_lang_english == 'Japanese' else False
                     blk_list = sort_blk_list(blk_list, rtl)
@@ -726,23 +818,15 @@ class ComicTranslatePipeline:
             # Clean Image of text
             export_settings = settings_page.get_export_settings()
 
-            if self.inpainter_cache is None or self.cached_inpainter_key != settings_page.get_tool_selection('inpainter'):
-                device = 'cuda' if settings_page.is_gpu_enabled() else 'cpu'
-                inpainter_key = settings_page.get_tool_selection('inpainter')
-                InpainterClass = inpaint_map[inpainter_key]
-                self.inpainter_cache = InpainterClass(device)
-                self.cached_inpainter_key = inpainter_key
-
             config = get_config(settings_page)
-            mask = generate_mask(image, blk_list)
+            mask = generate_mask(image, blk_list, segmentation_store=self.segmentation_store)
 
             self.main_page.progress_update.emit(index, total_images, 4, 10, False)
             if self.main_page.current_worker and self.main_page.current_worker.is_cancelled:
                 self.main_page.current_worker = None
                 break
 
-            inpaint_input_img = self.inpainter_cache(image, mask, config)
-            inpaint_input_img = cv2.convertScaleAbs(inpaint_input_img)
+            inpaint_input_img = self.inpaint(image, mask, config, blk_list)
 
             # Saving cleaned image
             patches = self.get_inpainted_patches(mask, inpaint_input_img)
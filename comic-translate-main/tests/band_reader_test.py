@@ -0,0 +1,84 @@
+import os
+
+import cv2
+import numpy as np
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("transformers")
+
+from modules.detection import processor
+from modules.detection.processor import TextBlockDetector
+from modules.detection.rtdetr_v2 import RTDetrV2Detection
+from modules.detection.utils import band_reader
+
+# Dark boxes standing in for text on a 400 x 6000 strip, one of them
+# crossing the seam between the first two bands
+TEXT_BOXES = [(40, 100, 300, 160), (60, 1100, 340, 1280), (80, 3000, 200, 3100), (50, 5800, 350, 5900)]
+
+
+def _detect_dark_boxes(band: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Stand-in for the RT-DETR model: the bounding box of each dark region."""
+    gray = cv2.cvtColor(band, cv2.COLOR_BGR2GRAY)
+    count, _, stats, _ = cv2.connectedComponentsWithStats((gray < 128).astype(np.uint8))
+    boxes = [(x, y, x + w, y + h) for x, y, w, h, _ in stats[1:count]]
+    return np.empty((0, 4)), np.array(boxes, dtype=float).reshape(-1, 4)
+
+
+class _Settings:
+    def get_tool_selection(self, tool_type):
+        return 'RT-DETR-V2'
+
+
+@pytest.fixture
+def memmap_dir(tmp_path, monkeypatch):
+    directory = str(tmp_path / 'bands')
+    monkeypatch.setattr(band_reader, 'MEMMAP_DIR', directory)
+    return directory
+
+
+@pytest.fixture
+def strip_path(tmp_path):
+    image = np.full((6000, 400, 3), 255, dtype=np.uint8)
+    for x1, y1, x2, y2 in TEXT_BOXES:
+        image[y1:y2, x1:x2] = 0
+    path = str(tmp_path / 'strip.png')
+    cv2.imwrite(path, image)
+    return path
+
+
+def test_detect_streaming_from_image_path(strip_path, memmap_dir, monkeypatch):
+    engine = RTDetrV2Detection()
+    engine._detect_single_image = _detect_dark_boxes
+    monkeypatch.setattr(processor.DetectionEngineFactory, 'create_engine',
+                        lambda settings, detector: engine)
+    closed = []
+    monkeypatch.setattr(band_reader.MemmapBandReader, 'close',
+                        lambda self: closed.append(self.path) or band_reader.BandReader.close(self))
+
+    detector = TextBlockDetector(_Settings())
+    assert detector.is_long_strip((6000, 400, 3))
+    batches = list(detector.detect_streaming(strip_path))
+
+    # Blocks arrive in several batches, as bands are finished
+    assert len(batches) > 1
+    boxes = sorted(tuple(int(v) for v in blk.xyxy) for blocks in batches for blk in blocks)
+    assert boxes == sorted(TEXT_BOXES)
+
+    # The strip was decoded once to a memory-mapped array, closed after use
+    npy_files = os.listdir(memmap_dir)
+    assert len(npy_files) == 1
+    assert closed == [os.path.join(memmap_dir, npy_files[0])]
+
+
+def test_decoded_arrays_are_pruned(strip_path, tmp_path, memmap_dir, monkeypatch):
+    first = band_reader.decode_to_memmap(strip_path)
+    other_path = str(tmp_path / 'other.png')
+    cv2.imwrite(other_path, np.zeros((6000, 400, 3), dtype=np.uint8))
+
+    # Room for a single decoded strip: the older one is removed
+    monkeypatch.setattr(band_reader, 'MEMMAP_MAX_BYTES', os.path.getsize(first) + 1)
+    second = band_reader.decode_to_memmap(other_path)
+    assert not os.path.exists(first)
+    assert os.path.exists(second)
+    assert band_reader.decode_to_memmap(other_path) == second
@@ -0,0 +1,25 @@
+import os
+
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("transformers")
+pytest.importorskip("onnxruntime")
+
+from modules.ocr.manga_ocr.manga_ocr import MANGA_OCR_PATH, MangaOcr
+from modules.ocr.manga_ocr.manga_ocr_onnx import MangaOcrOnnx, load_parity_samples
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+model_path = os.path.join(project_root, MANGA_OCR_PATH)
+
+pytestmark = pytest.mark.skipif(
+    not os.path.isdir(model_path), reason="MangaOCR model not downloaded"
+)
+
+
+def test_onnx_matches_pytorch_on_real_crops():
+    samples = load_parity_samples()
+    expected = MangaOcr(model_path).recognize_batch(samples)
+    actual = MangaOcrOnnx(model_path).recognize_batch(samples)
+    assert actual == expected
+    assert all(expected)
@@ -0,0 +1,132 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("requests")
+
+from modules.ocr.request_executor import OCRRequestExecutor
+
+
+class MockOCRServer:
+    """
+    Local HTTP server standing in for an OCR provider.
+
+    POST /<n> answers with body n after a delay that shrinks as n grows, so
+    later blocks finish first. The first rate_limited requests of a path get
+    429 with a Retry-After header.
+    """
+
+    def __init__(self, delay: float = 0.05, rate_limited: int = 0, retry_after: str = '0.2'):
+        self.delay = delay
+        self.rate_limited = rate_limited
+        self.retry_after = retry_after
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.attempts = {}
+        self.attempt_times = {}
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                with server.lock:
+                    server.in_flight += 1
+                    server.max_in_flight = max(server.max_in_flight, server.in_flight)
+                    attempt = server.attempts.get(self.path, 0) + 1
+                    server.attempts[self.path] = attempt
+                    server.attempt_times.setdefault(self.path, []).append(time.monotonic())
+                try:
+                    index = int(self.path.strip('/'))
+                    time.sleep(server.delay / (1 + index))
+                    if attempt <= server.rate_limited:
+                        self.send_response(429)
+                        self.send_header('Retry-After', server.retry_after)
+                        body = b''
+                    else:
+                        self.send_response(200)
+                        body = str(index).encode()
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                finally:
+                    with server.lock:
+                        server.in_flight -= 1
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def test_map_preserves_block_order():
+    with MockOCRServer(delay=0.2) as server:
+        executor = OCRRequestExecutor(max_concurrency=8)
+        try:
+            texts = executor.map(lambda i: executor.post(f"{server.url}/{i}", data=b'x').text, range(16))
+        finally:
+            executor.close()
+    assert texts == [str(i) for i in range(16)]
+
+
+def test_rate_limited_requests_are_retried_after_retry_after():
+    with MockOCRServer(delay=0.0, rate_limited=2, retry_after='0.2') as server:
+        executor = OCRRequestExecutor(max_concurrency=4, max_retries=3)
+        try:
+            responses = executor.map(lambda i: executor.post(f"{server.url}/{i}", data=b'x'), range(4))
+        finally:
+            executor.close()
+
+    assert [r.status_code for r in responses] == [200] * 4
+    assert [r.text for r in responses] == [str(i) for i in range(4)]
+    for i in range(4):
+        times = server.attempt_times[f"/{i}"]
+        assert len(times) == 3
+        # Each retry waits for the provider's Retry-After
+        assert all(later - earlier >= 0.19 for earlier, later in zip(times, times[1:]))
+
+
+def test_rate_limited_request_gives_up_after_max_retries():
+    with MockOCRServer(delay=0.0, rate_limited=10, retry_after='0.05') as server:
+        executor = OCRRequestExecutor(max_concurrency=1, max_retries=2)
+        try:
+            response = executor.post(f"{server.url}/0", data=b'x')
+        finally:
+            executor.close()
+    assert response.status_code == 429
+    assert server.attempts["/0"] == 3
+
+
+def test_retry_backoff_grows_without_retry_after():
+    executor = OCRRequestExecutor(backoff=1.0, max_backoff=30.0)
+    try:
+        delays = [executor._retry_delay(None, attempt) for attempt in range(4)]
+    finally:
+        executor.close()
+    for attempt, delay in enumerate(delays):
+        assert 0.5 * 2 ** attempt <= delay <= 2 ** attempt
+
+
+@pytest.mark.parametrize("max_concurrency", [1, 3])
+def test_requests_in_flight_are_bounded(max_concurrency):
+    with MockOCRServer(delay=0.1) as server:
+        executor = OCRRequestExecutor(max_concurrency=max_concurrency)
+        try:
+            executor.map(lambda i: executor.post(f"{server.url}/{i % 2}", data=b'x'), range(12))
+        finally:
+            executor.close()
+    assert server.max_in_flight <= max_concurrency
+    assert server.max_in_flight == max_concurrency